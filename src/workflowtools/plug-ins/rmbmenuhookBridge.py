@@ -0,0 +1,69 @@
+"""
+A command plugin that lets the rmbmenuhook mel scripts call
+rmbmenuhook.buildMenu directly, passing the menu and object as
+arguments instead of compiling a python string on every right-click.
+
+Usage (mel):
+    rmbmenuhookBuildMenu -object $object $menu;
+"""
+
+import time
+
+import maya.api.OpenMaya as om
+
+import rmbmenuhook
+
+
+def maya_useNewAPI():
+    pass
+
+
+class BuildMenuCommand(om.MPxCommand):
+    """
+    Build a rmb marking menu using rmbmenuhook.buildMenu.
+    Returns 1 if a custom menu was built, otherwise 0.
+    """
+
+    name = 'rmbmenuhookBuildMenu'
+
+    objectFlag = '-o'
+    objectFlagLong = '-object'
+
+    @staticmethod
+    def creator():
+        return BuildMenuCommand()
+
+    @staticmethod
+    def createSyntax():
+        syntax = om.MSyntax()
+        syntax.addFlag(BuildMenuCommand.objectFlag, BuildMenuCommand.objectFlagLong, om.MSyntax.kString)
+        syntax.addArg(om.MSyntax.kString)
+        return syntax
+
+    def doIt(self, args):
+        # time the whole command, including argument parsing, as the 'mel' phase,
+        # and record it even if building the menu fails
+        startTime = time.perf_counter()
+        try:
+            argData = om.MArgParser(self.syntax(), args)
+            menu = argData.commandArgumentString(0)
+            if argData.isFlagSet(self.objectFlag):
+                result = rmbmenuhook.buildMenu(menu, argData.flagArgumentString(self.objectFlag, 0))
+            else:
+                result = rmbmenuhook.buildMenu(menu)
+            self.setResult(1 if result else 0)
+        finally:
+            rmbmenuhook.recordTiming('mel', None, time.perf_counter() - startTime)
+
+    def isUndoable(self):
+        return False
+
+
+def initializePlugin(plugin):
+    pluginFn = om.MFnPlugin(plugin)
+    pluginFn.registerCommand(BuildMenuCommand.name, BuildMenuCommand.creator, BuildMenuCommand.createSyntax)
+
+
+def uninitializePlugin(plugin):
+    pluginFn = om.MFnPlugin(plugin)
+    pluginFn.deregisterCommand(BuildMenuCommand.name)
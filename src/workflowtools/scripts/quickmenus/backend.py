@@ -0,0 +1,230 @@
+"""
+pymel-free implementations of the quick menus hot paths.
+
+Everything here works on plain node name strings using maya.cmds,
+so that acting on large selections doesn't pay for constructing
+PyNodes. PyNodes can still be passed in anywhere a node name is expected.
+"""
+
+import collections
+import re
+
+from maya import cmds
+
+
+def getNodeName(node):
+    """
+    Return the full name of a node or component given as a string or PyNode.
+    Strings are returned unchanged.
+    """
+    if isinstance(node, str):
+        return node
+    longName = getattr(node, 'longName', None)
+    if longName is not None:
+        return longName()
+    return str(node)
+
+
+def getNodeNames(nodes):
+    """
+    Return the full names of the given nodes or components
+    """
+    return [getNodeName(n) for n in nodes]
+
+
+def getSelectedNames(**kwargs):
+    """
+    Return the full path names of all selected nodes and components.
+    Any kwargs are passed to `ls`.
+    """
+    return cmds.ls(sl=True, long=True, **kwargs) or []
+
+
+def groupNodesByType(nodes):
+    """
+    Return a dict of {nodeType: [nodes]} for the given nodes using a single `ls` query
+    """
+    if not nodes:
+        return {}
+    return _groupByType(cmds.ls(nodes, long=True, showType=True))
+
+
+def getSelectedNodesByType(**kwargs):
+    """
+    Return a dict of {nodeType: [nodes]} for all selected nodes.
+    Selected components are included as their shape nodes.
+    Any kwargs are passed to `ls`.
+    """
+    return _groupByType(cmds.ls(sl=True, long=True, objectsOnly=True, showType=True, **kwargs))
+
+
+def _groupByType(namesAndTypes):
+    # group the alternating name, type results of `ls -showType`
+    result = {}
+    if namesAndTypes:
+        for name, nodeType in zip(namesAndTypes[::2], namesAndTypes[1::2]):
+            result.setdefault(nodeType, []).append(name)
+    return result
+
+
+def getShapes(nodes):
+    """
+    Return the full names of all non-intermediate shapes of the given nodes
+    """
+    if not nodes:
+        return []
+    return cmds.listRelatives(nodes, shapes=True, noIntermediate=True, fullPath=True) or []
+
+
+def getUuids(names):
+    """
+    Return the uuid of the node of each of the given nodes or components,
+    or None for any that don't exist.
+    """
+    nodeNames = [n.partition('.')[0] for n in names]
+    uniqueNames = list(collections.OrderedDict.fromkeys(nodeNames))
+    if not uniqueNames:
+        return []
+    uuids = cmds.ls(uniqueNames, uuid=True) or []
+    if len(uuids) != len(uniqueNames):
+        # some nodes don't exist, query individually to keep results aligned
+        uuids = [(cmds.ls(n, uuid=True) or [None])[0] for n in uniqueNames]
+    uuidMap = dict(zip(uniqueNames, uuids))
+    return [uuidMap[n] for n in nodeNames]
+
+
+def resolveMembers(names, uuids):
+    """
+    Return the current names of nodes or components stored by uuid, using
+    the stored names as a fallback for members whose uuid doesn't resolve.
+    Only a few bulk queries are made regardless of the number of members.
+
+    Args:
+        names: A list of the stored full names of nodes or components
+        uuids: A list of the stored uuid of the node of each member, or None if unknown
+
+    Returns:
+        A tuple of (resolved names, stored names of any members that could not be found)
+    """
+    # {uuid: [long names]}, uuids can match more than one node, e.g. when a file is referenced twice
+    byUuid = {}
+    uniqueUuids = list(set(u for u in uuids if u))
+    if uniqueUuids:
+        found = cmds.ls(uniqueUuids, long=True) or []
+        if found:
+            for name, uuid in zip(found, cmds.ls(found, uuid=True)):
+                byUuid.setdefault(uuid, []).append(name)
+
+    results = []
+    unresolved = []
+    for index, (name, uuid) in enumerate(zip(names, uuids)):
+        nodeName, dot, component = name.partition('.')
+        candidates = byUuid.get(uuid)
+        if candidates:
+            node = nodeName if nodeName in candidates else candidates[0]
+            results.append(node + dot + component)
+        else:
+            results.append(None)
+            unresolved.append(index)
+
+    missing = []
+    if unresolved:
+        # fall back to the stored names
+        existing = set(cmds.ls([names[i].partition('.')[0] for i in unresolved], long=True) or [])
+        for index in unresolved:
+            if names[index].partition('.')[0] in existing:
+                results[index] = names[index]
+            else:
+                missing.append(names[index])
+        results = [n for n in results if n is not None]
+    return results, missing
+
+
+# matches single index components, including ranges and compact range lists,
+# e.g. 'pCube1.vtx[3]', 'pCube1.vtx[0:9]', or 'pCube1.vtx[0:9,12,20:25]'
+COMPONENT_RANGES_PATTERN = re.compile(r'^([^.]+)\.(\w+)\[([\d:,]+)\]$')
+
+
+def _parseRanges(rangesStr):
+    # return a list of (start, end) tuples from a string like '0:9,12,20:25'
+    ranges = []
+    for item in rangesStr.split(','):
+        start, _, end = item.partition(':')
+        ranges.append((int(start), int(end or start)))
+    return ranges
+
+
+def _mergeRanges(ranges):
+    # return a sorted list of (start, end) tuples with all overlapping or adjacent ranges merged
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _formatRanges(ranges):
+    return ','.join(str(s) if s == e else '{0}:{1}'.format(s, e) for s, e in ranges)
+
+
+def compactMembers(names, uuids):
+    """
+    Return the given members with all single index components of the same node
+    and type merged into one compact name listing run-length index ranges,
+    e.g. 'pCube1.vtx[0:9999,20000:20010]', and any duplicate members removed.
+
+    Members are matched by uuid when known, so that a node stored under an old name
+    and its current name are treated as the same node.
+
+    Args:
+        names: A list of full names of nodes or components
+        uuids: A list of the uuid of the node of each member, or None if unknown
+
+    Returns:
+        A tuple of (names, uuids) of the compacted members
+    """
+    # {key: [name, uuid, ranges or None]} in order of first appearance
+    members = collections.OrderedDict()
+    for name, uuid in zip(names, uuids):
+        match = COMPONENT_RANGES_PATTERN.match(name)
+        if match:
+            nodeName, attr, rangesStr = match.groups()
+            key = (uuid or nodeName, attr)
+            if key in members:
+                members[key][2].extend(_parseRanges(rangesStr))
+            else:
+                members[key] = [nodeName + '.' + attr, uuid, _parseRanges(rangesStr)]
+        else:
+            nodeName, dot, rest = name.partition('.')
+            key = (uuid or nodeName, dot + rest)
+            if key not in members:
+                members[key] = [name, uuid, None]
+    resultNames = []
+    resultUuids = []
+    for name, uuid, ranges in members.values():
+        if ranges is not None:
+            name = '{0}[{1}]'.format(name, _formatRanges(_mergeRanges(ranges)))
+        resultNames.append(name)
+        resultUuids.append(uuid)
+    return resultNames, resultUuids
+
+
+def expandComponents(names):
+    """
+    Return the given names with all compact component range lists split
+    into names that Maya accepts, one per range, e.g. 'pCube1.vtx[0:9,12]'
+    becomes ['pCube1.vtx[0:9]', 'pCube1.vtx[12]'].
+    """
+    results = []
+    for name in names:
+        match = COMPONENT_RANGES_PATTERN.match(name)
+        if match and ',' in match.group(3):
+            nodeName, attr, rangesStr = match.groups()
+            prefix = nodeName + '.' + attr
+            results.extend('{0}[{1}]'.format(prefix, r) for r in rangesStr.split(','))
+        else:
+            results.append(name)
+    return results
@@ -0,0 +1,421 @@
+"""
+An index of all cameras in the scene for the camera quick switch menu.
+
+The index is built the first time it is needed, and then kept up to date
+by node added, removed, renamed, reparented, and `orthographic` attribute
+change callbacks, so that listing cameras doesn't query every camera in the scene.
+
+Cameras are also organized into a tree of `CameraGroup`s by namespace,
+and by any sequence and shot names matching `SHOT_PATTERN`, so that
+scenes with hundreds of cameras can be browsed a group at a time.
+"""
+
+import re
+
+import maya.api.OpenMaya as om
+from maya import cmds
+
+
+__all__ = [
+    "CameraGroup",
+    "CameraIndex",
+    "CameraInfo",
+    "getCameraGroupPath",
+    "getCameraIndex",
+    "resetCameraIndex",
+    "SHOT_PATTERN",
+]
+
+
+# matches sequence and shot names in camera names, e.g. 'sq010_sh0020_cam'
+SHOT_PATTERN = re.compile(r'(?<![a-z])(?P<sequence>(?:sq|seq)\d+)(?:[_\-.]?(?P<shot>(?:sh|shot)\d+))?', re.IGNORECASE)
+
+# the group for referenced cameras that have no namespace
+REFERENCED_GROUP = 'Referenced'
+
+
+def getCameraGroupPath(name, isReferenced=False):
+    """
+    Return a tuple of group names for a camera, made of its namespaces,
+    and any sequence and shot names found using `SHOT_PATTERN`.
+
+    Args:
+        name: A string name of the camera transform
+        isReferenced: A bool, whether the camera is from a referenced file
+    """
+    parts = name.split('|')[-1].split(':')
+    groups = parts[:-1]
+    if not groups and isReferenced:
+        groups.append(REFERENCED_GROUP)
+    match = SHOT_PATTERN.search(parts[-1])
+    if match:
+        groups.append(match.group('sequence'))
+        if match.group('shot'):
+            groups.append(match.group('shot'))
+    return tuple(groups)
+
+
+class CameraInfo(object):
+    """
+    The cached info for a single camera shape.
+    """
+
+    def __init__(self, handle):
+        # the MObjectHandle of the camera shape
+        self.handle = handle
+        # the id of the attribute changed callback for the camera shape
+        self.attrCallback = None
+        # the shortest unique name of the camera shape
+        self.name = None
+        # the shortest unique name of the camera's transform
+        self.label = None
+        self.isOrtho = False
+        self.sortKey = None
+        # the lowercase label used for filtering
+        self.searchKey = None
+        # a tuple of group names, see `getCameraGroupPath`
+        self.groupPath = ()
+        # the `CameraGroup` that lists this camera
+        self.group = None
+
+    def __repr__(self):
+        return '<CameraInfo {0}>'.format(self.name)
+
+    def isAmbiguous(self):
+        """
+        Return True if the shape or transform name is not unique, meaning that
+        renaming or reparenting other nodes can change the camera's names.
+        """
+        return self.name is None or '|' in self.name or '|' in self.label
+
+    def update(self):
+        """
+        Update the cached info from the camera node
+        """
+        path = om.MDagPath.getAPathTo(self.handle.object())
+        self.name = path.partialPathName()
+        self.isOrtho = om.MFnCamera(path).isOrtho()
+        path.pop()
+        self.label = path.partialPathName()
+        self.sortKey = self.label
+        self.searchKey = self.label.lower()
+        isReferenced = om.MFnDependencyNode(self.handle.object()).isFromReferencedFile
+        self.groupPath = getCameraGroupPath(self.label, isReferenced)
+
+
+class CameraGroup(object):
+    """
+    A group of cameras and sub groups in the camera tree.
+    """
+
+    def __init__(self, name, path):
+        self.name = name
+        # a tuple of group names from the root group
+        self.path = path
+        # {name: CameraGroup} for all sub groups
+        self.groups = {}
+        # a sorted list of `CameraInfo` directly in this group
+        self.cameras = []
+        # the total number of cameras in this group and all sub groups
+        self.count = 0
+
+    def __repr__(self):
+        return '<CameraGroup {0} ({1})>'.format(self.name, self.count)
+
+    def getGroups(self):
+        """
+        Return all sub groups sorted by name
+        """
+        return [self.groups[k] for k in sorted(self.groups)]
+
+    def collapse(self):
+        """
+        Move the cameras of any sub groups that only contain one camera into this group.
+        """
+        for name, group in list(self.groups.items()):
+            group.collapse()
+            if group.count == 1:
+                del self.groups[name]
+                self.cameras.extend(group.cameras)
+        self.cameras.sort(key=lambda c: c.sortKey)
+        for camera in self.cameras:
+            camera.group = self
+
+
+class CameraIndex(object):
+    """
+    Maintains a `CameraInfo` for every camera in the scene, with
+    pre-sorted lists of perspective and orthographic cameras.
+    """
+
+    def __init__(self):
+        # {hash code: [CameraInfo]} for all cameras. hash codes are not unique,
+        # so cameras with the same hash code are told apart by handle equality
+        self.cameras = {}
+        # CameraInfos that need to be updated
+        self.dirty = set()
+        # {short name: [CameraInfo]} by the short names of camera shapes and transforms,
+        # or None if it needs to be rebuilt along with `ambiguous`
+        self.shortNames = None
+        # CameraInfos whose names are not unique, see `CameraInfo.isAmbiguous`
+        self.ambiguous = []
+        # {isOrtho: [CameraInfo]} sorted camera lists, with all cameras
+        # listed under None, or None if they need sorting
+        self.sorted = None
+        # the root `CameraGroup`, or None if it needs to be rebuilt
+        self.tree = None
+        self.callbacks = []
+        self.isBuilt = False
+
+    def build(self):
+        """
+        Find all cameras in the scene and install the callbacks that keep the index up to date.
+        """
+        self.clear()
+        sel = om.MSelectionList()
+        for name in cmds.ls(type='camera', long=True) or []:
+            sel.add(name)
+        for i in range(sel.length()):
+            self._addCamera(sel.getDependNode(i))
+        self.callbacks = [
+            om.MDGMessage.addNodeAddedCallback(self._onNodeAdded, 'camera'),
+            om.MDGMessage.addNodeRemovedCallback(self._onNodeRemoved, 'camera'),
+            om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, self._onNameChanged),
+            om.MDagMessage.addParentAddedCallback(self._onParentAdded),
+        ]
+        self.isBuilt = True
+
+    def clear(self):
+        """
+        Remove all cameras and callbacks from the index.
+        """
+        callbacks = self.callbacks + [c.attrCallback for c in self._iterCameras()]
+        if callbacks:
+            om.MMessage.removeCallbacks(callbacks)
+        self.callbacks = []
+        self.cameras = {}
+        self.dirty = set()
+        self.shortNames = None
+        self.ambiguous = []
+        self.sorted = None
+        self.tree = None
+        self.isBuilt = False
+
+    def getCameras(self, isOrtho=None):
+        """
+        Return a sorted list of `CameraInfo` for all perspective or orthographic cameras.
+
+        Args:
+            isOrtho: A bool, whether to list orthographic or perspective cameras, or None for all cameras
+        """
+        self._update()
+        return self.sorted[isOrtho]
+
+    def getCameraTree(self):
+        """
+        Return the root `CameraGroup` containing all cameras.
+        """
+        self._update()
+        if self.tree is None:
+            root = CameraGroup(None, ())
+            for camera in self.sorted[None]:
+                group = root
+                group.count += 1
+                for name in camera.groupPath:
+                    if name not in group.groups:
+                        group.groups[name] = CameraGroup(name, group.path + (name,))
+                    group = group.groups[name]
+                    group.count += 1
+                group.cameras.append(camera)
+            root.collapse()
+            self.tree = root
+        return self.tree
+
+    def getCameraGroup(self, path):
+        """
+        Return the `CameraGroup` with the given path, or None if it doesn't exist.
+        """
+        group = self.getCameraTree()
+        for name in path:
+            group = group.groups.get(name)
+            if group is None:
+                return None
+        return group
+
+    def findCameras(self, text, limit=None):
+        """
+        Return a sorted list of cameras whose label contains every word of the given text.
+
+        Args:
+            text: A string of words to search for, case-insensitive
+            limit: An optional int, the maximum number of cameras to return
+        """
+        words = text.lower().split()
+        results = []
+        for camera in self.getCameras():
+            if all(w in camera.searchKey for w in words):
+                results.append(camera)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def findCamera(self, name):
+        """
+        Return the `CameraInfo` for a camera shape or transform, or None if it isn't a camera.
+        """
+        self._update()
+        sel = om.MSelectionList()
+        try:
+            sel.add(name)
+            path = sel.getDagPath(0)
+            path.extendToShape()
+        except RuntimeError:
+            return None
+        return self._getCamera(path.node())
+
+    def _iterCameras(self):
+        for cameras in self.cameras.values():
+            for camera in cameras:
+                yield camera
+
+    def _getCamera(self, node):
+        """
+        Return the `CameraInfo` for a camera shape MObject, or None if it isn't indexed.
+        """
+        handle = om.MObjectHandle(node)
+        for camera in self.cameras.get(handle.hashCode(), ()):
+            if camera.handle == handle:
+                return camera
+
+    def _update(self):
+        if not self.isBuilt:
+            self.build()
+        if self.dirty:
+            for camera in self.dirty:
+                if camera.handle.isValid():
+                    camera.update()
+            self.dirty.clear()
+            self.sorted = None
+            self.shortNames = None
+        if self.sorted is None:
+            allCameras = sorted(self._iterCameras(), key=lambda c: c.sortKey)
+            self.sorted = {
+                None: allCameras,
+                False: [c for c in allCameras if not c.isOrtho],
+                True: [c for c in allCameras if c.isOrtho],
+            }
+            self.tree = None
+
+    def _addCamera(self, node):
+        camera = CameraInfo(om.MObjectHandle(node))
+        camera.attrCallback = om.MNodeMessage.addAttributeChangedCallback(node, self._onAttributeChanged, camera)
+        self.cameras.setdefault(camera.handle.hashCode(), []).append(camera)
+        # nodes aren't fully named or parented when added, so update them when next needed
+        self.dirty.add(camera)
+
+    def _onNodeAdded(self, node, clientData):
+        self._addCamera(node)
+
+    def _onNodeRemoved(self, node, clientData):
+        camera = self._getCamera(node)
+        if camera is None:
+            return
+        key = camera.handle.hashCode()
+        self.cameras[key].remove(camera)
+        if not self.cameras[key]:
+            del self.cameras[key]
+        self.dirty.discard(camera)
+        om.MMessage.removeCallback(camera.attrCallback)
+        self.sorted = None
+        self.shortNames = None
+
+    def _markCameraOrShapes(self, node):
+        """
+        Mark a camera shape, or the camera shapes of a transform, as dirty.
+
+        Returns:
+            True if any cameras were marked
+        """
+        camera = self._getCamera(node)
+        if camera is not None:
+            self.dirty.add(camera)
+            return True
+        isMarked = False
+        fn = om.MFnDagNode(node)
+        for i in range(fn.childCount()):
+            camera = self._getCamera(fn.child(i))
+            if camera is not None:
+                self.dirty.add(camera)
+                isMarked = True
+        return isMarked
+
+    def _markAmbiguousCameras(self, names=()):
+        """
+        Mark cameras as dirty whose shortest unique names may have changed, because their
+        names are already not unique, or because another node now has or had the same short name.
+        """
+        if self.shortNames is None:
+            self.shortNames = {}
+            self.ambiguous = []
+            for camera in self._iterCameras():
+                if camera.isAmbiguous():
+                    self.ambiguous.append(camera)
+                else:
+                    for name in (camera.name, camera.label):
+                        self.shortNames.setdefault(name, []).append(camera)
+        for name in names:
+            self.dirty.update(self.shortNames.get(name, ()))
+        self.dirty.update(self.ambiguous)
+
+    def _onNameChanged(self, node, prevName, clientData):
+        if not node.hasFn(om.MFn.kDagNode):
+            return
+        if not self._markCameraOrShapes(node):
+            self._markAmbiguousCameras((om.MFnDagNode(node).name(), prevName))
+
+    def _onParentAdded(self, child, parent, clientData):
+        # reparenting doesn't change short names, only the paths of names that aren't unique
+        if not self._markCameraOrShapes(child.node()):
+            self._markAmbiguousCameras()
+
+    def _onAttributeChanged(self, msg, plug, otherPlug, camera):
+        if msg & om.MNodeMessage.kAttributeSet and plug.partialName(useLongNames=True) == 'orthographic':
+            self.dirty.add(camera)
+
+
+# the shared camera index
+_INDEX = None
+# ids of scene callbacks that reset the index
+_SCENE_CALLBACKS = []
+
+
+def getCameraIndex():
+    """
+    Return the shared `CameraIndex`, which is reset whenever a scene is opened or created.
+    """
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = CameraIndex()
+        for message in (om.MSceneMessage.kBeforeNew, om.MSceneMessage.kBeforeOpen):
+            _SCENE_CALLBACKS.append(om.MSceneMessage.addCallback(message, _onSceneChanging))
+    return _INDEX
+
+
+def resetCameraIndex():
+    """
+    Clear the shared camera index and remove all of its callbacks.
+    """
+    global _INDEX
+    if _INDEX is not None:
+        _INDEX.clear()
+        _INDEX = None
+    if _SCENE_CALLBACKS:
+        om.MMessage.removeCallbacks(_SCENE_CALLBACKS)
+        del _SCENE_CALLBACKS[:]
+
+
+def _onSceneChanging(clientData):
+    # clear the index so it doesn't track every node of the closing or opening scene,
+    # it will be rebuilt the next time it is needed
+    if _INDEX is not None:
+        _INDEX.clear()
@@ -1,8 +1,8 @@
 
 import logging
+import sys
 
 from maya import cmds
-import pymel.core as pm
 import rmbmenuhook
 
 from . import utils
@@ -10,8 +10,10 @@ from . import utils
 
 __all__ = [
     "buildMenus",
+    "clearMenuPool",
     "destroyMenus",
     "getAllRegisteredMenus",
+    "getPooledMenu",
     "getRegisteredMenus",
     "MarkingMenu",
     "registerMenu",
@@ -57,30 +59,34 @@ REGISTERED_MENUS = {}
 # can / should be destroyed when menu key is released
 ACTIVE_MENUS = []
 
+# MarkingMenu instances that are reused across key presses,
+# indexed by (menu class, panel, modifiers)
+MENU_POOL = {}
+
 
 # Hotkey Management
 # -----------------
 
 def _switchToNonDefaultHotkeySet():
-    if not hasattr(pm, 'hotkeySet'):
+    if not hasattr(cmds, 'hotkeySet'):
         return
-    current = pm.hotkeySet(q=True, cu=True)
+    current = cmds.hotkeySet(q=True, cu=True)
     if current == 'Maya_Default':
-        existing = pm.hotkeySet(q=True, hotkeySetArray=True)
+        existing = cmds.hotkeySet(q=True, hotkeySetArray=True)
         if 'Maya_Default_Duplicate' in existing:
             # use the common duplicated set
-            pm.hotkeySet('Maya_Default_Duplicate', e=True, cu=True)
+            cmds.hotkeySet('Maya_Default_Duplicate', e=True, cu=True)
             LOG.info("Switched to hotkey set: Maya_Default_Duplicate")
         elif len(existing) > 1:
             # there are other sets, but not with known names
             for e in existing:
                 if e != 'Maya_Default':
-                    pm.hotkeySet(e, e=True, cu=True)
+                    cmds.hotkeySet(e, e=True, cu=True)
                     LOG.info("Switched to hotkey set: " + e)
                     break
         else:
             # create a duplicate
-            pm.hotkeySet('Maya_Default_Duplicate', src='Maya_Default', cu=True)
+            cmds.hotkeySet('Maya_Default_Duplicate', src='Maya_Default', cu=True)
             LOG.info("Created duplicate hotkey set: Maya_Default_Duplicate")
 
 
@@ -122,28 +128,28 @@ def registerMenuHotkeys(menuName, hotkey, importCmd=None, preBuildCmd=None, seco
         menuName=menuName, importCmd=importCmd, preBuild=preBuildCmd, secondary=secondaryCmd)
 
     buildRtCmdId = rtCmdIdFmt.format("build", menuName)
-    if pm.runTimeCommand(buildRtCmdId, q=True, ex=True):
-        pm.runTimeCommand(buildRtCmdId, e=True, delete=True)
-    pm.runTimeCommand(buildRtCmdId, c=buildCmd, **runTimeKwargs)
+    if cmds.runTimeCommand(buildRtCmdId, q=True, ex=True):
+        cmds.runTimeCommand(buildRtCmdId, e=True, delete=True)
+    cmds.runTimeCommand(buildRtCmdId, c=buildCmd, **runTimeKwargs)
 
     buildNameCmdId = namedCmdIdFmt.format("build", menuName)
-    pm.nameCommand(buildNameCmdId, c=buildRtCmdId,
-                   ann=buildRtCmdId + " Named Command")
+    cmds.nameCommand(buildNameCmdId, c=buildRtCmdId,
+                     ann=buildRtCmdId + " Named Command")
 
     destroyRtCmdId = rtCmdIdFmt.format("destroy", menuName)
-    if pm.runTimeCommand(destroyRtCmdId, q=True, ex=True):
-        pm.runTimeCommand(destroyRtCmdId, e=True, delete=True)
-    pm.runTimeCommand(destroyRtCmdId, c=destroyCmd, **runTimeKwargs)
+    if cmds.runTimeCommand(destroyRtCmdId, q=True, ex=True):
+        cmds.runTimeCommand(destroyRtCmdId, e=True, delete=True)
+    cmds.runTimeCommand(destroyRtCmdId, c=destroyCmd, **runTimeKwargs)
 
     destroyNameCmdId = namedCmdIdFmt.format("destroy", menuName)
-    pm.nameCommand(destroyNameCmdId, c=destroyRtCmdId,
-                   ann=destroyRtCmdId + " Named Command")
+    cmds.nameCommand(destroyNameCmdId, c=destroyRtCmdId,
+                     ann=destroyRtCmdId + " Named Command")
 
     # make sure we're in an editable hotkey set in >2017
     _switchToNonDefaultHotkeySet()
 
-    pm.hotkey(name=buildNameCmdId, **keyKwargs)
-    pm.hotkey(releaseName=destroyNameCmdId, **keyKwargs)
+    cmds.hotkey(name=buildNameCmdId, **keyKwargs)
+    cmds.hotkey(releaseName=destroyNameCmdId, **keyKwargs)
 
 
 def removeMenuHotkeys(menuName, hotkey):
@@ -160,22 +166,22 @@ def removeMenuHotkeys(menuName, hotkey):
     keyKwargs = utils.getHotkeyKwargs(hotkey)
 
     buildRtCmdId = rtCmdIdFmt.format("build", menuName)
-    if pm.runTimeCommand(buildRtCmdId, q=True, ex=True):
-        pm.runTimeCommand(buildRtCmdId, e=True, delete=True)
+    if cmds.runTimeCommand(buildRtCmdId, q=True, ex=True):
+        cmds.runTimeCommand(buildRtCmdId, e=True, delete=True)
 
     destroyRtCmdId = rtCmdIdFmt.format("destroy", menuName)
-    if pm.runTimeCommand(destroyRtCmdId, q=True, ex=True):
-        pm.runTimeCommand(destroyRtCmdId, e=True, delete=True)
+    if cmds.runTimeCommand(destroyRtCmdId, q=True, ex=True):
+        cmds.runTimeCommand(destroyRtCmdId, e=True, delete=True)
 
     # clear hotkeys if set
     buildNameCmdId = namedCmdIdFmt.format("build", menuName)
     destroyNameCmdId = namedCmdIdFmt.format("destroy", menuName)
     keyQueryKwargs = keyKwargs.copy()
     key = keyQueryKwargs.pop('k')
-    if pm.hotkey(key, query=True, name=True, **keyQueryKwargs) == buildNameCmdId:
-        pm.hotkey(name="", **keyKwargs)
-    if pm.hotkey(key, query=True, releaseName=True, **keyQueryKwargs) == destroyNameCmdId:
-        pm.hotkey(releaseName="", **keyKwargs)
+    if cmds.hotkey(key, query=True, name=True, **keyQueryKwargs) == buildNameCmdId:
+        cmds.hotkey(name="", **keyKwargs)
+    if cmds.hotkey(key, query=True, releaseName=True, **keyQueryKwargs) == destroyNameCmdId:
+        cmds.hotkey(releaseName="", **keyKwargs)
 
 
 # Building / Destroying Menus
@@ -185,27 +191,85 @@ def buildMenus(menuName):
     """
     Build any marking menus that were registered for a menu name.
 
+    Popup menus are only created for menus that should be built for the
+    current panel and modifiers. Popup menus that are still active from
+    the same key press, e.g. when the release was skipped or the hotkey
+    repeats, are kept along with any menu items they have already built.
+
     Args:
         menuName: A string name of the registered marking menu
     """
-    # perform destroy before building because sometimes
-    # the release-hotkey gets skipped if the current
-    # key modifiers change while the menu is active
-    destroyMenus(menuName)
+    global ACTIVE_MENUS
+
+    # if enabling was deferred at startup and hasn't happened yet,
+    # do it now so that all menus are registered
+    startup = sys.modules.get('workflowtoolsstartup')
+    if startup:
+        startup.ensureEnabled()
 
     # find any registered menus by name
     classes = getRegisteredMenus(menuName)
     LOG.debug('Building menu classes {0}: {1}'.format(menuName, classes))
+    panel = None
+    modifiers = None
+    menus = []
     for menuCls in classes:
         if issubclass(menuCls, rmbmenuhook.Menu):
             # for rmb menus, just register with the manager
             rmbmenuhook.registerMenu(menuName, menuCls)
         else:
-            inst = menuCls()
+            if panel is None:
+                panel = cmds.getPanel(underPointer=True)
+                modifiers = utils.getModifiers()
+            inst = getPooledMenu(menuCls, panel, modifiers)
             if inst.shouldBuild():
-                LOG.debug('Building: {0}'.format(inst))
-                ACTIVE_MENUS.append(inst)
-                inst.build()
+                menus.append(inst)
+
+    # destroy any active menus that don't match this key press, since
+    # the release-hotkey sometimes gets skipped if the current key
+    # modifiers change while the menu is active
+    for m in ACTIVE_MENUS:
+        if m not in menus:
+            LOG.debug('Destroying menu: {0}'.format(m))
+            m.destroy()
+            m.resetPressState()
+
+    isRepeat = False
+    for inst in menus:
+        if inst in ACTIVE_MENUS and inst.exists():
+            isRepeat = True
+            continue
+        LOG.debug('Building: {0}'.format(inst))
+        inst.build()
+    ACTIVE_MENUS = menus
+    if not isRepeat:
+        RMBMarkingMenu.wasInvoked = False
+
+
+def getPooledMenu(menuCls, panel, modifiers):
+    """
+    Return a MarkingMenu instance for the given panel and modifiers,
+    reusing an existing one if the same menu was built there before.
+    Reused menus start each key press with no per-press state, see `MarkingMenu.resetPressState`.
+
+    Args:
+        menuCls: A MarkingMenu subclass
+        panel: A string name of the panel under the pointer
+        modifiers: A tuple of modifier key states, see `utils.getModifiers`
+    """
+    key = (menuCls, panel, modifiers)
+    inst = MENU_POOL.get(key)
+    if inst is None:
+        inst = MENU_POOL[key] = menuCls()
+    return inst
+
+
+def clearMenuPool():
+    """
+    Remove all pooled MarkingMenu instances, so that
+    new instances will be created on the next key press.
+    """
+    MENU_POOL.clear()
 
 
 def destroyMenus(menuName):
@@ -223,6 +287,8 @@ def destroyMenus(menuName):
         wasAnyInvoked = wasAnyInvoked or m.wasInvoked
         LOG.debug('Destroying menu: {0}'.format(m))
         m.destroy()
+        # the key press is over, don't carry its state into the next one
+        m.resetPressState()
     ACTIVE_MENUS = []
 
     # check RMBMarkingMenu flag for invocation
@@ -273,6 +339,10 @@ def unregisterMenu(menuName, cls=None, all=False):
         # remove list if empty
         if not REGISTERED_MENUS[menuName]:
             del REGISTERED_MENUS[menuName]
+    # remove any pooled instances that are no longer registered
+    registered = set(c for classes in REGISTERED_MENUS.values() for c in classes)
+    for key in [k for k in MENU_POOL if k[0] not in registered]:
+        del MENU_POOL[key]
 
 
 def getRegisteredMenus(menuName):
@@ -302,6 +372,15 @@ class MarkingMenu(object):
     The base class for any quick marking menu that can
     be registered. Provides core functionality of building
     and destroying a popup menu appropriately.
+
+    Instances are pooled and reused for each key press in the
+    same panel with the same modifiers, so `__init__` should only
+    set up state that doesn't change between key presses.
+
+    The popup menu only exists while the hotkey is held, so menu items
+    are built the first time the menu is shown during each key press.
+    `refreshItemsOnShow` only applies to showing the menu again within
+    the same key press.
     """
 
     def __init__(self):
@@ -315,7 +394,7 @@ class MarkingMenu(object):
             'ctl': isCtrlPressed,
             'alt': isAltPressed,
         }
-        # variable to keep track of if this menu ever showed
+        # whether this menu was shown during the current key press
         self.wasInvoked = False
         # the panel that the popup menu will be attached to
         self.panel = cmds.getPanel(underPointer=True)
@@ -327,8 +406,19 @@ class MarkingMenu(object):
         self.popupMenuId = None
         # the mouse button that triggers this popup menu, 1=lmb, 2=mmb, 3=rmb
         self.mouseButton = 1
-        # when True, build menu items each time the menu is displayed
+        # when True, build menu items each time the menu is displayed,
+        # otherwise they are built only the first time it is displayed during a key press
         self.buildItemsOnShow = False
+        # whether menu items have been built for the current popup menu,
+        # reset each time the popup menu is created on key press
+        self.hasBuiltItems = False
+        # when True, menu items are built once per key press, and each time the menu is
+        # displayed again during that press only the state of items built with `buildStateItem` is updated
+        self.refreshItemsOnShow = False
+        # the current item states from `getMenuItemStates`
+        self.menuItemStates = {}
+        # list of (menu item, flag, state key) for items built with `buildStateItem`
+        self.stateItems = []
 
     def shouldBuild(self):
         """
@@ -347,60 +437,108 @@ class MarkingMenu(object):
         # calling destroy as a failsafe so that duplicate
         # menus dont get created
         self.destroy()
-        self.menu = pm.popupMenu(
-            self.popupMenuId, b=self.mouseButton, **self.popupKeyKwargs)
-        self.menu.postMenuCommand(self.onMenuWillShow)
-        # if not set to build on show, build items now
-        if not self.buildItemsOnShow:
-            pm.setParent(self.menu, m=True)
-            self.buildMenuItems()
+        self.menu = cmds.popupMenu(
+            self.popupMenuId, b=self.mouseButton, pmc=self.onMenuWillShow, **self.popupKeyKwargs)
+        # items are built when the menu is first shown, so that
+        # menus that are never invoked during a key press cost nothing.
+        # the popup is new, so items from previous presses are gone
+        self.resetPressState()
+
+    def resetPressState(self):
+        """
+        Reset the state that only applies to a single key press,
+        called when the popup menu is built and destroyed.
+        """
+        self.wasInvoked = False
+        self.hasBuiltItems = False
+        self.stateItems = []
+
+    def exists(self):
+        """
+        Return True if the popup menu for this menu currently exists
+        """
+        return cmds.popupMenu(self.popupMenuId, q=True, ex=True)
 
     def destroy(self):
         """
         Remove and destroy this menu
         """
-        if pm.popupMenu(self.popupMenuId, q=True, ex=True):
-            pm.deleteUI(self.popupMenuId)
+        if self.exists():
+            cmds.deleteUI(self.popupMenuId)
 
-    def onMenuWillShow(self, menu, parent):
+    def onMenuWillShow(self, *args):
         self.wasInvoked = True
-        if self.buildItemsOnShow:
-            self.menu.deleteAllItems()
-            pm.setParent(self.menu, m=True)
+        if self.refreshItemsOnShow and self.hasBuiltItems:
+            self.refreshMenuItems()
+        elif self.buildItemsOnShow or not self.hasBuiltItems:
+            cmds.popupMenu(self.menu, e=True, deleteAllItems=True)
+            self.stateItems = []
+            self.menuItemStates = self.getMenuItemStates()
+            cmds.setParent(self.menu, menu=True)
             self.buildMenuItems()
+            self.hasBuiltItems = True
 
     def buildMenuItems(self):
         """
         Build all menu items for the current popup menu.
-        Called each time the menu is about to be displayed.
+        Called when the menu is first displayed during a key press,
+        or each time it is displayed if `buildItemsOnShow` is enabled.
         """
         pass
 
+    def getMenuItemStates(self):
+        """
+        Override to return a dict of all values used by items built with
+        `buildStateItem`. Called before building or refreshing menu items.
+        """
+        return {}
+
+    def buildStateItem(self, stateKey, flag='cb', **kwargs):
+        """
+        Build a menu item whose `flag` value is set from `self.menuItemStates[stateKey]`,
+        and updated each time the menu is shown when `refreshItemsOnShow` is enabled.
+
+        Args:
+            stateKey: The key of the value in `self.menuItemStates`
+            flag: The menuItem flag to set, e.g. 'cb', 'en', or 'l'
+            kwargs: Any other menuItem kwargs
+        """
+        kwargs[flag] = self.menuItemStates[stateKey]
+        item = cmds.menuItem(**kwargs)
+        self.stateItems.append((item, flag, stateKey))
+        return item
+
+    def refreshMenuItems(self):
+        """
+        Update all items built with `buildStateItem` using the latest item states.
+        """
+        states = self.getMenuItemStates()
+        for item, flag, stateKey in self.stateItems:
+            value = states[stateKey]
+            if value != self.menuItemStates.get(stateKey):
+                cmds.menuItem(item, e=True, **{flag: value})
+        self.menuItemStates = states
+
 
 class RMBMarkingMenu(rmbmenuhook.Menu):
     """
     The base class for a marking menu that uses right mouse button in a model viewport.
     This is slightly different than the normal marking menu, because it is registered
     with rmbmenuhook and is instanced only when invoked.
+
+    `self.panel` and `self.panelType` are provided by the shared rmbmenuhook.MenuContext.
     """
 
     # currently using a class variable since the instance isn't
     # available when the other menus are destroyed
     wasInvoked = False
 
-    def __init__(self, menu, obj=None):
-        rmbmenuhook.Menu.__init__(self, menu, obj)
-        # the panel that the popup menu will be attached to
-        self.panel = cmds.getPanel(underPointer=True)
-        # the panel type, can be used when building to determine the menu's contents
-        self.panelType = cmds.getPanel(typeOf=self.panel)
-
     def build(self):
         """
         Build the popup menu that all menu items will be attached to
         """
         RMBMarkingMenu.wasInvoked = True
-        pm.setParent(self.menu, m=True)
+        cmds.setParent(self.context.menuName, menu=True)
         self.buildMenuItems()
 
     def buildMenuItems(self):
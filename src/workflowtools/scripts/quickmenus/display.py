@@ -0,0 +1,104 @@
+"""
+Utils for applying viewport display flags to one or more model panels.
+"""
+
+from maya import cmds
+
+
+__all__ = [
+    "getDisplayPanelMode",
+    "getTargetPanels",
+    "PANEL_MODES",
+    "setDisplayFlags",
+    "setDisplayPanelMode",
+]
+
+
+# the available modes for which panels display changes are applied to
+PANEL_MODES = [
+    # only the panel under the pointer
+    'panel',
+    # model panels in the same pane layout as the panel under the pointer,
+    # e.g. every pane of the four view layout, but not torn-off panels
+    'group',
+    # all visible model panels, including torn-off panels
+    'visible',
+    # all model panels, including hidden and torn-off panels
+    'all',
+]
+
+# the optionVar used to store the current panel mode
+PANEL_MODE_OPTIONVAR = "quickMenus_displayPanelMode"
+
+
+def getDisplayPanelMode():
+    """
+    Return the current panel mode, see `PANEL_MODES`
+    """
+    if cmds.optionVar(exists=PANEL_MODE_OPTIONVAR):
+        mode = cmds.optionVar(q=PANEL_MODE_OPTIONVAR)
+        if mode in PANEL_MODES:
+            return mode
+    return PANEL_MODES[0]
+
+
+def setDisplayPanelMode(mode):
+    """
+    Set the panel mode used when applying display flags, see `PANEL_MODES`
+    """
+    if mode not in PANEL_MODES:
+        raise ValueError("invalid panel mode: {0}".format(mode))
+    cmds.optionVar(sv=(PANEL_MODE_OPTIONVAR, mode))
+
+
+def getTargetPanels(panel, mode=None):
+    """
+    Return the model panels that display flags should be applied to.
+
+    Args:
+        panel: A string name of the current panel, always included
+        mode: A panel mode, see `PANEL_MODES`, uses the current mode if None
+    """
+    if mode is None:
+        mode = getDisplayPanelMode()
+    if mode == 'panel':
+        return [panel]
+    modelPanels = cmds.getPanel(type='modelPanel') or []
+    if mode == 'group':
+        layout = _getPanelLayout(panel)
+        modelPanels = [p for p in modelPanels if layout and _getPanelLayout(p) == layout]
+    elif mode == 'visible':
+        visible = set(cmds.getPanel(visiblePanels=True) or [])
+        modelPanels = [p for p in modelPanels if p in visible]
+    if panel not in modelPanels:
+        modelPanels.insert(0, panel)
+    return modelPanels
+
+
+def _getPanelLayout(panel):
+    """
+    Return the full name of the layout containing a panel,
+    or None if the panel isn't currently in a layout
+    """
+    control = cmds.panel(panel, q=True, control=True)
+    if control and '|' in control:
+        return control.rpartition('|')[0]
+
+
+def setDisplayFlags(flags, panels):
+    """
+    Apply display flags to all the given model panels, with viewport refresh
+    suspended so that the viewports are only redrawn once.
+
+    Args:
+        flags: A dict of {modelEditor flag: value}
+        panels: A list of string model panel names
+    """
+    if not flags or not panels:
+        return
+    cmds.refresh(suspend=True)
+    try:
+        for panel in panels:
+            cmds.modelEditor(panel, e=True, **flags)
+    finally:
+        cmds.refresh(suspend=False)
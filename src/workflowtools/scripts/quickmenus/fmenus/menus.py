@@ -1,24 +1,33 @@
 
+import contextlib
+import json
 import logging
 import operator
 
-import pymel.core as pm
+import maya.api.OpenMaya as om
 import pymetanode as meta
+from maya import cmds
 
+from .. import backend
 from .. import core
+from .. import utils
+from . import rules
 
 
 __all__ = [
     "createCollection",
     "getActiveCollection",
     "getAllCollections",
+    "getCachedCollections",
     "getCollection",
     "getCollectionNameFromNode",
     "getDefaultCollection",
+    "invalidateCollections",
     "QuickSelectCollection",
     "QuickSelectCollectionsMenu",
     "QuickSelectMenu",
     "QuickSelectSet",
+    "selectSets",
 ]
 
 
@@ -29,6 +38,10 @@ LOG = logging.getLogger("quickmenus")
 META_CLASSNAME = "QuickSelectCollection"
 # prefix for quick select collection nodes
 COLLECTION_PREFIX = "quickSelectCollection_"
+# the attribute that pymetanode stores all metadata in
+METADATA_ATTR = "pyMetaData"
+# prefix for the string attributes that each quick select set is stored in
+SET_ATTR_PREFIX = "quickSelectSet_"
 # the name of the default auto-created collection
 DEFAULT_COLLECTION_NAME = "Default"
 # the name of the active quick select collection
@@ -41,16 +54,107 @@ RADIAL_POSITIONS = ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW']
 SHOW_COUNTS = False
 
 
+# {uuid: QuickSelectCollection} for all collections in the scene,
+# or None if the scene needs to be scanned again
+_COLLECTIONS = None
+# ids of the scene callbacks that invalidate the collection cache
+_SCENE_CALLBACKS = []
+# ids of the collection node callbacks that invalidate the collection cache
+_NODE_CALLBACKS = []
+# the number of active `_suspendInvalidation` contexts
+_SUSPEND_COUNT = 0
+
+
 # Quick Select Core
 # -----------------
 
+def getCachedCollections():
+    """
+    Return a dict of {uuid: QuickSelectCollection} for all collections in the scene.
+
+    Collections are only loaded from the scene the first time they are needed, and
+    again after a scene is opened, created, imported or referenced, a network node is
+    added or deleted, or a collection node is renamed or has its metadata changed.
+    """
+    global _COLLECTIONS
+    if _COLLECTIONS is None:
+        _installSceneCallbacks()
+        if _NODE_CALLBACKS:
+            om.MMessage.removeCallbacks(_NODE_CALLBACKS)
+            del _NODE_CALLBACKS[:]
+        _COLLECTIONS = {}
+        for node in meta.find_meta_nodes(META_CLASSNAME):
+            _cacheCollection(QuickSelectCollection.fromNode(node))
+    return _COLLECTIONS
+
+
+def invalidateCollections():
+    """
+    Clear the cached collections so they are loaded again when next needed.
+    """
+    global _COLLECTIONS
+    if not _SUSPEND_COUNT:
+        _COLLECTIONS = None
+
+
+@contextlib.contextmanager
+def _suspendInvalidation():
+    # ignore scene changes made by the collections themselves
+    global _SUSPEND_COUNT
+    _SUSPEND_COUNT += 1
+    try:
+        yield
+    finally:
+        _SUSPEND_COUNT -= 1
+
+
+def _cacheCollection(coll):
+    # add a collection to the cache and watch its node for changes
+    _COLLECTIONS[coll.uuid] = coll
+    sel = om.MSelectionList()
+    sel.add(str(coll.node))
+    node = sel.getDependNode(0)
+    _NODE_CALLBACKS.append(om.MNodeMessage.addAttributeChangedCallback(node, _onAttributeChanged))
+    _NODE_CALLBACKS.append(om.MNodeMessage.addNameChangedCallback(node, _onNodeChanged))
+
+
+def _installSceneCallbacks():
+    if _SCENE_CALLBACKS:
+        return
+    for message in (om.MSceneMessage.kAfterNew, om.MSceneMessage.kAfterOpen,
+                    om.MSceneMessage.kAfterImport, om.MSceneMessage.kAfterCreateReference,
+                    om.MSceneMessage.kAfterLoadReference, om.MSceneMessage.kAfterUnloadReference,
+                    om.MSceneMessage.kAfterRemoveReference):
+        _SCENE_CALLBACKS.append(om.MSceneMessage.addCallback(message, _onSceneChanged))
+    # collections are stored on network nodes, watching for any added or removed
+    # also catches undoing and redoing the creation or deletion of collections
+    _SCENE_CALLBACKS.append(om.MDGMessage.addNodeAddedCallback(_onNodeChanged, 'network'))
+    _SCENE_CALLBACKS.append(om.MDGMessage.addNodeRemovedCallback(_onNodeChanged, 'network'))
+
+
+def _onSceneChanged(*args):
+    invalidateCollections()
+
+
+def _onNodeChanged(*args):
+    invalidateCollections()
+
+
+def _onAttributeChanged(msg, plug, otherPlug, clientData):
+    changes = om.MNodeMessage.kAttributeSet | om.MNodeMessage.kAttributeAdded | om.MNodeMessage.kAttributeRemoved
+    if msg & changes:
+        attrName = plug.partialName(useLongNames=True)
+        if attrName == METADATA_ATTR or attrName.startswith(SET_ATTR_PREFIX):
+            invalidateCollections()
+
+
 def getAllCollections():
     """
     Return a list of all quick select collections
     """
-    nodes = meta.find_meta_nodes(META_CLASSNAME)
-    if nodes:
-        return [QuickSelectCollection.fromNode(n) for n in nodes]
+    collections = list(getCachedCollections().values())
+    if collections:
+        return collections
     # no sets, create the default one and return it in a list
     return [getDefaultCollection()]
 
@@ -59,10 +163,9 @@ def getCollection(name):
     """
     Return a QuickSelectCollection from the scene by name
     """
-    nodes = meta.find_meta_nodes(META_CLASSNAME)
-    for n in nodes:
-        if getCollectionNameFromNode(n) == name:
-            return QuickSelectCollection.fromNode(n)
+    for coll in getCachedCollections().values():
+        if coll.name == name:
+            return coll
 
 
 def getDefaultCollection():
@@ -102,12 +205,30 @@ def getCollectionNameFromNode(node):
     return node.nodeName()[len(COLLECTION_PREFIX):]
 
 
-def promptBox(title, msg, okButton, cancelButton, tx=None):
-    prompt = pm.cmds.promptDialog(t=title, m=msg, tx=tx, b=[
-                                  okButton, cancelButton])
-    if prompt != okButton:
-        return
-    return pm.cmds.promptDialog(q=True)
+def selectSets(quickSets, add=True):
+    """
+    Select the members of all the given sets using a single selection call.
+    Members are merged by uuid, so members shared by several sets are only selected once.
+    """
+    names = []
+    uuids = []
+    liveRules = []
+    for quickSet in quickSets:
+        names.extend(quickSet.nodes)
+        uuids.extend(quickSet.uuids)
+        liveRules.extend(quickSet.rules)
+    names, missing = backend.resolveMembers(*backend.compactMembers(names, uuids))
+    if missing:
+        LOG.warning("{0} quick select set member(s) could not be found: {1}".format(
+            len(missing), ', '.join(missing[:10])))
+    if liveRules:
+        liveNames = rules.evaluateRules(liveRules)
+        liveNameSet = set(liveNames)
+        names = [n for n in names if n not in liveNameSet] + liveNames
+    if names:
+        cmds.select(backend.expandComponents(names), add=add)
+    elif not add:
+        cmds.select(clear=True)
 
 
 def setShowCounts(newShow):
@@ -119,6 +240,13 @@ class QuickSelectCollection(object):
     """
     Acts as the data model for all quick select menus.
     Can load and save quick select sets and collections.
+
+    Each set is stored in its own string attribute on the collection node,
+    and the order of sets is stored in the collection's metadata, so that
+    saving only writes the sets that have changed.
+
+    Loading a collection only reads its metadata, which includes a summary
+    of its sets. The sets themselves are loaded when first accessed.
     """
     @classmethod
     def fromNode(cls, node):
@@ -128,17 +256,58 @@ class QuickSelectCollection(object):
 
     def __init__(self, name=None):
         self.name = name
-        self.sets = []
+        # the loaded sets, or None if they haven't been loaded yet
+        self._sets = []
+        # the ids of the saved sets, used to load them when needed
+        self._setIds = []
+        # the total number of static members in all sets as of the last save
+        self._memberCount = 0
+        # the collection node, once loaded or saved
+        self.node = None
+        # the uuid of the collection node, once loaded or saved
+        self.uuid = None
+        # ids of sets that have been removed since the last save
+        self.removedSetIds = []
+        # whether the list of sets has changed since the last save
+        self.isOrderDirty = True
+
+    @property
+    def sets(self):
+        if self._sets is None:
+            self._loadSets()
+        return self._sets
+
+    @sets.setter
+    def sets(self, value):
+        self._sets = value
+
+    def isLoaded(self):
+        """
+        Return True if the sets of this collection have been loaded
+        """
+        return self._sets is not None
+
+    def getSummary(self):
+        """
+        Return a tuple of (set count, member count) for this collection,
+        without loading its sets if they haven't been loaded yet.
+        Only static members are counted, since members found by rules
+        change with the scene.
+        """
+        if self._sets is None:
+            return len(self._setIds), self._memberCount
+        return len(self._sets), sum(s.getStaticCount() for s in self._sets)
 
     def getNode(self):
         """
         Return the collection node from the scene with the
         same name, if one exists
         """
-        nodes = meta.find_meta_nodes(META_CLASSNAME)
-        for n in nodes:
-            if getCollectionNameFromNode(n) == self.name:
-                return n
+        if self.node is not None and self.node.exists():
+            return self.node
+        for coll in getCachedCollections().values():
+            if coll is not self and coll.name == self.name and coll.node.exists():
+                return coll.node
 
     def getOrCreateNode(self):
         """
@@ -149,9 +318,15 @@ class QuickSelectCollection(object):
         if node:
             return node
         else:
-            sel = pm.selected()
+            # collection nodes are PyNodes, as returned by pymetanode
+            import pymel.core as pm
+            # createNode selects the new node, restore the selection without building PyNodes
+            sel = cmds.ls(sl=True, long=True)
             node = pm.createNode('network', name=COLLECTION_PREFIX + self.name)
-            pm.select(sel)
+            if sel:
+                cmds.select(sel, r=True)
+            else:
+                cmds.select(clear=True)
             return node
 
     def load(self, node=None):
@@ -159,19 +334,98 @@ class QuickSelectCollection(object):
             node = self.getNode()
         if node:
             data = meta.get_metadata(node, META_CLASSNAME)
+            self.node = node
+            self.uuid = cmds.ls(str(node), uuid=True)[0]
             self.name = getCollectionNameFromNode(node)
-            self.sets = [QuickSelectSet(**kwargs)
-                         for kwargs in data.get('sets', [])]
+            self.removedSetIds = []
+            if 'sets' in data:
+                # collections saved before sets were stored individually,
+                # the sets are all written separately on the next save
+                self._sets = [QuickSelectSet.fromDict(kwargs) for kwargs in data['sets']]
+                self.isOrderDirty = True
+            else:
+                self._sets = None
+                self._setIds = data.get('setIds', [])
+                self._memberCount = data.get('memberCount', 0)
+                self.isOrderDirty = False
+
+    def _loadSets(self):
+        nodeName = str(self.node)
+        self._sets = []
+        for setId in self._setIds:
+            attrName = SET_ATTR_PREFIX + setId
+            if not cmds.attributeQuery(attrName, node=nodeName, exists=True):
+                LOG.warning("Missing quick select set data: {0}.{1}".format(nodeName, attrName))
+                continue
+            setData = cmds.getAttr('{0}.{1}'.format(nodeName, attrName))
+            try:
+                quickSet = QuickSelectSet.fromDict(json.loads(setData) if setData else {})
+            except ValueError:
+                LOG.warning("Invalid quick select set data: {0}.{1}".format(nodeName, attrName))
+                continue
+            quickSet.id = setId
+            quickSet.isDirty = False
+            self._sets.append(quickSet)
+        if len(self._sets) != len(self._setIds):
+            # drop the skipped sets from the list of sets when next saved
+            self.isOrderDirty = True
 
     def save(self):
+        """
+        Save all sets that have changed, and the list of sets if it has changed
+        """
         # TODO: handle locked nodes
-        data = {
-            'sets': [s.asDict() for s in self.sets]
-        }
-        node = self.getOrCreateNode()
-        # update name to resolve node creation differences
-        self.name = getCollectionNameFromNode(node)
-        meta.set_metadata(node, META_CLASSNAME, data)
+        cmds.undoInfo(openChunk=True)
+        try:
+            with _suspendInvalidation():
+                node = self.getOrCreateNode()
+                nodeName = str(node)
+                # update name to resolve node creation differences
+                self.name = getCollectionNameFromNode(node)
+                for setId in self.removedSetIds:
+                    if cmds.attributeQuery(SET_ATTR_PREFIX + setId, node=nodeName, exists=True):
+                        cmds.deleteAttr(nodeName, at=SET_ATTR_PREFIX + setId)
+                self.removedSetIds = []
+                # sets that were never loaded can't have changed
+                sets = self._sets or []
+                usedIds = set(s.id for s in sets)
+                for quickSet in sets:
+                    if quickSet.id is None:
+                        quickSet.id = self._getNewSetId(usedIds)
+                        usedIds.add(quickSet.id)
+                        self.isOrderDirty = True
+                    if quickSet.isDirty:
+                        self._saveSet(nodeName, quickSet)
+                setCount, memberCount = self.getSummary()
+                if self.isOrderDirty or memberCount != self._memberCount:
+                    if self._sets is not None:
+                        self._setIds = [s.id for s in self._sets]
+                    self._memberCount = memberCount
+                    meta.set_metadata(node, META_CLASSNAME, {
+                        'setIds': self._setIds,
+                        'memberCount': self._memberCount,
+                    })
+                    self.isOrderDirty = False
+            if self.node is None:
+                self.node = node
+                self.uuid = cmds.ls(nodeName, uuid=True)[0]
+                if _COLLECTIONS is not None and self.uuid not in _COLLECTIONS:
+                    _cacheCollection(self)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+    def _saveSet(self, nodeName, quickSet):
+        attrName = SET_ATTR_PREFIX + quickSet.id
+        if not cmds.attributeQuery(attrName, node=nodeName, exists=True):
+            cmds.addAttr(nodeName, ln=attrName, dt='string')
+        cmds.setAttr('{0}.{1}'.format(nodeName, attrName), json.dumps(quickSet.asDict()), type='string')
+        quickSet.isDirty = False
+
+    def _getNewSetId(self, usedIds):
+        index = len(self.sets)
+        while str(index) in usedIds:
+            index += 1
+        return str(index)
 
     def isReadOnly(self):
         return False
@@ -186,14 +440,15 @@ class QuickSelectCollection(object):
     def delete(self):
         node = self.getNode()
         if node:
-            pm.delete(node)
+            cmds.delete(str(node))
 
     def setName(self, newName):
         # TODO: sanitize name
         # TODO: make sure name is available
         node = self.getNode()
         if node:
-            node.rename(COLLECTION_PREFIX + newName)
+            with _suspendInvalidation():
+                node.rename(COLLECTION_PREFIX + newName)
             self.name = getCollectionNameFromNode(node)
         else:
             self.name = newName
@@ -207,23 +462,29 @@ class QuickSelectCollection(object):
                 if s.position == quickSet.position:
                     raise ValueError(
                         "cannot add a quick set, position already occupied: {0}".format(s.position))
+        quickSet.isDirty = True
         self.sets.append(quickSet)
+        self.isOrderDirty = True
         self.save()
 
     def removeSetAtPosition(self, position):
-        for s in self.sets:
+        for i, s in enumerate(self.sets):
             if s.position == position:
-                self.sets.remove(s)
-                self.save()
+                self.removeSetAtIndex(i)
                 break
 
     def removeSetAtIndex(self, index):
         if index >= 0 and index < len(self.sets):
-            self.sets.pop(index)
+            quickSet = self.sets.pop(index)
+            if quickSet.id is not None:
+                self.removedSetIds.append(quickSet.id)
+            self.isOrderDirty = True
             self.save()
 
     def clearSets(self):
+        self.removedSetIds.extend(s.id for s in self.sets if s.id is not None)
         self.sets = []
+        self.isOrderDirty = True
         self.save()
 
     def getRadialVacancies(self):
@@ -237,48 +498,118 @@ class QuickSelectCollection(object):
 class QuickSelectSet(object):
     """
     Represents one or more objects in the scene that
-    can then be easily selected
+    can then be easily selected.
+
+    Members are stored by the uuid of their node, so that they can be found
+    after being renamed or reparented, with their names kept as a fallback.
+    Components are stored as compact index ranges, see `backend.compactMembers`.
+
+    Sets can also have rules, which find live members in the scene when
+    the set is selected, see `rules`.
     """
 
-    def __init__(self, nodes, title=None, position=None):
-        # the nodes in this set
+    @classmethod
+    def fromDict(cls, data):
+        """
+        Return a QuickSelectSet from data returned by `asDict`,
+        without querying the scene.
+        """
+        inst = cls([], title=data.get('title'), position=data.get('position'), rules=data.get('rules'))
+        nodes = data.get('nodes', [])
+        # sets saved before uuids were stored only have names
+        uuids = data.get('uuids') or [None] * len(nodes)
+        # sets saved before components were compacted list every component
+        inst.nodes, inst.uuids = backend.compactMembers(nodes, uuids)
+        return inst
+
+    def __init__(self, nodes, title=None, position=None, rules=None):
+        # the rules that find the live members of this set
+        self.rules = list(rules or [])
+        # the names of the nodes in this set
+        self.nodes = []
+        # the uuid of each node in this set, or None if unknown
+        self.uuids = []
         self.setNodes(nodes)
         # title of this sets menu item
         self.title = title
         # the radial position of this set
         self.position = position
+        # the id of this set within its collection, assigned when first saved
+        self.id = None
+        # whether this set has changed since it was last saved
+        self.isDirty = True
 
     def getTitle(self):
         if self.title:
             return self.title
+        elif self.rules and not self.nodes:
+            return self.abbreviate([rules.formatRules(self.rules)])
         else:
             return self.abbreviate(self.nodes)
 
     def __len__(self):
+        if self.rules:
+            return len(self.nodes) + len(rules.evaluateRules(self.rules))
         return self.nodes.__len__()
 
+    def getStaticCount(self):
+        """
+        Return the number of members stored in this set, not including
+        any live members found by its rules
+        """
+        return len(self.nodes)
+
+    def isLive(self):
+        """
+        Return True if this set has rules that find live members
+        """
+        return bool(self.rules)
+
     def asDict(self):
         """
         Return this QuickSelectSet as a simple python object
         """
         result = {
             'nodes': self.nodes,
+            'uuids': self.uuids,
+            'rules': self.rules,
             'title': self.title,
             'position': self.position,
         }
         return result
 
+    def setTitle(self, title):
+        self.title = title
+        self.isDirty = True
+
+    def setRules(self, newRules):
+        self.rules = list(newRules)
+        self.isDirty = True
+
     def setNodes(self, newNodes):
-        self.nodes = []
-        for n in newNodes:
-            if isinstance(n, pm.nt.DependNode):
-                self.nodes.append(n.longName())
-            else:
-                self.nodes.append(str(n))
+        names = backend.getNodeNames(newNodes)
+        self.nodes, self.uuids = backend.compactMembers(names, backend.getUuids(names))
+        self.isDirty = True
 
     def addNodes(self, newNodes):
-        pyNodes = [pm.PyNode(n) for n in self.nodes]
-        self.setNodes(set(pyNodes + newNodes))
+        names = backend.getNodeNames(newNodes)
+        # members are merged by the uuids of their nodes, and components by index
+        self.nodes, self.uuids = backend.compactMembers(
+            self.nodes + names, self.uuids + backend.getUuids(names))
+        self.isDirty = True
+
+    def resolveNodes(self):
+        """
+        Return the current names of all members of this set, and update the stored
+        names of any members that have been renamed or reparented.
+
+        Returns:
+            A tuple of (resolved names, stored names of any members that could not be found)
+        """
+        names, missing = backend.resolveMembers(self.nodes, self.uuids)
+        if not missing:
+            self.nodes = names
+        return names, missing
 
     def abbreviate(self, nodes, maxLen=15):
         str = ', '.join([n.split('|')[-1] for n in nodes])
@@ -287,7 +618,19 @@ class QuickSelectSet(object):
         return str
 
     def select(self, add=True):
-        pm.select(self.nodes, add=add)
+        names = []
+        if self.nodes:
+            names, missing = self.resolveNodes()
+            if missing:
+                LOG.warning("{0} member(s) of '{1}' could not be found: {2}".format(
+                    len(missing), self.getTitle(), ', '.join(missing[:10])))
+        if self.rules:
+            # live members are evaluated with bulk queries and cached
+            names = names + rules.evaluateRules(self.rules)
+        if names:
+            cmds.select(backend.expandComponents(names), add=add)
+        elif not add:
+            cmds.select(clear=True)
 
 
 class QuickSelectMenu(core.MarkingMenu):
@@ -314,42 +657,69 @@ class QuickSelectMenu(core.MarkingMenu):
                 itemKwargs['l'] += ' ({0})'.format(len(s))
             if s.position:
                 itemKwargs['rp'] = s.position
-            pm.menuItem(c=pm.Callback(
-                pm.select, s.nodes, add=True), **itemKwargs)
+            cmds.menuItem(c=utils.Callback(s.select, add=True), **itemKwargs)
             if not self.isReadOnly:
-                pm.menuItem(ob=True, c=pm.Callback(self.editSet, s, i))
+                cmds.menuItem(ob=True, c=utils.Callback(self.editSet, s, i))
 
         # put in slots for vacancies
         if not self.isReadOnly:
             vacantPositions = self.collection.getRadialVacancies()
             for rp in vacantPositions:
-                pm.menuItem(l='...', rp=rp, c=pm.Callback(
+                cmds.menuItem(l='...', rp=rp, c=utils.Callback(
                     self.addSetFromSelection, position=rp))
             # always include slot at end of extras list
-            pm.menuItem(l='...', c=pm.Callback(self.addSetFromSelection))
+            cmds.menuItem(l='...', c=utils.Callback(self.addSetFromSelection))
+            cmds.menuItem(l='New Rule Set...', c=utils.Callback(self.addRuleSetPrompt))
 
         # collection title
-        pm.menuItem(d=True)
-        pm.menuItem(l=self.collection.name, c=pm.Callback(self.selectAll))
-        pm.menuItem(ob=True, c=pm.CallbackWithArgs(
+        cmds.menuItem(d=True)
+        cmds.menuItem(l=self.collection.name, c=utils.Callback(self.selectAll))
+        cmds.menuItem(ob=True, c=utils.CallbackWithArgs(
             QuickSelectCollectionsMenu.editCollection, self.collection))
 
     def addSetFromSelection(self, position=None):
-        s = QuickSelectSet(pm.selected(), position=position)
+        s = QuickSelectSet(backend.getSelectedNames(), position=position)
         if len(s):
             self.collection.addSet(s)
 
+    def addRuleSetPrompt(self):
+        newRules = self.rulesPrompt('New Rule Set', 'Create')
+        if newRules:
+            vacantPositions = self.collection.getRadialVacancies()
+            position = vacantPositions[0] if vacantPositions else None
+            self.collection.addSet(QuickSelectSet([], position=position, rules=newRules))
+
+    def rulesPrompt(self, title, okButton, currentRules=None):
+        """
+        Prompt for quick select rules and return them,
+        or None if cancelled or the rules are invalid.
+        """
+        text = utils.promptBox(
+            title, 'Enter rules, e.g. shape=nurbsCurve namespace=rig *_ctl; type=joint root=|rig|root_jnt',
+            okButton, 'Cancel', tx=rules.formatRules(currentRules or []))
+        if text is None:
+            return
+        try:
+            return rules.parseRules(text)
+        except ValueError as e:
+            cmds.warning(str(e))
+
     def editSet(self, quickSet, quickSetIndex):
+        buttons = ['Add', 'Replace', 'Rename', 'Delete', 'Cancel']
+        if quickSet.isLive():
+            buttons.insert(0, 'Edit Rules')
         kw = dict(
             t='Edit Quick Select Set:',
             m=quickSet.getTitle(),
             db='Cancel',
             cb='Cancel',
             ds='dismiss',
-            b=['Add', 'Replace', 'Rename', 'Delete', 'Cancel'],
+            b=buttons,
         )
-        action = pm.confirmDialog(**kw)
-        if action == 'Add':
+        action = cmds.confirmDialog(**kw)
+        if action == 'Edit Rules':
+            self.editRulesPrompt(quickSet)
+        elif action == 'Add':
             self.addSelection(quickSet)
         elif action == 'Replace':
             self.replaceWithSelection(quickSet)
@@ -359,34 +729,39 @@ class QuickSelectMenu(core.MarkingMenu):
             self.deleteSet(quickSetIndex)
 
     def addSelection(self, quickSet):
-        quickSet.addNodes(pm.selected())
+        quickSet.addNodes(backend.getSelectedNames())
         self.collection.save()
 
     def replaceWithSelection(self, quickSet):
-        quickSet.setNodes(pm.selected())
+        quickSet.setNodes(backend.getSelectedNames())
         self.collection.save()
 
+    def editRulesPrompt(self, quickSet):
+        newRules = self.rulesPrompt('Edit Rules', 'Save', quickSet.rules)
+        if newRules is not None:
+            quickSet.setRules(newRules)
+            self.collection.save()
+
     def renamePrompt(self, quickSet):
-        name = promptBox('Rename Set', 'Enter a name:',
+        name = utils.promptBox('Rename Set', 'Enter a name:',
                          'Rename', 'Cancel', tx=quickSet.title)
         if name:
-            quickSet.title = name
+            quickSet.setTitle(name)
             self.collection.save()
 
     def deleteSet(self, quickSetIndex):
         self.collection.removeSetAtIndex(quickSetIndex)
 
     def selectAll(self):
-        for s in self.collection.sets:
-            s.select(add=True)
+        selectSets(self.collection.sets, add=True)
 
 
 class QuickSelectCollectionsMenu(core.RMBMarkingMenu):
 
     def buildMenuItems(self):
         # header
-        pm.menuItem(l='Quick Select Collections', en=False)
-        pm.menuItem(d=True)
+        cmds.menuItem(l='Quick Select Collections', en=False)
+        cmds.menuItem(d=True)
 
         # list all collections
         collections = getAllCollections()
@@ -395,24 +770,25 @@ class QuickSelectCollectionsMenu(core.RMBMarkingMenu):
             itemKwargs = {
                 'l': coll.name,
                 'cb': coll.isActive(),
+                'ann': '{0} set(s), {1} member(s)'.format(*coll.getSummary()),
             }
-            pm.menuItem(c=pm.Callback(coll.makeActive), **itemKwargs)
-            pm.menuItem(ob=True, c=pm.CallbackWithArgs(
+            cmds.menuItem(c=utils.Callback(coll.makeActive), **itemKwargs)
+            cmds.menuItem(ob=True, c=utils.CallbackWithArgs(
                 QuickSelectCollectionsMenu.editCollection, coll))
 
         # new collection item
-        pm.menuItem(l='New...', itl=True, c=pm.Callback(
+        cmds.menuItem(l='New...', itl=True, c=utils.Callback(
             QuickSelectCollectionsMenu.newCollectionPrompt))
 
         # additional options
-        pm.menuItem(d=True)
-        pm.menuItem(l='Show Node Counts', cb=SHOW_COUNTS, c=pm.CallbackWithArgs(setShowCounts),
+        cmds.menuItem(d=True)
+        cmds.menuItem(l='Show Node Counts', cb=SHOW_COUNTS, c=utils.CallbackWithArgs(setShowCounts),
                     ann="Display node counts on menu items in the quick select menu"
                     )
 
     @staticmethod
     def newCollectionPrompt():
-        name = promptBox('New Quick Select Collection',
+        name = utils.promptBox('New Quick Select Collection',
                          'Enter a name (camelCase):', 'Create', 'Cancel')
         if name:
             createCollection(name)
@@ -422,13 +798,13 @@ class QuickSelectCollectionsMenu(core.RMBMarkingMenu):
         print(args, kwargs)
         kw = dict(
             t='Edit Collection: {0}'.format(coll.name),
-            m='{0} set(s)'.format(len(coll.sets)),
+            m='{0} set(s), {1} member(s)'.format(*coll.getSummary()),
             db='Cancel',
             cb='Cancel',
             ds='dismiss',
             b=['Delete', 'Clear', 'Rename', 'Cancel'],
         )
-        action = pm.confirmDialog(**kw)
+        action = cmds.confirmDialog(**kw)
         if action == 'Clear':
             coll.clearSets()
         elif action == 'Delete':
@@ -439,7 +815,7 @@ class QuickSelectCollectionsMenu(core.RMBMarkingMenu):
     @staticmethod
     def renameCollectionPrompt(coll):
         currentName = coll.name
-        name = promptBox('Rename Collection', 'Enter a name (camelCase):',
+        name = utils.promptBox('Rename Collection', 'Enter a name (camelCase):',
                          'Rename', 'Cancel', tx=currentName)
         if name:
             coll.setName(name)
@@ -0,0 +1,202 @@
+"""
+Rules for live quick select sets, whose members are found in the scene
+each time they are needed rather than stored.
+
+A rule matches dag nodes, and is a dict with any of the following keys:
+    pattern: A name pattern, e.g. '*_ctl', matches all names if not set.
+        Patterns are matched by `ls`, so '*' doesn't match namespaces, e.g.
+        '*_ctl' only matches the root namespace, and '*:*_ctl' matches 'rig:arm_ctl'
+    namespace: A namespace that matching nodes must be in
+    type: A node type that matching nodes must be
+    shape: A shape type, matching nodes must be transforms with a shape of this type
+    root: The full name of a dag node that matching nodes must be under
+
+Rules are compiled into as few bulk `ls` queries as possible, and the results
+are cached until a dag node is added, removed, renamed or reparented. The callbacks
+that watch for those changes only exist while there are cached results, and are
+removed when a scene is opened or created.
+"""
+
+import collections
+import json
+
+import maya.api.OpenMaya as om
+import maya.utils
+from maya import cmds
+
+
+__all__ = [
+    "compileRules",
+    "evaluateRules",
+    "formatRules",
+    "invalidateRuleResults",
+    "parseRules",
+    "RULE_KEYS",
+]
+
+
+# all valid keys of a rule
+RULE_KEYS = ['pattern', 'namespace', 'type', 'shape', 'root']
+
+# {rules key: [names]} of the cached results of evaluated rules
+_RESULTS = {}
+# ids of the callbacks that invalidate the cached results
+_CALLBACKS = []
+# ids of the scene callbacks that remove `_CALLBACKS`
+_SCENE_CALLBACKS = []
+# whether removing `_CALLBACKS` has been deferred
+_IS_REMOVE_PENDING = False
+
+
+def parseRules(text):
+    """
+    Return a list of rules parsed from text, with rules separated by ';', and each
+    rule made of space separated 'key=value' pairs, or a bare name pattern.
+    e.g. 'shape=nurbsCurve namespace=rig *_ctl; type=joint root=|rig|root_jnt'
+
+    Raises:
+        ValueError if the text contains an unknown key
+    """
+    rules = []
+    for ruleText in text.split(';'):
+        rule = {}
+        for token in ruleText.split():
+            key, sep, value = token.partition('=')
+            if not sep:
+                key, value = 'pattern', token
+            if key not in RULE_KEYS:
+                raise ValueError("Unknown quick select rule key: {0}".format(key))
+            rule[key] = value
+        if rule:
+            rules.append(rule)
+    return rules
+
+
+def formatRules(rules):
+    """
+    Return rules formatted as text that can be parsed with `parseRules`
+    """
+    return '; '.join(' '.join('{0}={1}'.format(k, rule[k]) for k in RULE_KEYS if rule.get(k)) for rule in rules)
+
+
+def compileRules(rules):
+    """
+    Return a list of queries that find all nodes matching the given rules.
+    Rules that share a type, shape type and root are merged into one query.
+
+    Returns:
+        A list of (type, shape type, root, patterns) tuples, where patterns is
+        a list of name patterns, or None to match all names
+    """
+    queries = collections.OrderedDict()
+    for rule in rules:
+        pattern = rule.get('pattern')
+        namespace = rule.get('namespace')
+        if namespace:
+            pattern = '{0}:{1}'.format(namespace.strip(':'), pattern or '*')
+        key = (rule.get('type'), rule.get('shape'), rule.get('root'))
+        if key in queries and queries[key] is None:
+            continue
+        if pattern is None:
+            queries[key] = None
+        elif pattern not in queries.setdefault(key, []):
+            queries[key].append(pattern)
+    return [key + (patterns,) for key, patterns in queries.items()]
+
+
+def _runQuery(nodeType, shapeType, root, patterns):
+    kwargs = {'long': True}
+    if shapeType:
+        kwargs['type'] = shapeType
+        kwargs['noIntermediate'] = True
+    else:
+        kwargs['type'] = nodeType or 'dagNode'
+    if not root and not shapeType:
+        # let maya match the patterns
+        if patterns is None:
+            return cmds.ls(**kwargs) or []
+        return cmds.ls(patterns, **kwargs) or []
+
+    if root:
+        nodes = cmds.ls(root, dag=True, **kwargs) or []
+    else:
+        nodes = cmds.ls(**kwargs) or []
+    if shapeType and nodes:
+        nodes = cmds.listRelatives(nodes, parent=True, fullPath=True) or []
+        if nodeType and nodes:
+            nodes = cmds.ls(nodes, type=nodeType, long=True) or []
+    if patterns is None or not nodes:
+        return nodes
+    # match the patterns using ls as well, so that they match the same names as above
+    matches = set(cmds.ls(patterns, long=True, type='dagNode') or [])
+    return [n for n in nodes if n in matches]
+
+
+def evaluateRules(rules):
+    """
+    Return the full names of all nodes matching any of the given rules.
+    Results are cached until a dag node is added, removed, renamed or reparented.
+    """
+    key = json.dumps(rules, sort_keys=True)
+    if key not in _RESULTS:
+        _installCallbacks()
+        results = collections.OrderedDict()
+        for query in compileRules(rules):
+            results.update((n, None) for n in _runQuery(*query))
+        _RESULTS[key] = list(results)
+    return _RESULTS[key]
+
+
+def invalidateRuleResults(*args):
+    """
+    Clear the cached results of all rules so they are evaluated again when next needed.
+    """
+    global _IS_REMOVE_PENDING
+    _RESULTS.clear()
+    # there is nothing left to invalidate, so stop watching the scene, but
+    # not from within the callbacks that may have called this
+    if _CALLBACKS and not _IS_REMOVE_PENDING:
+        _IS_REMOVE_PENDING = True
+        maya.utils.executeDeferred(_removeUnusedCallbacks)
+
+
+def _installCallbacks():
+    global _IS_REMOVE_PENDING
+    _IS_REMOVE_PENDING = False
+    if not _SCENE_CALLBACKS:
+        for message in (om.MSceneMessage.kBeforeNew, om.MSceneMessage.kBeforeOpen):
+            _SCENE_CALLBACKS.append(om.MSceneMessage.addCallback(message, _onSceneChanging))
+    if _CALLBACKS:
+        return
+    _CALLBACKS.extend([
+        om.MDGMessage.addNodeAddedCallback(invalidateRuleResults, 'dagNode'),
+        om.MDGMessage.addNodeRemovedCallback(invalidateRuleResults, 'dagNode'),
+        om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, _onNameChanged),
+        om.MDagMessage.addAllDagChangesCallback(invalidateRuleResults),
+    ])
+
+
+def _removeCallbacks():
+    if _CALLBACKS:
+        om.MMessage.removeCallbacks(_CALLBACKS)
+        del _CALLBACKS[:]
+
+
+def _removeUnusedCallbacks():
+    global _IS_REMOVE_PENDING
+    # skip if cleared by a scene change, or if rules were evaluated again since
+    if _IS_REMOVE_PENDING and not _RESULTS:
+        _removeCallbacks()
+    _IS_REMOVE_PENDING = False
+
+
+def _onNameChanged(node, prevName, clientData):
+    if node.hasFn(om.MFn.kDagNode):
+        invalidateRuleResults()
+
+
+def _onSceneChanging(clientData):
+    global _IS_REMOVE_PENDING
+    _RESULTS.clear()
+    _removeCallbacks()
+    _IS_REMOVE_PENDING = False
@@ -0,0 +1,126 @@
+"""
+A cache of the current selection masking state.
+
+All object and component selection mask flags are captured in one pass
+the first time they are needed, and kept until Maya reports that the
+selection type or mode has changed. Changes are applied with a single
+combined selectType call that only includes flags that actually change.
+"""
+
+from maya import cmds
+
+
+__all__ = [
+    "COMPONENT_MASK_KEYS",
+    "getSelectionMasks",
+    "getSelectMode",
+    "invalidateSelectionMasks",
+    "OBJECT_MASK_KEYS",
+    "SELECT_MODES",
+    "setSelectionMasks",
+]
+
+
+# all object selection mask flags
+OBJECT_MASK_KEYS = [
+    'handle', 'ikHandle', 'joint', 'nurbsCurve',
+    'cos', 'stroke', 'nurbsSurface', 'polymesh',
+    'subdiv', 'plane', 'lattice', 'cluster',
+    'sculpt', 'nonlinear', 'particleShape', 'emitter',
+    'field', 'spring', 'rigidBody', 'fluid',
+    'hairSystem', 'follicle', 'rigidConstraint', 'collisionModel',
+    'light', 'camera', 'texture', 'ikEndEffector',
+    'locator', 'dimension', 'nCloth', 'nRigid', 'dynamicConstraint',
+]
+
+# all component selection mask flags
+COMPONENT_MASK_KEYS = [
+    'cv', 'vertex', 'subdivMeshPoint', 'latticePoint',
+    'particle', 'editPoint', 'curveParameterPoint',
+    'surfaceParameterPoint', 'puv', 'polymeshEdge',
+    'subdivMeshEdge', 'isoparm', 'surfaceEdge', 'surfaceFace',
+    'springComponent', 'facet', 'subdivMeshFace', 'hull',
+    'rotatePivot', 'scalePivot', 'jointPivot', 'selectHandle',
+    'localRotationAxis', 'imagePlane', 'surfaceUV'
+]
+
+# all selectMode flags, in the order they are queried. root and leaf
+# are hierarchy modes, so they are checked before hierarchical
+SELECT_MODES = ['object', 'component', 'root', 'leaf', 'hierarchical', 'template', 'preset']
+
+# maya events that invalidate the cached state
+INVALIDATING_EVENTS = ['SelectTypeChanged', 'SelectModeChanged']
+
+# the cached selection mask state, or None if it needs to be queried
+_MASKS = None
+# the cached selection mode from `SELECT_MODES` or 'other', or None if it needs to be queried
+_MODE = None
+# ids of the script jobs that invalidate the cache
+_SCRIPT_JOBS = []
+
+
+def _installScriptJobs():
+    if _SCRIPT_JOBS and all(cmds.scriptJob(exists=j) for j in _SCRIPT_JOBS):
+        return
+    del _SCRIPT_JOBS[:]
+    for event in INVALIDATING_EVENTS:
+        _SCRIPT_JOBS.append(cmds.scriptJob(event=[event, invalidateSelectionMasks]))
+
+
+def invalidateSelectionMasks():
+    """
+    Clear the cached selection mask state so it is queried again when next needed.
+    """
+    global _MASKS, _MODE
+    _MASKS = None
+    _MODE = None
+
+
+def getSelectionMasks():
+    """
+    Return a dict of {flag: bool} for all object and component selection mask flags.
+    The result is cached until the selection type or mode changes.
+    """
+    global _MASKS
+    if _MASKS is None:
+        _installScriptJobs()
+        _MASKS = dict((k, cmds.selectType(q=True, **{k: True}))
+                      for k in OBJECT_MASK_KEYS + COMPONENT_MASK_KEYS)
+    return _MASKS.copy()
+
+
+def getSelectMode():
+    """
+    Return the current selection mode, one of `SELECT_MODES`,
+    or 'other' if the mode is not recognized.
+    """
+    global _MODE
+    if _MODE is None:
+        _installScriptJobs()
+        _MODE = next((m for m in SELECT_MODES if cmds.selectMode(q=True, **{m: True})), 'other')
+    return _MODE
+
+
+def setSelectionMasks(masks, mode=None):
+    """
+    Apply selection mask flags using a single selectType call.
+
+    Args:
+        masks: A dict of {flag: bool} for the selection mask flags to change
+        mode: An optional selection mode to switch to first, one of `SELECT_MODES`
+    """
+    global _MASKS, _MODE
+    if mode not in SELECT_MODES:
+        # unrecognized modes can't be switched to
+        mode = None
+    if mode is not None and mode != getSelectMode():
+        cmds.selectMode(**{mode: True})
+    current = getSelectionMasks()
+    changed = dict((k, v) for k, v in masks.items() if current.get(k) != v)
+    if changed:
+        cmds.selectType(**changed)
+        current.update(changed)
+    # the events for these changes have already been handled, so store the new state
+    _MASKS = current
+    if mode is not None:
+        _MODE = mode
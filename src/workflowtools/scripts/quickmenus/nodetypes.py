@@ -0,0 +1,150 @@
+"""
+Session-scoped tables for classifying node types as display
+flags and selection mask keys.
+
+The inheritance chain of a node type never changes during a session,
+so each type is resolved from `nodeType -isTypeName -inherited` the
+first time it is seen, and is a dict lookup from then on.
+"""
+
+from maya import cmds
+
+
+__all__ = [
+    "DISPLAY_TYPE_KEYS",
+    "getInheritedTypes",
+    "isTransformType",
+    "SELECTION_TYPE_KEYS",
+    "TypeKeyTable",
+]
+
+
+# {nodeType: [inherited types]}, filled as types are queried
+_INHERITED_TYPES = {}
+
+
+def getInheritedTypes(nodeType):
+    """
+    Return the inheritance chain of a node type, ending with the type itself
+    """
+    try:
+        return _INHERITED_TYPES[nodeType]
+    except KeyError:
+        pass
+    result = cmds.nodeType(nodeType, isTypeName=True, inherited=True) or [nodeType]
+    _INHERITED_TYPES[nodeType] = result
+    return result
+
+
+def isTransformType(nodeType):
+    """
+    Return True if the node type is or inherits from transform
+    """
+    return 'transform' in getInheritedTypes(nodeType)
+
+
+class TypeKeyTable(object):
+    """
+    A mapping of node types to keys, such as modelEditor display flags,
+    that resolves unlisted types by climbing their inheritance chain.
+    Results are cached, so each node type is only resolved once.
+    """
+
+    def __init__(self, typeKeys, nameKeys=None):
+        """
+        Args:
+            typeKeys: A dict of {nodeType: key}
+            nameKeys: An optional dict of {substring: key} that is checked against the lowercase
+                name of any type not in `typeKeys`, before climbing the inheritance chain
+        """
+        self.typeKeys = typeKeys
+        self.nameKeys = nameKeys or {}
+        self._cache = {}
+
+    def getKey(self, nodeType):
+        """
+        Return the key for a node type, or None if it has no key
+        """
+        try:
+            return self._cache[nodeType]
+        except KeyError:
+            pass
+        key = self._resolveKey(nodeType)
+        self._cache[nodeType] = key
+        return key
+
+    def getKeys(self, nodeTypes):
+        """
+        Return the set of keys for all the given node types
+        """
+        keys = set(self.getKey(t) for t in nodeTypes)
+        keys.discard(None)
+        return keys
+
+    def _resolveKey(self, nodeType):
+        if nodeType in self.typeKeys:
+            return self.typeKeys[nodeType]
+        lowerType = nodeType.lower()
+        for name, key in self.nameKeys.items():
+            if name in lowerType:
+                return key
+        for t in reversed(getInheritedTypes(nodeType)):
+            if t in self.typeKeys:
+                return self.typeKeys[t]
+
+
+# conversion of node type -> modelEditor display flag
+DISPLAY_TYPE_KEYS = TypeKeyTable({
+    'nurbsCurve': 'nurbsCurves',
+    'nurbsSurface': 'nurbsSurfaces',
+    'mesh': 'polymeshes',
+    'subdiv': 'subdivSurfaces',
+    'plane': 'planes',
+    'light': 'lights',
+    'camera': 'cameras',
+    'controlVertices': 'controlVertices',
+    'grid': 'grid',
+    'hulls': 'hulls',
+    'joint': 'joints',
+    'ikHandle': 'ikHandles',
+    'lattice': 'deformers',
+    'clusterHandle': 'deformers',
+    'softModHandle': 'deformers',
+    'deformFunc': 'deformers',
+    'implicitSphere': 'deformers',
+    'particle': 'dynamics',
+    'pointEmitter': 'dynamics',
+    'rigidBody': 'dynamics',
+    'field': 'dynamics',
+    'rigidConstraint': 'dynamics',
+    'fluidShape': 'fluids',
+    'hairSystem': 'hairSystems',
+    'follicle': 'follicles',
+    'nCloth': 'nCloths',
+    'nParticle': 'nParticles',
+    'nRigid': 'nRigids',
+    'dynamicConstraint': 'dynamicConstraints',
+    'locator': 'locators',
+    'manipulators': 'manipulators',
+    'dimensionShape': 'dimensions',
+    'handle': 'handles',
+    'pivot': 'pivots',
+    'place3dTexture': 'textures',
+    'place2dTexture': 'textures',
+    'pfxGeometry': 'strokes',
+})
+
+# conversion of shape node type -> selectType object mask flag
+SELECTION_TYPE_KEYS = TypeKeyTable({
+    'nurbsSurface': 'nurbsSurface',
+    'subdiv': 'subdiv',
+    'joint': 'joint',
+    'camera': 'camera',
+    'locator': 'locator',
+    'mesh': 'polymesh',
+    'nurbsCurve': 'nurbsCurve',
+    'light': 'light',
+}, nameKeys={
+    # plugin lights don't always inherit from light
+    'light': 'light',
+})
@@ -0,0 +1,120 @@
+"""
+Named presets of the selection masking and viewport display state.
+
+Presets are stored in user prefs and capture all selection mask flags,
+the selection mode, and the display flags of a model panel, so that a
+whole masking setup can be restored with one selectType call and one
+modelEditor call.
+"""
+
+import json
+import logging
+
+from maya import cmds
+
+from . import display
+from . import masking
+
+
+__all__ = [
+    "applyMaskPreset",
+    "deleteMaskPreset",
+    "DISPLAY_KEYS",
+    "getMaskPreset",
+    "getMaskPresets",
+    "saveMaskPreset",
+]
+
+
+LOG = logging.getLogger("quickmenus")
+
+# the optionVar used to store all presets
+PRESETS_OPTIONVAR = "quickMenus_maskPresets"
+
+# all model editor display flags stored in presets
+DISPLAY_KEYS = [
+    'nurbsCurves', 'nurbsSurfaces', 'polymeshes', 'subdivSurfaces',
+    'planes', 'lights', 'cameras', 'controlVertices', 'grid', 'hulls',
+    'joints', 'ikHandles', 'deformers', 'dynamics', 'fluids',
+    'hairSystems', 'follicles', 'nCloths', 'nParticles', 'nRigids',
+    'dynamicConstraints', 'locators', 'manipulators', 'dimensions',
+    'handles', 'pivots', 'textures', 'strokes',
+]
+
+
+def getMaskPresets():
+    """
+    Return a dict of all saved presets, indexed by name
+    """
+    if not cmds.optionVar(exists=PRESETS_OPTIONVAR):
+        return {}
+    try:
+        presets = json.loads(cmds.optionVar(q=PRESETS_OPTIONVAR))
+    except ValueError:
+        LOG.warning('Invalid mask presets found in optionVar: {0}'.format(PRESETS_OPTIONVAR))
+        return {}
+    return presets if isinstance(presets, dict) else {}
+
+
+def _setMaskPresets(presets):
+    cmds.optionVar(sv=(PRESETS_OPTIONVAR, json.dumps(presets, sort_keys=True)))
+
+
+def getMaskPreset(name):
+    """
+    Return a preset by name, or None if it doesn't exist
+    """
+    return getMaskPresets().get(name)
+
+
+def saveMaskPreset(name, panel):
+    """
+    Save the current selection masking, and the display flags
+    of the given model panel as a preset.
+
+    Args:
+        name: A string name of the preset, replaces any existing preset with the same name
+        panel: A string name of the model panel to capture display flags from
+    """
+    preset = {
+        'selectMode': masking.getSelectMode(),
+        'selectTypes': masking.getSelectionMasks(),
+        'display': dict((k, cmds.modelEditor(panel, q=True, **{k: True})) for k in DISPLAY_KEYS),
+    }
+    presets = getMaskPresets()
+    presets[name] = preset
+    _setMaskPresets(presets)
+    return preset
+
+
+def deleteMaskPreset(name):
+    """
+    Delete a preset by name
+    """
+    presets = getMaskPresets()
+    if name in presets:
+        del presets[name]
+        _setMaskPresets(presets)
+
+
+def applyMaskPreset(name, panels):
+    """
+    Apply a preset's selection masking, and its display
+    flags to the given model panels.
+
+    Args:
+        name: A string name of the preset
+        panels: A string model panel name, or list of model panel names
+
+    Returns:
+        True if the preset exists and was applied
+    """
+    preset = getMaskPreset(name)
+    if not preset:
+        LOG.warning('Mask preset not found: {0}'.format(name))
+        return False
+    masking.setSelectionMasks(preset.get('selectTypes', {}), mode=preset.get('selectMode'))
+    if isinstance(panels, str):
+        panels = [panels]
+    display.setDisplayFlags(preset.get('display'), panels)
+    return True
@@ -1,18 +1,25 @@
 
 import logging
 
-import pymel.core as pm
+from maya import cmds, mel
 
 try:
     import resetter
 except:
     resetter = None
 
+from .. import backend
+from .. import cameras
 from .. import core
+from .. import display
+from .. import masking
+from .. import nodetypes
+from .. import presets
 from .. import utils
 
 
 __all__ = [
+    'CameraFinder',
     'CameraQuickSwitchMenu',
     'ComponentSelectionMaskingMenu',
     'DisplayMaskingMenu',
@@ -24,102 +31,131 @@ __all__ = [
 LOG = logging.getLogger('quickmenus')
 
 
-class SelectionMaskingMenu(core.MarkingMenu):
+def lookThroughModelPanel(camera, panel):
+    mel.eval('lookThroughModelPanel "{0}" "{1}"'.format(camera, panel))
+
+
+class MaskPresetsMenuMixin(object):
+    """
+    Adds items for applying and saving selection and display
+    masking presets to a MarkingMenu.
+    """
+
+    def buildMaskPresetItems(self):
+        cmds.menuItem(l='Presets', en=False)
+        cmds.menuItem(d=True)
+        for name in sorted(presets.getMaskPresets()):
+            cmds.menuItem(l=name, ecr=False, c=utils.Callback(self.applyMaskPreset, name),
+                        ann='Apply the selection and display masking from this preset')
+            cmds.menuItem(ob=True, c=utils.Callback(self.editMaskPreset, name))
+        cmds.menuItem(l='Save Preset...', ecr=False, c=utils.Callback(self.saveMaskPresetPrompt),
+                    ann='Save the current selection and display masking as a preset')
+
+    def applyMaskPreset(self, name):
+        presets.applyMaskPreset(name, display.getTargetPanels(self.panel))
+
+    def saveMaskPresetPrompt(self):
+        name = utils.promptBox('Save Masking Preset', 'Enter a name:', 'Save', 'Cancel')
+        if name:
+            presets.saveMaskPreset(name, self.panel)
+            # rebuild items to include the new preset
+            self.hasBuiltItems = False
+
+    def editMaskPreset(self, name):
+        kw = dict(
+            t='Edit Masking Preset:',
+            m=name,
+            db='Cancel',
+            cb='Cancel',
+            ds='dismiss',
+            b=['Overwrite', 'Delete', 'Cancel'],
+        )
+        action = cmds.confirmDialog(**kw)
+        if action == 'Overwrite':
+            presets.saveMaskPreset(name, self.panel)
+        elif action == 'Delete':
+            presets.deleteMaskPreset(name)
+            self.hasBuiltItems = False
+
+
+class SelectionMaskingMenu(MaskPresetsMenuMixin, core.MarkingMenu):
     """
     A radial menu for quickly changing selection masking settings.
     Only displays on model viewport panels.
     """
 
-    allkeys = [
-        'handle', 'ikHandle', 'joint', 'nurbsCurve',
-        'cos', 'stroke', 'nurbsSurface', 'polymesh',
-        'subdiv', 'plane', 'lattice', 'cluster',
-        'sculpt', 'nonlinear', 'particleShape', 'emitter',
-        'field', 'spring', 'rigidBody', 'fluid',
-        'hairSystem', 'follicle', 'rigidConstraint', 'collisionModel',
-        'light', 'camera', 'texture', 'ikEndEffector',
-        'locator', 'dimension', 'nCloth', 'nRigid', 'dynamicConstraint',
-    ]
+    allkeys = masking.OBJECT_MASK_KEYS
 
     def __init__(self):
         super().__init__()
         self.popupMenuId = 'QuickMenus_SelectionMaskingMenu'
         self.mouseButton = 1
-        self.buildItemsOnShow = True
+        self.refreshItemsOnShow = True
 
     def shouldBuild(self):
         return self.panelType == 'modelPanel'
 
     def buildMenuItems(self):
-        pm.menuItem(rp='NW', l='Reset', ecr=False, ann='Reset all selection masks',
-                    c=pm.Callback(self.resetSelectionMasking))
-        pm.menuItem(rp='NE', l='All Off', ecr=False, c=pm.Callback(
+        cmds.menuItem(rp='NW', l='Reset', ecr=False, ann='Reset all selection masks',
+                    c=utils.Callback(self.resetSelectionMasking))
+        cmds.menuItem(rp='NE', l='All Off', ecr=False, c=utils.Callback(
             self.setObjectSelectType, enabled=False, keys=self.allkeys))
-        pm.menuItem(rp='SE', l='Clear Selection', ecr=True,
-                    c=pm.Callback(pm.select, cl=True))
-        pm.menuItem(rp='S', l='Use Selected',
-                    c=pm.Callback(self.setMaskingToSelection))
-
-        def selType(x): return pm.selectType(q=True, **{x: True})
+        cmds.menuItem(rp='SE', l='Clear Selection', ecr=True,
+                    c=utils.Callback(cmds.select, cl=True))
+        cmds.menuItem(rp='S', l='Use Selected',
+                    c=utils.Callback(self.setMaskingToSelection))
 
         # common masking
-        pm.menuItem(rp='N', l='Polys', ecr=False, cb=selType(
-            'p'), c=pm.CallbackWithArgs(self.setObjectSelectType, keys=['polymesh']))
-        pm.menuItem(rp='E', l='Curves', ecr=False, cb=selType('nurbsCurve'), c=pm.CallbackWithArgs(
+        self.buildStateItem('polymesh', rp='N', l='Polys', ecr=False,
+                            c=utils.CallbackWithArgs(self.setObjectSelectType, keys=['polymesh']))
+        self.buildStateItem('nurbsCurve', rp='E', l='Curves', ecr=False, c=utils.CallbackWithArgs(
             self.setObjectSelectType, keys=['nurbsCurve', 'cos', 'stroke']))
-        pm.menuItem(rp='SW', l='Joints', ecr=False, cb=selType(
-            'joint'), c=pm.CallbackWithArgs(self.setObjectSelectType, keys=['joint']))
-        pm.menuItem(rp='W', l='Surfaces', ecr=False, cb=selType('nurbsSurface'), c=pm.CallbackWithArgs(
+        self.buildStateItem('joint', rp='SW', l='Joints', ecr=False,
+                            c=utils.CallbackWithArgs(self.setObjectSelectType, keys=['joint']))
+        self.buildStateItem('nurbsSurface', rp='W', l='Surfaces', ecr=False, c=utils.CallbackWithArgs(
             self.setObjectSelectType, keys=['nurbsSurface', 'subdiv', 'plane']))
 
         # extended menu
-        pm.menuItem(l='Selection Masking', en=False)
-        pm.menuItem(d=True)
-        pm.menuItem(l='Render', ecr=False, cb=selType('light'), c=pm.CallbackWithArgs(
+        cmds.menuItem(l='Selection Masking', en=False)
+        cmds.menuItem(d=True)
+        self.buildStateItem('light', l='Render', ecr=False, c=utils.CallbackWithArgs(
             self.setObjectSelectType, keys=['light', 'camera', 'texture']))
-        pm.menuItem(l='Deformers', ecr=False, cb=selType('lattice'), c=pm.CallbackWithArgs(
+        self.buildStateItem('lattice', l='Deformers', ecr=False, c=utils.CallbackWithArgs(
             self.setObjectSelectType, keys=['lattice', 'cluster', 'sculpt', 'nonlinear']))
-        pm.menuItem(l='Dynamics', ecr=False, cb=selType('particleShape'), c=pm.CallbackWithArgs(self.setObjectSelectType, keys=[
-                    'particleShape', 'emitter', 'field', 'spring', 'rigidBody', 'fluid', 'hairSystem', 'follicle', 'rigidConstraint']))
-        pm.menuItem(l='Misc', ecr=False, cb=selType('ikEndEffector'), c=pm.CallbackWithArgs(
+        self.buildStateItem('particleShape', l='Dynamics', ecr=False, c=utils.CallbackWithArgs(self.setObjectSelectType, keys=[
+                            'particleShape', 'emitter', 'field', 'spring', 'rigidBody', 'fluid', 'hairSystem', 'follicle', 'rigidConstraint']))
+        self.buildStateItem('ikEndEffector', l='Misc', ecr=False, c=utils.CallbackWithArgs(
             self.setObjectSelectType, keys=['ikEndEffector', 'locator', 'dimension']))
 
+        self.buildMaskPresetItems()
+
+    def getMenuItemStates(self):
+        keys = ['polymesh', 'nurbsCurve', 'joint', 'nurbsSurface',
+                'light', 'lattice', 'particleShape', 'ikEndEffector']
+        masks = masking.getSelectionMasks()
+        return dict((k, masks[k]) for k in keys)
+
     def setObjectSelectType(self, enabled, keys):
-        pm.selectMode(object=True)
-        kwargs = {}
-        for k in keys:
-            kwargs[k] = enabled
-        pm.selectType(**kwargs)
+        masking.setSelectionMasks(dict((k, enabled) for k in keys), mode='object')
 
     def resetSelectionMasking(self):
-        pm.selectMode(component=True)
-        pm.selectMode(object=True)
-        pm.mel.selectionMaskResetAll()
+        cmds.selectMode(component=True)
+        cmds.selectMode(object=True)
+        mel.eval('selectionMaskResetAll')
 
     def setMaskingToSelection(self):
-        self.setObjectSelectType(enabled=False, keys=self.allkeys)
-        sel = pm.selected()
-        keys = set()
-        for obj in sel:
-            if obj.nodeType() == 'transform':
-                shapes = obj.getShapes()
-                if len(shapes):
-                    selType = shapes[0].nodeType()
-                    if selType in ['nurbsSurface', 'subdiv', 'joint', 'camera', 'locator']:
-                        keys.add(str(selType))
-                    elif selType == 'mesh':
-                        keys.add('polymesh')
-                    elif 'light' in selType.lower():
-                        keys.add('light')
-                    elif selType == 'nurbsCurve':
-                        keys.add('curve')
-        if not len(keys):
-            return
-        LOG.info('Set selection masking to {0}'.format(', '.join(keys)))
-        self.setObjectSelectType(enabled=True, keys=keys)
-
-
-class DisplayMaskingMenu(core.MarkingMenu):
+        transforms = backend.getSelectedNodesByType(type='transform')
+        shapes = backend.getShapes([n for nodes in transforms.values() for n in nodes])
+        keys = nodetypes.SELECTION_TYPE_KEYS.getKeys(backend.groupNodesByType(shapes))
+        # disable all other masks in the same selectType call
+        masks = dict((k, False) for k in self.allkeys)
+        masks.update((k, True) for k in keys)
+        if len(keys):
+            LOG.info('Set selection masking to {0}'.format(', '.join(keys)))
+        masking.setSelectionMasks(masks, mode='object')
+
+
+class DisplayMaskingMenu(MaskPresetsMenuMixin, core.MarkingMenu):
     """
     A radial menu for quickly changing display masking settings.
     Only displays on model viewport panels.
@@ -129,227 +165,268 @@ class DisplayMaskingMenu(core.MarkingMenu):
         super().__init__()
         self.popupMenuId = 'QuickMenus_DisplayMaskingMenu'
         self.mouseButton = 2
-        self.buildItemsOnShow = True
+        self.refreshItemsOnShow = True
 
     def shouldBuild(self):
         return self.panelType == 'modelPanel'
 
     def buildMenuItems(self):
-        pm.menuItem(rp='NW', l='Show All', ecr=False, c=pm.Callback(
+        cmds.menuItem(rp='NW', l='Show All', ecr=False, c=utils.Callback(
             self.setDisplay, enabled=True, keys=['allObjects']))
-        pm.menuItem(rp='NE', l='Hide All', ecr=False, c=pm.Callback(
+        cmds.menuItem(rp='NE', l='Hide All', ecr=False, c=utils.Callback(
             self.setDisplay, enabled=False, keys=['allObjects']))
-        pm.menuItem(rp='S', l='Hide Selected', ecr=True,
-                    c=pm.Callback(self.hideSelected))
-
-        def query(x): return pm.modelEditor(self.panel, q=True, **{x: True})
+        cmds.menuItem(rp='S', l='Hide Selected', ecr=True,
+                    c=utils.Callback(self.hideSelected))
 
         # common masking
-        pm.menuItem(rp='N', l='Polys', ecr=False, cb=query(
-            'polymeshes'), c=pm.CallbackWithArgs(self.setDisplay, keys=['polymeshes']))
-        pm.menuItem(rp='E', l='Curves', ecr=False, cb=query(
-            'nurbsCurves'), c=pm.CallbackWithArgs(self.setDisplay, keys=['nurbsCurves']))
-        pm.menuItem(rp='W', l='Surfaces', ecr=False, cb=query('nurbsSurfaces'), c=pm.CallbackWithArgs(
+        self.buildStateItem('polymeshes', rp='N', l='Polys', ecr=False,
+                            c=utils.CallbackWithArgs(self.setDisplay, keys=['polymeshes']))
+        self.buildStateItem('nurbsCurves', rp='E', l='Curves', ecr=False,
+                            c=utils.CallbackWithArgs(self.setDisplay, keys=['nurbsCurves']))
+        self.buildStateItem('nurbsSurfaces', rp='W', l='Surfaces', ecr=False, c=utils.CallbackWithArgs(
             self.setDisplay, keys=['nurbsSurfaces', 'subdivSurfaces']))
-        pm.menuItem(rp='SW', l='Joints', ecr=False, cb=query(
-            'joints'), c=pm.CallbackWithArgs(self.setDisplay, keys=['joints']))
-        pm.menuItem(rp='SE', l='Lights', ecr=False, cb=query(
-            'lights'), c=pm.CallbackWithArgs(self.setDisplay, keys=['lights']))
+        self.buildStateItem('joints', rp='SW', l='Joints', ecr=False,
+                            c=utils.CallbackWithArgs(self.setDisplay, keys=['joints']))
+        self.buildStateItem('lights', rp='SE', l='Lights', ecr=False,
+                            c=utils.CallbackWithArgs(self.setDisplay, keys=['lights']))
 
         # extended menu
-        pm.menuItem(l='Display Masking', en=False)
-        pm.menuItem(d=True)
-        pm.menuItem(l='Cameras', ecr=False, cb=query('cameras'),
-                    c=pm.CallbackWithArgs(self.setDisplay, keys=['cameras']))
-        pm.menuItem(l='Locators', ecr=False, cb=query('locators'),
-                    c=pm.CallbackWithArgs(self.setDisplay, keys=['locators']))
-        pm.menuItem(l='Deformers', ecr=False, cb=query('deformers'),
-                    c=pm.CallbackWithArgs(self.setDisplay, keys=['deformers']))
-        pm.menuItem(l='Dynamics', ecr=False, cb=query('dynamics'),
-                    c=pm.CallbackWithArgs(self.setDisplay, keys=['dynamics']))
-        pm.menuItem(l='Misc', ecr=False, cb=query('planes'), c=pm.CallbackWithArgs(self.setDisplay, keys=[
-                    'planes', 'ikHandles', 'fluids', 'hairSystems', 'follicles', 'dynamicConstraints', 'pivots', 'handles', 'textures', 'strokes']))
-        # pm.menuItem(l='GUI', ecr=False, cb=query('planes'), c=pm.CallbackWithArgs(self.setObjectSelectType, keys=['ikEndEffector', 'locator', 'dimension']))
+        cmds.menuItem(l='Display Masking', en=False)
+        cmds.menuItem(d=True)
+        self.buildStateItem('cameras', l='Cameras', ecr=False,
+                            c=utils.CallbackWithArgs(self.setDisplay, keys=['cameras']))
+        self.buildStateItem('locators', l='Locators', ecr=False,
+                            c=utils.CallbackWithArgs(self.setDisplay, keys=['locators']))
+        self.buildStateItem('deformers', l='Deformers', ecr=False,
+                            c=utils.CallbackWithArgs(self.setDisplay, keys=['deformers']))
+        self.buildStateItem('dynamics', l='Dynamics', ecr=False,
+                            c=utils.CallbackWithArgs(self.setDisplay, keys=['dynamics']))
+        self.buildStateItem('planes', l='Misc', ecr=False, c=utils.CallbackWithArgs(self.setDisplay, keys=[
+                            'planes', 'ikHandles', 'fluids', 'hairSystems', 'follicles', 'dynamicConstraints', 'pivots', 'handles', 'textures', 'strokes']))
+        # cmds.menuItem(l='GUI', ecr=False, cb=query('planes'), c=utils.CallbackWithArgs(self.setObjectSelectType, keys=['ikEndEffector', 'locator', 'dimension']))
+
+        # which panels to apply display changes to
+        cmds.menuItem(l='Apply To', en=False)
+        cmds.menuItem(d=True)
+        cmds.radioMenuItemCollection()
+        panelModeLabels = {
+            'panel': 'This Panel',
+            'group': 'Panel Group',
+            'visible': 'Visible Panels',
+            'all': 'All Panels',
+        }
+        for mode in display.PANEL_MODES:
+            self.buildStateItem('panelMode:' + mode, flag='rb', l=panelModeLabels[mode], ecr=False,
+                                c=utils.Callback(display.setDisplayPanelMode, mode))
+
+        self.buildMaskPresetItems()
+
+    def getMenuItemStates(self):
+        keys = ['polymeshes', 'nurbsCurves', 'nurbsSurfaces', 'joints', 'lights',
+                'cameras', 'locators', 'deformers', 'dynamics', 'planes']
+        states = dict((k, cmds.modelEditor(self.panel, q=True, **{k: True})) for k in keys)
+        panelMode = display.getDisplayPanelMode()
+        for mode in display.PANEL_MODES:
+            states['panelMode:' + mode] = mode == panelMode
+        return states
 
     def setDisplay(self, enabled, keys):
         kwargs = {}
         for k in keys:
             kwargs[k] = enabled
-        pm.modelEditor(self.panel, e=True, **kwargs)
+        display.setDisplayFlags(kwargs, display.getTargetPanels(self.panel))
 
     def hideSelected(self):
-        sel = pm.selected()
         keys = set()
-        for obj in sel:
-            objkeys = self.getDisplayKeys(obj)
-            for k in objkeys:
-                keys.add(k)
+        transforms = []
+        for nodeType, nodes in backend.getSelectedNodesByType().items():
+            key = nodetypes.DISPLAY_TYPE_KEYS.getKey(nodeType)
+            if key:
+                keys.add(key)
+            elif nodetypes.isTransformType(nodeType):
+                transforms.extend(nodes)
+        # analyze the shapes of any transforms that didn't have a key themselves
+        shapeTypes = backend.groupNodesByType(backend.getShapes(transforms))
+        keys.update(nodetypes.DISPLAY_TYPE_KEYS.getKeys(shapeTypes))
         if not len(keys):
             return
         LOG.info('Hiding {0}'.format(', '.join(keys)))
         self.setDisplay(False, keys)
 
-    def getDisplayKeys(self, obj):
-        # conversion of node type -> display flag
-        nodeTypeDict = {
-            'nurbsCurve': 'nurbsCurves',
-            'nurbsSurface': 'nurbsSurfaces',
-            'mesh': 'polymeshes',
-            'subdiv': 'subdivSurfaces',
-            'plane': 'planes',
-            'light': 'lights',
-            'camera': 'cameras',
-            'controlVertices': 'controlVertices',
-            'grid': 'grid',
-            'hulls': 'hulls',
-            'joint': 'joints',
-            'ikHandle': 'ikHandles',
-            'lattice': 'deformers',
-            'clusterHandle': 'deformers',
-            'softModHandle': 'deformers',
-            'deformFunc': 'deformers',
-            'implicitSphere': 'deformers',
-            'particle': 'dynamics',
-            'pointEmitter': 'dynamics',
-            'rigidBody': 'dynamics',
-            'field': 'dynamics',
-            'rigidConstraint': 'dynamics',
-            'fluidShape': 'fluids',
-            'hairSystem': 'hairSystems',
-            'follicle': 'follicles',
-            'nCloth': 'nCloths',
-            'nParticle': 'nParticles',
-            'nRigid': 'nRigids',
-            'dynamicConstraint': 'dynamicConstraints',
-            'locator': 'locators',
-            'manipulators': 'manipulators',
-            'dimensionShape': 'dimensions',
-            'handle': 'handles',
-            'pivot': 'pivots',
-            'place3dTexture': 'textures',
-            'place2dTexture': 'textures',
-            'pfxGeometry': 'strokes',
-        }
-        types = self.getShapeTypes(obj, nodeTypeDict.keys())
-        keys = [nodeTypeDict[t] for t in types if t in nodeTypeDict]
-        return keys
-
-    def getShapeTypes(self, obj, options):
-        """
-        Return all shape types represented by the given object
-        that are in the given list of options
-        Climbs the inheritance tree to find values if needed
-        """
-        objtype = obj.nodeType()
-        if objtype in options:
-            return [objtype]
-        # get shapes
-        if objtype == 'transform':
-            shapes = obj.getShapes()
-        else:
-            shapes = [objtype]
-        # analyze shape types
-        types = []
-        for s in shapes:
-            inheritypes = s.nodeType(i=True)
-            for t in reversed(inheritypes):
-                if t in options:
-                    types.append(t)
-                    break
-        return types
-
 
 class CameraQuickSwitchMenu(core.RMBMarkingMenu):
     """
     A radial menu that displays all cameras in the scene for easy switching.
+
+    When there are more than `maxFlatCameras` cameras, only the cameras in the same
+    group as the current camera are listed in radial positions, and all other
+    cameras are listed in submenus by group, which are built only when opened.
+    Groups with more than `maxFlatCameras` cameras of their own are split into pages.
     """
 
+    # the max number of cameras to list without grouping
+    maxFlatCameras = 24
+
     def buildMenuItems(self):
         # find camera
-        try:
-            camUnderPointer = pm.PyNode(
-                pm.modelPanel(self.panel, q=True, cam=True))
-            if isinstance(camUnderPointer, pm.nt.Camera):
-                camera = camUnderPointer
-            else:
-                camera = camUnderPointer.getShape()
-        except:
+        index = cameras.getCameraIndex()
+        camera = index.findCamera(cmds.modelPanel(self.panel, q=True, cam=True))
+        if not camera:
             LOG.warning(
                 'could not find camera for panel: {0}'.format(self.panel))
             return
 
-        menuItemCol = pm.radioMenuItemCollection()
-        isOrtho = camera.isOrtho()
+        isFlat = len(index.getCameras()) <= self.maxFlatCameras
+        menuItemCol = cmds.radioMenuItemCollection()
         # list same type camera in radial positions
-        similar = sorted([c for c in pm.ls(typ='camera')
-                         if c.isOrtho() == isOrtho])
+        similar = index.getCameras(camera.isOrtho)
+        if not isFlat:
+            # list only the cameras near the current camera
+            index.getCameraTree()
+            similar = [c for c in camera.group.cameras if c.isOrtho == camera.isOrtho][:8]
         rps = utils.getRadialMenuPositions(len(similar))
         for cam, rp in zip(similar, rps):
             kw = {}
             if rp is not None:
                 kw['rp'] = rp
-            if cam == camera:
+            if cam is camera:
                 kw['rb'] = True
                 kw['cl'] = menuItemCol
-            pm.menuItem(l=cam.getParent(), c=pm.Callback(
-                pm.mel.lookThroughModelPanel, str(cam), str(self.panel)), **kw)
-        if len(rps) > 8:
-            pm.menuItem(d=True)
-        # list other cameras
-        dissimilar = sorted(
-            [c for c in pm.ls(typ='camera') if c.isOrtho() != isOrtho])
-        for cam in dissimilar:
-            pm.menuItem(l=cam.getParent(), c=pm.Callback(
-                pm.mel.lookThroughModelPanel, str(cam), str(self.panel)))
+            self.buildCameraItem(cam, **kw)
+
+        if isFlat:
+            if len(rps) > 8:
+                cmds.menuItem(d=True)
+            # list other cameras
+            dissimilar = index.getCameras(not camera.isOrtho)
+            for cam in dissimilar:
+                self.buildCameraItem(cam)
+        else:
+            cmds.menuItem(l='Find Camera...', c=utils.Callback(CameraFinder(self.panel).show))
+            cmds.menuItem(d=True)
+            self.buildCameraGroupItems(index.getCameraTree())
+
+    def buildCameraItem(self, camera, **kwargs):
+        return cmds.menuItem(l=camera.label, c=utils.Callback(
+            lookThroughModelPanel, camera.name, self.panel), **kwargs)
+
+    def buildCameraGroupItems(self, group):
+        """
+        Build a submenu for each sub group of a camera group, and an item for each of its cameras,
+        listing only the first `maxFlatCameras` cameras, and the rest in submenus of the same size.
+        """
+        for subGroup in group.getGroups():
+            item = cmds.menuItem(l='{0} ({1})'.format(subGroup.name, subGroup.count), subMenu=True, pmo=True)
+            cmds.menuItem(item, e=True, pmc=utils.Callback(self.buildCameraSubMenu, str(item), subGroup.path))
+            cmds.setParent('..', menu=True)
+        self.buildCameraPageItems(group, 0)
+
+    def buildCameraPageItems(self, group, start):
+        """
+        Build an item for each camera in one page of a camera group,
+        and a submenu for the next page if there are more cameras.
+        """
+        end = start + self.maxFlatCameras
+        for cam in group.cameras[start:end]:
+            self.buildCameraItem(cam)
+        if end < len(group.cameras):
+            item = cmds.menuItem(l='More ({0})'.format(len(group.cameras) - end), subMenu=True, pmo=True)
+            cmds.menuItem(item, e=True, pmc=utils.Callback(self.buildCameraPageSubMenu, str(item), group.path, end))
+            cmds.setParent('..', menu=True)
+
+    def buildCameraSubMenu(self, menu, path):
+        group = cameras.getCameraIndex().getCameraGroup(path)
+        if group:
+            cmds.setParent(menu, menu=True)
+            self.buildCameraGroupItems(group)
+
+    def buildCameraPageSubMenu(self, menu, path, start):
+        group = cameras.getCameraIndex().getCameraGroup(path)
+        if group:
+            cmds.setParent(menu, menu=True)
+            self.buildCameraPageItems(group, start)
+
+
+class CameraFinder(object):
+    """
+    A window for finding and looking through a camera by typing part of its name.
+    """
+
+    windowName = 'QuickMenus_CameraFinder'
+
+    # the max number of matching cameras to list
+    maxResults = 100
+
+    def __init__(self, panel):
+        self.panel = panel
+        self.results = []
+        self.filterField = None
+        self.resultsList = None
+
+    def show(self):
+        if cmds.window(self.windowName, exists=True):
+            cmds.deleteUI(self.windowName)
+        win = cmds.window(self.windowName, t='Find Camera', wh=(300, 400))
+        cmds.columnLayout(adj=True)
+        self.filterField = cmds.textField(aie=True, tcc=self.setFilter, ec=self.lookThroughSelected)
+        self.resultsList = cmds.textScrollList(h=360, dcc=self.lookThroughSelected)
+        self.setFilter('')
+        cmds.showWindow(win)
+        cmds.setFocus(self.filterField)
+
+    def setFilter(self, text):
+        self.results = cameras.getCameraIndex().findCameras(text, self.maxResults)
+        cmds.textScrollList(self.resultsList, e=True, ra=True)
+        if self.results:
+            cmds.textScrollList(self.resultsList, e=True, a=[c.label for c in self.results], sii=1)
+
+    def lookThroughSelected(self, *args):
+        indices = cmds.textScrollList(self.resultsList, q=True, sii=True)
+        if not indices:
+            return
+        camera = self.results[indices[0] - 1]
+        lookThroughModelPanel(camera.name, self.panel)
+        cmds.deleteUI(self.windowName)
 
 
 class ComponentSelectionMaskingMenu(core.MarkingMenu):
-    allkeys = [
-        'cv', 'vertex', 'subdivMeshPoint', 'latticePoint',
-        'particle', 'editPoint', 'curveParameterPoint',
-        'surfaceParameterPoint', 'puv', 'polymeshEdge',
-        'subdivMeshEdge', 'isoparm', 'surfaceEdge', 'surfaceFace',
-        'springComponent', 'facet', 'subdivMeshFace', 'hull',
-        'rotatePivot', 'scalePivot', 'jointPivot', 'selectHandle',
-        'localRotationAxis', 'imagePlane', 'surfaceUV'
-    ]
+    allkeys = masking.COMPONENT_MASK_KEYS
 
     def __init__(self):
         super().__init__()
         self.popupMenuId = 'QuickMenus_ComponentSelectionMaskingMenu'
         self.mouseButton = 1
-        self.buildItemsOnShow = True
+        self.refreshItemsOnShow = True
 
     def shouldBuild(self):
         return self.panelType == 'modelPanel'
 
     def buildMenuItems(self):
-        pm.menuItem(rp='N', l='Points', ecr=False, c=pm.Callback(self.setComponentSelectType, keys=[
+        cmds.menuItem(rp='N', l='Points', ecr=False, c=utils.Callback(self.setComponentSelectType, keys=[
                     'cv', 'vertex', 'subdivMeshPoint', 'latticePoint', 'particle']))
-        pm.menuItem(rp='NE', l='Handles', ecr=False, c=pm.Callback(
+        cmds.menuItem(rp='NE', l='Handles', ecr=False, c=utils.Callback(
             self.setComponentSelectType, keys=['selectHandle']))
-        pm.menuItem(rp='E', l='Lines', ecr=False, c=pm.Callback(self.setComponentSelectType, keys=[
+        cmds.menuItem(rp='E', l='Lines', ecr=False, c=utils.Callback(self.setComponentSelectType, keys=[
                     'polymeshEdge', 'subdivMeshEdge', 'isoparm', 'surfaceEdge', 'springComponent']))
-        pm.menuItem(rp='SE', l='Hulls', ecr=False, c=pm.Callback(
+        cmds.menuItem(rp='SE', l='Hulls', ecr=False, c=utils.Callback(
             self.setComponentSelectType, keys=['hull']))
-        pm.menuItem(rp='S', l='Faces', ecr=False, c=pm.Callback(
+        cmds.menuItem(rp='S', l='Faces', ecr=False, c=utils.Callback(
             self.setComponentSelectType, keys=['surfaceFace', 'facet', 'subdivMeshFace']))
-        pm.menuItem(rp='SW', l='Pivots', ecr=False, c=pm.Callback(
+        cmds.menuItem(rp='SW', l='Pivots', ecr=False, c=utils.Callback(
             self.setComponentSelectType, keys=['rotatePivot', 'scalePivot', 'jointPivot']))
-        pm.menuItem(rp='W', l='Param', ecr=False, c=pm.Callback(self.setComponentSelectType, keys=[
+        cmds.menuItem(rp='W', l='Param', ecr=False, c=utils.Callback(self.setComponentSelectType, keys=[
                     'editPoint', 'curveParameterPoint', 'surfaceParameterPoint', 'surfaceUV', 'puv']))
-        pm.menuItem(rp='NW', l='Misc', ecr=False, c=pm.Callback(
+        cmds.menuItem(rp='NW', l='Misc', ecr=False, c=utils.Callback(
             self.setComponentSelectType, keys=['localRotationAxis', 'imagePlane']))
 
     def setComponentSelectType(self, enabled=True, keys={}):
-        pm.selectMode(component=True)
         kwargs = {}
         for k in keys:
             kwargs[k] = enabled
         for k in self.allkeys:
             if k not in kwargs:
                 kwargs[k] = not enabled
-        pm.selectType(**kwargs)
+        masking.setSelectionMasks(kwargs, mode='component')
 
 
 class ResetterMenu(core.MarkingMenu):
@@ -367,42 +444,48 @@ class ResetterMenu(core.MarkingMenu):
         self.buildResetterItems()
 
     def buildSimpleItems(self):
-        pm.menuItem(rp='W', l='Rotate', ecr=True, c=pm.Callback(
+        cmds.menuItem(rp='W', l='Rotate', ecr=True, c=utils.Callback(
             self.simpleReset, rot=True), ann='Reset the rotation of the selected objects')
-        pm.menuItem(rp='S', l='Translate', ecr=True, c=pm.Callback(
+        cmds.menuItem(rp='S', l='Translate', ecr=True, c=utils.Callback(
             self.simpleReset, trans=True), ann='Reset the position of the selected objects')
-        pm.menuItem(rp='E', l='Scale', ecr=True, c=pm.Callback(
+        cmds.menuItem(rp='E', l='Scale', ecr=True, c=utils.Callback(
             self.simpleReset, scale=True), ann='Reset the scale of the selected objects')
         if not resetter:
             # add fallback menu item if resetter is not available
-            pm.menuItem(rp='N', l='TRS', ecr=True, c=pm.Callback(self.simpleReset, trans=True, rot=True, scale=True),
+            cmds.menuItem(rp='N', l='TRS', ecr=True, c=utils.Callback(self.simpleReset, trans=True, rot=True, scale=True),
                         ann='Reset the selected objects\' transformations to identity, even if defaults are set')
 
     def buildResetterItems(self):
         if not resetter:
             return
-        pm.menuItem(rp='N', l='Smart', ecr=True, c=pm.Callback(resetter.reset),
+        cmds.menuItem(rp='N', l='Smart', ecr=True, c=utils.Callback(resetter.reset),
                     ann='Reset the selected objects\' attributes to the defaults, or identity if defaults are not set')
-        pm.menuItem(rp='NE', l='Defaults', ecr=True, c=pm.CallbackWithArgs(resetter.reset, useBasicDefaults=False),
+        cmds.menuItem(rp='NE', l='Defaults', ecr=True, c=utils.CallbackWithArgs(resetter.reset, useBasicDefaults=False),
                     ann='Reset the selected objects\' attributes to their defaults, does nothing if no defaults are set')
-        pm.menuItem(rp='SE', l='All Defaults', ecr=True, c=pm.Callback(resetter.resetAll),
+        cmds.menuItem(rp='SE', l='All Defaults', ecr=True, c=utils.Callback(resetter.resetAll),
                     ann='Reset all objects\' attributes with defaults set to their default values')
+        cmds.menuItem(rp='NW', l='Toggle Pose', ecr=True, c=utils.Callback(resetter.toggleResetPose),
+                    ann='Toggle between the last reset pose and the pose before it was reset')
 
-        pm.menuItem(l='Resetter', ecr=False, c=pm.Callback(
+        cmds.menuItem(l='Resetter', ecr=False, c=utils.Callback(
             resetter.GUI), ann='Open the Resetter GUI')
-        pm.menuItem(d=True)
-        pm.menuItem(l='Select Objects', ecr=True, c=pm.Callback(self.selectObjectsWithDefaults),
+        cmds.menuItem(d=True)
+        cmds.menuItem(l='Select Objects', ecr=True, c=utils.Callback(self.selectObjectsWithDefaults),
                     ann='Select all objects in the scene that have attribute defaults')
 
     def selectObjectsWithDefaults(self):
         if resetter:
-            pm.select(resetter.getObjectsWithDefaults())
+            nodes = [str(n) for n in resetter.getObjectsWithDefaults()]
+            if nodes:
+                cmds.select(nodes)
+            else:
+                cmds.select(cl=True)
 
     def simpleReset(self, trans=False, rot=False, scale=False):
-        for obj in pm.selected(typ='transform'):
+        for obj in cmds.ls(sl=True, long=True, type='transform'):
             if trans:
-                obj.t.set([0, 0, 0])
+                cmds.setAttr(obj + '.t', 0, 0, 0)
             if rot:
-                obj.r.set([0, 0, 0])
+                cmds.setAttr(obj + '.r', 0, 0, 0)
             if scale:
-                obj.s.set([1, 1, 1])
+                cmds.setAttr(obj + '.s', 1, 1, 1)
@@ -1,11 +1,14 @@
 
-import pymel.core as pm
+from maya import cmds
 
 
 __all__ = [
+    "Callback",
+    "CallbackWithArgs",
     "getHotkeyKwargs",
     "getModifiers",
     "getRadialMenuPositions",
+    "promptBox",
 ]
 
 
@@ -16,7 +19,7 @@ def getModifiers():
     Returns:
         A tuple of bools representing (isShiftPressed, isCtrlPressed, isAltPressed)
     """
-    mods = pm.cmds.getModifiers()
+    mods = cmds.getModifiers()
     isShiftPressed = (mods & 1) > 0
     isCtrlPressed = (mods & 4) > 0
     isAltPressed = (mods & 8) > 0
@@ -73,3 +76,47 @@ def getRadialMenuPositions(count):
             else:
                 results.append(None)
         return results
+
+
+def promptBox(title, msg, okButton, cancelButton, tx=None):
+    """
+    Show a prompt dialog and return the entered text,
+    or None if the dialog was cancelled.
+    """
+    prompt = cmds.promptDialog(t=title, m=msg, tx=tx, b=[
+                               okButton, cancelButton])
+    if prompt != okButton:
+        return
+    return cmds.promptDialog(q=True)
+
+
+class Callback(object):
+    """
+    A ui command that calls a function with the given arguments in a single
+    undo chunk, ignoring any arguments passed by the control.
+    """
+
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self, *args):
+        return self._call(self.args)
+
+    def _call(self, args):
+        cmds.undoInfo(openChunk=True)
+        try:
+            return self.func(*args, **self.kwargs)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+
+class CallbackWithArgs(Callback):
+    """
+    A ui command that calls a function with the given arguments followed by
+    any arguments passed by the control, e.g. the state of a checkbox.
+    """
+
+    def __call__(self, *args):
+        return self._call(self.args + args)
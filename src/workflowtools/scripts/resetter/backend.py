@@ -0,0 +1,135 @@
+"""
+pymel-free implementations of the resetter hot paths.
+
+Everything here works on plain node and attribute name strings using
+maya.cmds, so that resetting many nodes doesn't pay for constructing
+PyNodes. PyNodes can still be passed in anywhere a node name is expected.
+"""
+
+import sys
+
+from maya import cmds
+
+
+def isNode(obj):
+    """
+    Return True if obj is a node name or a PyNode
+    """
+    if isinstance(obj, str):
+        return True
+    # a PyNode can only exist if pymel has already been imported
+    pm = sys.modules.get('pymel.core')
+    return pm is not None and isinstance(obj, pm.nt.DependNode)
+
+
+def getNodeName(node):
+    """
+    Return the name of a node given as a string or PyNode
+    """
+    if isinstance(node, str):
+        return node
+    return node.name()
+
+
+def getLongNames(nodes):
+    """
+    Return the full path names of the given nodes, in order, skipping any that don't exist.
+    """
+    if not nodes:
+        # ls with no names would list every node in the scene
+        return []
+    return cmds.ls([getNodeName(n) for n in nodes], long=True) or []
+
+
+def toPyNodes(names):
+    """
+    Return PyNodes for the given node names if pymel has been imported,
+    otherwise return the names unchanged.
+    """
+    pm = sys.modules.get('pymel.core')
+    if pm is None:
+        return names
+    return [pm.PyNode(n) for n in names]
+
+
+def getSelectedNodes():
+    """
+    Return the full path names of all selected nodes
+    """
+    return cmds.ls(sl=True, long=True) or []
+
+
+def listNodesWithAttr(attrName):
+    """
+    Return the full path names of all nodes in the scene, including
+    those in namespaces, that have the given attribute.
+    """
+    return cmds.ls('*.' + attrName, recursive=True, objectsOnly=True, long=True) or []
+
+
+def isNodeLocked(node):
+    """
+    Return True if a node is locked or read-only
+    """
+    return bool(cmds.lockNode(node, q=True, lock=True)[0] or cmds.ls(node, readOnly=True))
+
+
+def hasPlug(plug):
+    return cmds.objExists(plug)
+
+
+def isPlugSettable(plug):
+    return cmds.getAttr(plug, settable=True)
+
+
+def getLongAttrName(node, attrName):
+    """
+    Return the long name of an attribute on a node
+    """
+    return cmds.attributeQuery(attrName, node=node, longName=True)
+
+
+def getPlugValue(plug):
+    """
+    Return the value of an attribute, returning
+    compound values as a tuple instead of a list of tuples.
+    """
+    value = cmds.getAttr(plug)
+    if isinstance(value, list) and len(value) == 1 and isinstance(value[0], tuple):
+        return value[0]
+    return value
+
+
+def setPlugValue(plug, value):
+    """
+    Set the value of a scalar, string, or compound attribute
+    """
+    if isinstance(value, str):
+        cmds.setAttr(plug, value, type='string')
+    elif isinstance(value, (list, tuple)):
+        cmds.setAttr(plug, *value)
+    else:
+        cmds.setAttr(plug, value)
+
+
+def getChannelBoxSelection(main=True, shape=True, out=True, hist=True):
+    """
+    Return the current channel box selection as a dict of
+    {full node path: set of long attribute names}.
+    See `resetter.getChannelBoxSelection` for the flags.
+    """
+    opts = {'m': main, 's': shape, 'o': out, 'h': hist}
+    result = {}
+    for mode, enabled in opts.items():
+        if not enabled:
+            continue
+        objs = cmds.channelBox('mainChannelBox', q=True, **{mode + 'ol': True})
+        attrs = cmds.channelBox('mainChannelBox', q=True, **{'s' + mode + 'a': True})
+        if not objs or not attrs:
+            continue
+        for obj in cmds.ls(objs, long=True) or []:
+            nodeAttrs = result.setdefault(obj, set())
+            for attr in attrs:
+                if cmds.attributeQuery(attr, node=obj, exists=True):
+                    nodeAttrs.add(getLongAttrName(obj, attr))
+    return result
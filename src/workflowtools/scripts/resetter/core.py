@@ -1,27 +1,41 @@
 
+import array
+import collections
 import logging
 
-import pymel.core as pm
+from maya import cmds
+
+from . import backend
 
 
 __all__ = [
+    "clearResetSnapshots",
     "getChannelBoxSelection",
     "getDefaults",
     "getDefaultsAttr",
     "getObjectsWithDefaults",
+    "getResetSnapshots",
     "removeAllDefaults",
     "removeDefaults",
     "reset",
     "resetAll",
+    "ResetSnapshot",
     "setDefaults",
     "setDefaultsCBSelection",
     "setDefaultsForAttrs",
     "setDefaultsNonkeyable",
+    "toggleResetPose",
 ]
 
 
 DEFAULTS_ATTR = 'brstDefaults'
 
+# the maximum number of reset snapshots to keep for toggling
+SNAPSHOT_BUFFER_SIZE = 10
+
+# ring buffer of ResetSnapshots, the most recent reset is last
+SNAPSHOTS = collections.deque(maxlen=SNAPSHOT_BUFFER_SIZE)
+
 LOG = logging.getLogger('resetter')
 LOG.setLevel(logging.INFO)
 
@@ -50,11 +64,13 @@ def setDefaults(nodes=None, attrList=[], key=True, nonkey=False, cbsel=False, at
     `attrQuery` -- a kwargs dict to be used with listAttr to find the
         attributes for which to store defaults. works in addition to other options
     """
+    import pymel.core as pm
+
     if nodes is None:
         nodes = pm.selected()
     if not isinstance(nodes, (list, tuple)):
         nodes = [nodes]
-    nodes = [n for n in nodes if isinstance(n, (str, pm.nt.DependNode))]
+    nodes = [pm.PyNode(n) for n in nodes if backend.isNode(n)]
     if len(nodes) == 0:
         return
 
@@ -86,7 +102,7 @@ def setDefaults(nodes=None, attrList=[], key=True, nonkey=False, cbsel=False, at
         if len(attrs) > 0:
             setDefaultsForAttrs(attrs)
         else:
-            pm.warning(
+            cmds.warning(
                 'No matching attributes for {0} to set defaults. removing defaults'.format(n))
             removeDefaults(n)
     LOG.debug('set defaults for {0} object(s)'.format(len(nodes)))
@@ -103,7 +119,7 @@ def setDefaultsForAttrs(attrs):
     defaults = {}
     for attr in attrs:
         if attr.attrName() == DEFAULTS_ATTR:
-            pm.warning(
+            cmds.warning(
                 'skipping {0} as it stores defaults and therefore cannot have a default'.format(attr))
             continue
         if attr.node() == node:
@@ -111,11 +127,11 @@ def setDefaultsForAttrs(attrs):
                 defaults[attr.attrName()] = attr.get()
             except:
                 # complex attributes just dont work
-                pm.warning(
+                cmds.warning(
                     'could not store defaults for attribute: {0}'.format(attr))
     dattr = getDefaultsAttr(node, True)
     if dattr.isLocked():
-        pm.warning('cannot store defaults, {0} is locked'.format(dattr))
+        cmds.warning('cannot store defaults, {0} is locked'.format(dattr))
     else:
         dattr.set(str(defaults))
         LOG.debug('stored {0} default(s) for {1}: {2}'.format(
@@ -125,22 +141,26 @@ def setDefaultsForAttrs(attrs):
 def getObjectsWithDefaults(nodes=None):
     """
     Return all objects with defaults.
-    Searches the given nodes, or all nodes if none are given.
+    Searches the given nodes, or all nodes in the scene if none are given,
+    which are returned as PyNodes if pymel has been imported, or full path names otherwise.
     """
     if nodes is None:
-        nodes = pm.ls()
-    return [obj for obj in nodes if obj.hasAttr(DEFAULTS_ATTR)]
+        return backend.toPyNodes(backend.listNodesWithAttr(DEFAULTS_ATTR))
+    return [obj for obj in nodes if backend.hasPlug(
+        '{0}.{1}'.format(backend.getNodeName(obj), DEFAULTS_ATTR))]
 
 
 def getDefaultsAttr(node, create=False):
     """ Return the defaults attribute for the given nodeect """
-    if not isinstance(node, (str, pm.nt.DependNode)):
+    import pymel.core as pm
+
+    if not backend.isNode(node):
         raise TypeError(
             'expected node or node name, got {0}'.format(type(node).__name__))
     node = pm.PyNode(node)
     if create and not node.hasAttr(DEFAULTS_ATTR):
         if node.isReadOnly() or node.isLocked():
-            pm.warning(
+            cmds.warning(
                 'Cannot add defaults to {0}. Node is locked or read-only'.format(node))
             return
         node.addAttr(DEFAULTS_ATTR, dt='string')
@@ -152,68 +172,94 @@ def getDefaultsAttr(node, create=False):
 
 def getDefaults(node):
     """ Returns the defaults of a node, if they exist, as a dictionary. """
-    dattr = getDefaultsAttr(node)
-    if dattr is not None:
-        defaultsRaw = None
-        val = dattr.get()
-        try:
-            defaultsRaw = eval(val)
-        except:
-            pass
-        # validate defaults
-        if not isinstance(defaultsRaw, dict):
-            pm.warning('invalid defaults found on: {0}'.format(node))
-            return {}
-        # process defaults
-        defaults = {}
-        for k, v in defaultsRaw.items():
-            # skip the defaults attribute itself, if it somehow got in there
-            if k == DEFAULTS_ATTR:
-                pm.warning(
-                    'skipping attribute {0}. it stores defaults and is therefore unable to have a default'.format(k))
-                continue
-            if not node.hasAttr(k):
-                pm.warning(
-                    'skipping default, {0} has no attribute .{1}'.format(node, k))
-                continue
-            # backwards compatibility checking
-            if type(node.attr(k).get()) != type(v):
-                pm.warning(
-                    'default values for {0} are deprecated. please re-set the defaults'.format(node.attr(k)))
-                # parse the value assuming its a tuple (old resetter)
-                if isinstance(v, tuple) and len(v) == 1:
-                    v = v[0]
-            defaults[node.attr(k)] = v
-        return defaults
-    return {}
+    import pymel.core as pm
+
+    if not backend.isNode(node):
+        raise TypeError(
+            'expected node or node name, got {0}'.format(type(node).__name__))
+    defaults = _getDefaultValues(backend.getNodeName(node))
+    if not defaults:
+        return {}
+    node = pm.PyNode(node)
+    return dict((node.attr(k), v) for k, v in defaults.items())
+
+
+def _getDefaultValues(node):
+    """
+    Return the defaults of a node as a dictionary of {attribute name: value}.
+    The same as `getDefaults`, but uses node and attribute names only.
+    """
+    dattr = '{0}.{1}'.format(node, DEFAULTS_ATTR)
+    if not backend.hasPlug(dattr):
+        return {}
+    defaultsRaw = None
+    try:
+        defaultsRaw = eval(backend.getPlugValue(dattr))
+    except:
+        pass
+    # validate defaults
+    if not isinstance(defaultsRaw, dict):
+        cmds.warning('invalid defaults found on: {0}'.format(node))
+        return {}
+    # process defaults
+    defaults = {}
+    for k, v in defaultsRaw.items():
+        # skip the defaults attribute itself, if it somehow got in there
+        if k == DEFAULTS_ATTR:
+            cmds.warning(
+                'skipping attribute {0}. it stores defaults and is therefore unable to have a default'.format(k))
+            continue
+        plug = '{0}.{1}'.format(node, k)
+        if not backend.hasPlug(plug):
+            cmds.warning(
+                'skipping default, {0} has no attribute .{1}'.format(node, k))
+            continue
+        # backwards compatibility checking, parse the value
+        # assuming its a single item tuple (old resetter)
+        if isinstance(v, tuple) and len(v) == 1 and not isinstance(backend.getPlugValue(plug), tuple):
+            cmds.warning(
+                'default values for {0} are deprecated. please re-set the defaults'.format(plug))
+            v = v[0]
+        defaults[k] = v
+    return defaults
 
 
 def removeDefaults(nodes=None):
     """
     Remove defaults from the given nodes.
-    Returns the nodes for which defaults were removed.
+    Returns the nodes for which defaults were removed, as PyNodes
+    if pymel has been imported, or full path names otherwise.
     """
     if nodes is None:
-        nodes = pm.selected()
-    if not isinstance(nodes, (list, tuple)):
-        nodes = [nodes]
+        nodes = backend.getSelectedNodes()
+    else:
+        if not isinstance(nodes, (list, tuple)):
+            nodes = [nodes]
+        nodes = backend.getLongNames(nodes)
+    return backend.toPyNodes(_removeDefaults(nodes))
+
 
+def _removeDefaults(nodes):
+    """
+    Remove defaults from nodes given by full path name.
+    Returns the full path names of the nodes for which defaults were removed.
+    """
     removed = []
     for n in nodes:
-        if n.isReadOnly() or n.isLocked():
-            pm.warning(
+        if backend.isNodeLocked(n):
+            cmds.warning(
                 'Could not remove defaults from {0}. Node is locked or read-only.'.format(n))
             continue
-        dattr = getDefaultsAttr(n)
-        if dattr is not None:
-            removed.append(pm.PyNode(n))
-            dattr.delete()
+        dattr = '{0}.{1}'.format(n, DEFAULTS_ATTR)
+        if backend.hasPlug(dattr):
+            cmds.deleteAttr(dattr)
+            removed.append(n)
     return removed
 
 
 def removeAllDefaults():
     """ Remove all defaults from all objects in the scene. """
-    return removeDefaults(getObjectsWithDefaults())
+    return backend.toPyNodes(_removeDefaults(backend.listNodesWithAttr(DEFAULTS_ATTR)))
 
 
 # Resetting
@@ -224,10 +270,10 @@ def resetAll():
     Find and reset all nodes in the scene that have
     defaults defined.
     """
-    reset(getObjectsWithDefaults(), useBasicDefaults=False)
+    reset(backend.listNodesWithAttr(DEFAULTS_ATTR), useBasicDefaults=False)
 
 
-def reset(nodes=None, useBasicDefaults=True, useCBSelection=True):
+def reset(nodes=None, useBasicDefaults=True, useCBSelection=True, snapshot=True):
     """
     Reset the given nodes' attributes to their default values.
     Uses the selection if no nodes are given.
@@ -237,46 +283,164 @@ def reset(nodes=None, useBasicDefaults=True, useCBSelection=True):
             node is a transform, reset its translate, rotate, scale to 0, 0, and 1
         useCBSelection: When True, if there is a channel box selection, use it
             to limit which attributes will be reset
+        snapshot: When True, store the pre-reset values of every attribute that
+            was set, so that the previous pose can be restored with `toggleResetPose`
     """
     if nodes is None:
-        nodes = pm.selected()
+        nodes = backend.getSelectedNodes()
     else:
         if not isinstance(nodes, (list, tuple)):
-            if not isinstance(nodes, (str, pm.nt.DependNode)):
+            if not backend.isNode(nodes):
                 raise TypeError('expected node, node name, or list of nodes; got {0}'.format(
                     type(nodes).__name__))
             nodes = [nodes]
-        nodes = [pm.PyNode(n) for n in nodes]
+        nodes = backend.getLongNames(nodes)
 
-    selAttrs = getChannelBoxSelection()
+    selAttrs = backend.getChannelBoxSelection() if useCBSelection else {}
+    resetSnapshot = ResetSnapshot()
     for n in nodes:
         newAttrVals = {}
         # add pre-defined defaults
-        defaults = getDefaults(n)
+        defaults = _getDefaultValues(n)
         newAttrVals.update(defaults)
         # add basic transform reset values
         if useBasicDefaults and len(newAttrVals) == 0:
             for a in [i+j for i in 'trs' for j in 'xyz']:
                 # only add if they are settable
-                if n.hasAttr(a) and n.attr(a).isSettable():
-                    newAttrVals[n.attr(a)] = 1 if 's' in a else 0
+                plug = '{0}.{1}'.format(n, a)
+                if backend.hasPlug(plug) and backend.isPlugSettable(plug):
+                    newAttrVals[a] = 1 if 's' in a else 0
         # trim using cb selection
-        if useCBSelection and len(selAttrs) > 0:
-            nodeSelAttrs = {} if n not in selAttrs else selAttrs[n]
-            delAttrs = [a for a in newAttrVals.keys() if a not in nodeSelAttrs]
+        if selAttrs:
+            nodeSelAttrs = selAttrs.get(n, set())
+            delAttrs = [a for a in newAttrVals.keys()
+                        if backend.getLongAttrName(n, a) not in nodeSelAttrs]
             for a in delAttrs:
                 del newAttrVals[a]
 
-        for attr, value in newAttrVals.items():
-            if attr.isSettable():
+        for attrName, value in newAttrVals.items():
+            plug = '{0}.{1}'.format(n, attrName)
+            if backend.isPlugSettable(plug):
                 try:
-                    attr.set(value)
+                    prevValue = backend.getPlugValue(plug) if snapshot else None
+                    backend.setPlugValue(plug, value)
                 except Exception as e:
                     LOG.info(
-                        'skipping {0}. could not set attribute:'.format(attr))
+                        'skipping {0}. could not set attribute:'.format(plug))
                     LOG.info(e)
+                else:
+                    if snapshot:
+                        resetSnapshot.add(plug, prevValue, value)
             else:
-                LOG.info('skipping {0}. attribute not settable'.format(attr))
+                LOG.info('skipping {0}. attribute not settable'.format(plug))
+
+    if len(resetSnapshot):
+        SNAPSHOTS.append(resetSnapshot)
+
+
+# Pose Snapshots
+# --------------
+
+def getResetSnapshots():
+    """
+    Return a list of all stored reset snapshots, ordered
+    from oldest to most recent.
+    """
+    return list(SNAPSHOTS)
+
+
+def clearResetSnapshots():
+    """ Remove all stored reset snapshots. """
+    SNAPSHOTS.clear()
+
+
+def toggleResetPose(index=-1):
+    """
+    Toggle between the pose that existed before a reset and the reset pose.
+    Uses the most recent reset snapshot if no index is given.
+
+    Returns:
+        True if the pre-reset pose is now applied, False if the reset pose
+        is applied, or None if there is no snapshot to toggle.
+    """
+    if not SNAPSHOTS:
+        LOG.info('no reset snapshots to toggle')
+        return
+    resetSnapshot = SNAPSHOTS[index]
+    resetSnapshot.toggle()
+    return resetSnapshot.isRestored
+
+
+def _isScalar(value):
+    return isinstance(value, (bool, int, float))
+
+
+class ResetSnapshot(object):
+    """
+    Stores the values of every attribute written by a reset, both before
+    and after the reset, so that either pose can be re-applied without
+    querying the scene again.
+
+    Scalar values are stored in flat arrays of doubles, any other values
+    (strings, compound attributes) are kept in a separate list.
+    """
+
+    def __init__(self):
+        # full attribute paths for the scalar values
+        self.plugs = []
+        self.before = array.array('d')
+        self.after = array.array('d')
+        # list of (plug, before, after) for non-scalar values
+        self.extra = []
+        # whether the pre-reset values are currently applied
+        self.isRestored = False
+
+    def __len__(self):
+        return len(self.plugs) + len(self.extra)
+
+    def add(self, plug, before, after):
+        """
+        Add an attribute and its values before and after resetting.
+        """
+        if _isScalar(before) and _isScalar(after):
+            self.plugs.append(plug)
+            self.before.append(before)
+            self.after.append(after)
+        else:
+            self.extra.append((plug, before, after))
+
+    def apply(self, restore):
+        """
+        Set all attributes in a single undo chunk.
+
+        Args:
+            restore: When True, apply the pre-reset values,
+                otherwise apply the reset values
+        """
+        values = self.before if restore else self.after
+        cmds.undoInfo(openChunk=True)
+        try:
+            for plug, value in zip(self.plugs, values):
+                try:
+                    backend.setPlugValue(plug, value)
+                except RuntimeError as e:
+                    LOG.info('skipping {0}. could not set attribute:'.format(plug))
+                    LOG.info(e)
+            for plug, before, after in self.extra:
+                try:
+                    backend.setPlugValue(plug, before if restore else after)
+                except Exception as e:
+                    LOG.info('skipping {0}. could not set attribute:'.format(plug))
+                    LOG.info(e)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+        self.isRestored = restore
+
+    def toggle(self):
+        """
+        Switch between the pre-reset and reset values.
+        """
+        self.apply(not self.isRestored)
 
 
 # Utils
@@ -296,6 +460,8 @@ def getChannelBoxSelection(main=True, shape=True, out=True, hist=True):
     `hist` -- the inputs (history) section of the node
     """
 
+    import pymel.core as pm
+
     def cbinfo(flag):
         return pm.channelBox('mainChannelBox', q=True, **{flag: True})
 
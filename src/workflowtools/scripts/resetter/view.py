@@ -1,8 +1,9 @@
 
 import logging
 
-import pymel.core as pm
+from maya import cmds
 
+from . import backend
 from . import core
 
 
@@ -20,7 +21,7 @@ LOG.setLevel(logging.INFO)
 # -----
 
 def printObjectsWithDefaults():
-    nodes = core.getObjectsWithDefaults()
+    nodes = backend.listNodesWithAttr(core.DEFAULTS_ATTR)
     LOG.info('Objects with defaults ({0})'.format(len(nodes)))
     for n in nodes:
         LOG.info('   {0}'.format(n))
@@ -35,7 +36,26 @@ def printDefaults():
 
 
 def selectObjectsWithDefaults():
-    pm.select(core.getObjectsWithDefaults())
+    nodes = backend.listNodesWithAttr(core.DEFAULTS_ATTR)
+    if nodes:
+        cmds.select(nodes)
+    else:
+        cmds.select(clear=True)
+
+
+def _callback(func, *args, **kwargs):
+    """
+    Return a ui command that calls func with the given arguments in
+    a single undo chunk, ignoring any arguments passed by the control.
+    """
+    def command(*_):
+        cmds.undoInfo(openChunk=True)
+        try:
+            func(*args, **kwargs)
+        finally:
+            cmds.undoInfo(closeChunk=True)
+
+    return command
 
 
 # View
@@ -53,55 +73,56 @@ class GUI(object):
 
     def build(self):
         # check for pre-existing window
-        if pm.window(self.winName, ex=True):
-            pm.deleteUI(self.winName, wnd=True)
-
-        if not pm.windowPref(self.winName, ex=True):
-            pm.windowPref(self.winName, tlc=(200, 200))
-        pm.windowPref(self.winName, e=True, w=280, h=100)
-
-        with pm.window(self.winName, rtf=1, mb=1, tlb=True, t='Resetter') as self.win:
-            imenu = pm.menu(l='Info')
-            pm.setParent(imenu, m=True)
-            pm.menuItem(l='Select Objects with Defaults',
-                        c=pm.Callback(selectObjectsWithDefaults))
-            pm.menuItem(l='Print Objects with Defaults',
-                        c=pm.Callback(printObjectsWithDefaults))
-            pm.menuItem(l='Print Default Values', c=pm.Callback(printDefaults))
-
-            with pm.formLayout(nd=100) as form:
-
-                with pm.frameLayout(l='Set/Remove Defaults', bs='out', mw=2, mh=2, cll=True, cl=True) as setFrame:
-                    with pm.columnLayout(rs=2, adj=True):
-                        pm.button(l='Set Defaults', c=pm.Callback(core.setDefaults), bgc=self.colSet,
-                                  ann='Set defaults on the selected objects using all keyable attributes')
-                        pm.button(l='Set Defaults Include Non-Keyable', c=pm.Callback(core.setDefaultsNonkeyable), bgc=self.colSet,
-                                  ann='Set defaults on the selected objects using keyable and non-keyable attributes in the channel box')
-                        pm.button(l='Set Defaults with CB Selection', c=pm.Callback(core.setDefaultsCBSelection),
-                                  bgc=self.colSet, ann='Set defaults on the selected objects using the selected channel box attributes')
-                        pm.button(l='Remove Defaults', c=pm.Callback(
-                            core.removeDefaults), bgc=self.colRemove, ann='Remove all defaults from the selected objects')
-                        pm.button(l='Remove from All Objects', c=pm.Callback(
-                            core.removeAllDefaults), bgc=self.colRemove, ann='Remove defaults from all objects in the scene')
-
-                with pm.frameLayout(l='Reset', bs='out', mw=2, mh=2) as resetFrame:
-                    with pm.formLayout(nd=100) as resetForm:
-                        b6 = pm.button(l='Reset', c=pm.Callback(core.reset), bgc=self.colReset,
-                                       ann='Reset the selected objects. Uses basic transform defaults if no defaults are defined for translate, rotate, and scale')
-                        b7 = pm.button(l='Defined Only', c=pm.Callback(
-                            self.resetDefinedOnly), bgc=self.colReset, ann='Reset the selected objects using only defined defaults')
-                        b9 = pm.button(l='All Defined', c=pm.Callback(
-                            core.resetAll), bgc=self.colReset2, ann='Reset all objects in the scene with defaults')
-                        pm.formLayout(resetForm, e=True,
-                                      ap=[(b6, 'left', 0, 0), (b6, 'right', 2, 33),
-                                          (b7, 'left', 2, 33), (b7, 'right', 2, 66),
-                                          (b9, 'left', 2, 66), (b9, 'right', 2, 100), ])
-
-                mw = 4
-                pm.formLayout(form, e=True,
-                              af=[(setFrame, 'left', mw), (setFrame, 'right', mw),
-                                  (resetFrame, 'left', mw), (resetFrame, 'right', mw)],
-                              ac=[(resetFrame, 'top', 2, setFrame)],)
+        if cmds.window(self.winName, ex=True):
+            cmds.deleteUI(self.winName, wnd=True)
+
+        if not cmds.windowPref(self.winName, ex=True):
+            cmds.windowPref(self.winName, tlc=(200, 200))
+        cmds.windowPref(self.winName, e=True, w=280, h=100)
+
+        self.win = cmds.window(self.winName, rtf=1, mb=1, tlb=True, t='Resetter')
+        cmds.menu(l='Info')
+        cmds.menuItem(l='Select Objects with Defaults',
+                      c=_callback(selectObjectsWithDefaults))
+        cmds.menuItem(l='Print Objects with Defaults',
+                      c=_callback(printObjectsWithDefaults))
+        cmds.menuItem(l='Print Default Values', c=_callback(printDefaults))
+
+        form = cmds.formLayout(nd=100)
+
+        setFrame = cmds.frameLayout(l='Set/Remove Defaults', bs='out', mw=2, mh=2, cll=True, cl=True)
+        cmds.columnLayout(rs=2, adj=True)
+        cmds.button(l='Set Defaults', c=_callback(core.setDefaults), bgc=self.colSet,
+                    ann='Set defaults on the selected objects using all keyable attributes')
+        cmds.button(l='Set Defaults Include Non-Keyable', c=_callback(core.setDefaultsNonkeyable), bgc=self.colSet,
+                    ann='Set defaults on the selected objects using keyable and non-keyable attributes in the channel box')
+        cmds.button(l='Set Defaults with CB Selection', c=_callback(core.setDefaultsCBSelection),
+                    bgc=self.colSet, ann='Set defaults on the selected objects using the selected channel box attributes')
+        cmds.button(l='Remove Defaults', c=_callback(
+            core.removeDefaults), bgc=self.colRemove, ann='Remove all defaults from the selected objects')
+        cmds.button(l='Remove from All Objects', c=_callback(
+            core.removeAllDefaults), bgc=self.colRemove, ann='Remove defaults from all objects in the scene')
+        cmds.setParent(form)
+
+        resetFrame = cmds.frameLayout(l='Reset', bs='out', mw=2, mh=2)
+        resetForm = cmds.formLayout(nd=100)
+        b6 = cmds.button(l='Reset', c=_callback(core.reset), bgc=self.colReset,
+                         ann='Reset the selected objects. Uses basic transform defaults if no defaults are defined for translate, rotate, and scale')
+        b7 = cmds.button(l='Defined Only', c=_callback(
+            self.resetDefinedOnly), bgc=self.colReset, ann='Reset the selected objects using only defined defaults')
+        b9 = cmds.button(l='All Defined', c=_callback(
+            core.resetAll), bgc=self.colReset2, ann='Reset all objects in the scene with defaults')
+        cmds.formLayout(resetForm, e=True,
+                        ap=[(b6, 'left', 0, 0), (b6, 'right', 2, 33),
+                            (b7, 'left', 2, 33), (b7, 'right', 2, 66),
+                            (b9, 'left', 2, 66), (b9, 'right', 2, 100), ])
+
+        mw = 4
+        cmds.formLayout(form, e=True,
+                        af=[(setFrame, 'left', mw), (setFrame, 'right', mw),
+                            (resetFrame, 'left', mw), (resetFrame, 'right', mw)],
+                        ac=[(resetFrame, 'top', 2, setFrame)],)
+        cmds.showWindow(self.win)
 
     def resetDefinedOnly(self):
         core.reset(useBasicDefaults=False)
@@ -1,3 +1,4 @@
 
 from .core import *
 from .menu import *
+from .timing import *
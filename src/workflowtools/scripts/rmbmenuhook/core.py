@@ -1,20 +1,27 @@
 """
 Functions for installing and uninstalling the rmb hooks by sourcing
-the appropriate mel scripts.
+the appropriate mel scripts. The overrides for the installed version
+of Maya are generated and cached on first use, see `overrides`.
 
 Installing and uninstalling has no effect on which menus are
 currently registered.
+
+maya is imported when first needed, so that the package, including
+`overrides`, can be imported and tested outside of Maya.
 """
 
 
 import os
 
-import pymel.core as pm
+from . import overrides
 
 
 __all__ = [
     'enable',
     'disable',
+    'getOverridesCacheDir',
+    'getOverridesScriptPath',
+    'loadBridgePlugin',
 ]
 
 
@@ -24,30 +31,60 @@ ORIGINAL_SCRIPTS = [
     'dagMenuProc'
 ]
 
+# the command plugin that lets mel call rmbmenuhook.buildMenu directly
+BRIDGE_PLUGIN = 'rmbmenuhookBridge'
+
+
+def loadBridgePlugin():
+    """
+    Load the rmbmenuhookBridge plugin if it isn't already loaded.
+    When the plugin is unavailable, the mel hooks fall back to
+    evaluating python code on each right-click.
+
+    Returns:
+        True if the plugin is loaded
+    """
+    from maya import cmds
+
+    if cmds.pluginInfo(BRIDGE_PLUGIN, q=True, loaded=True):
+        return True
+    try:
+        cmds.loadPlugin(BRIDGE_PLUGIN, quiet=True)
+    except RuntimeError:
+        cmds.warning('Could not load {0} plugin, using slower python fallback'.format(BRIDGE_PLUGIN))
+        return False
+    return True
+
 
 def enable():
     """
     Source the appropriate mel scripts
     """
+    from maya import cmds, mel
 
     # ensure the overidden scripts have been sourced
     # at least once to prevent them sourcing later
     for script in ORIGINAL_SCRIPTS:
-        pm.mel.source(script)
+        mel.eval('source "{0}"'.format(script))
 
-    # build list of mel scripts to source
-    vers = pm.about(version=True).split(' ')[0]
-    scripts = [
-        'rmbmenuhook.mel',
-        'rmbmenuhookOverrides{0}.mel'.format(vers),
-    ]
+    loadBridgePlugin()
+
+    vers = cmds.about(version=True).split(' ')[0]
+    try:
+        overridesPath = getOverridesScriptPath(vers)
+    except (IOError, ValueError) as e:
+        cmds.warning('Could not generate RMB Marking Menu Hook overrides for Maya {0}: {1}'.format(vers, e))
+        return
 
     # source using full path for each script
-    dir = os.path.dirname(__file__)
+    scripts = [
+        os.path.join(os.path.dirname(__file__), 'rmbmenuhook.mel'),
+        overridesPath,
+    ]
     for script in scripts:
-        fullPath = os.path.join(dir, script).replace('\\', '/')
+        fullPath = script.replace('\\', '/')
         print('Sourcing {0}'.format(fullPath))
-        pm.mel.source(fullPath)
+        mel.eval('source "{0}"'.format(fullPath))
     print('RMB Marking Menu Hooks enabled')
 
 
@@ -56,6 +93,44 @@ def disable():
     Source the default mel scripts
     to remove any custom overrides
     """
+    from maya import mel
+
     for script in ORIGINAL_SCRIPTS:
-        pm.mel.source(script)
+        mel.eval('source "{0}"'.format(script))
     print('RMB Marking Menu Hooks disabled')
+
+
+def getOverridesCacheDir():
+    """
+    Return the directory where generated override scripts are stored
+    """
+    from maya import cmds
+
+    return os.path.join(cmds.internalVar(userAppDir=True), 'rmbmenuhook')
+
+
+def _getOriginalScriptPath(procName):
+    from maya import mel
+
+    # expects the original script to have been sourced already
+    result = mel.eval('whatIs "{0}"'.format(procName))
+    prefix = 'Mel procedure found in: '
+    if not result.startswith(prefix):
+        raise ValueError('could not find script for {0}: {1}'.format(procName, result))
+    return result[len(prefix):]
+
+
+def getOverridesScriptPath(version):
+    """
+    Return the path to the override script for the installed
+    buildObjectMenuItemsNow and dagMenuProc scripts, generating
+    it if needed. The original scripts must already be sourced.
+
+    Raises:
+        IOError if a script could not be read or the override could not be written
+        ValueError if a script could not be found or has an unsupported format
+    """
+    return overrides.getCachedOverridesPath(
+        getOverridesCacheDir(), version,
+        _getOriginalScriptPath('buildObjectMenuItemsNow'),
+        _getOriginalScriptPath('dagMenuProc'))
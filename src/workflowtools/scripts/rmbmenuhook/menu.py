@@ -19,9 +19,25 @@ class MyObjectMenu(Menu):
         pm.setParent(self.menu, m=True)
         pm.menuItem(l='My Object Action')
 
+Example Menu that declares its conditions as rules instead of using
+shouldBuild, so that it can be found using an index lookup:
+
+class MyJointMenu(Menu):
+    rules = MenuRules(panelTypes=['modelPanel'], nodeTypes=['joint'], hit=True)
+
+    def build(self):
+        pm.setParent(self.menu, m=True)
+        pm.menuItem(l='My Joint Action')
+
+All Menu instances created for a single right-click share one MenuContext,
+so panel and hit queries are only performed once, and only if a menu
+actually needs them.
 """
 
-import pymel.core as pm
+import bisect
+import itertools
+
+from . import timing
 
 __all__ = [
     'registerMenu',
@@ -29,21 +45,84 @@ __all__ = [
     'getRegisteredMenu',
     'getAllRegisteredMenus',
     'getPrioritizedMenuClasses',
+    'getRegistryVersion',
+    'addRegistryCallback',
+    'removeRegistryCallback',
+    'getMenuIndex',
     'buildMenu',
     'Menu',
+    'MenuContext',
+    'MenuIndex',
+    'MenuRules',
 ]
 
 
+# registered menus, stored as tuples of (cls, priority) indexed by name
 REGISTERED_MENUS = {}
 
+# incremented each time the registered menus change
+REGISTRY_VERSION = 0
+
+# callbacks invoked as func(name, cls, priority) when menus are registered or unregistered
+REGISTRY_CALLBACKS = {
+    'registered': [],
+    'unregistered': [],
+}
+
+# sort keys of (-priority, sequence, name) for all registered menus, kept sorted
+_SORTED_KEYS = []
+# registered menu classes in the same order as _SORTED_KEYS
+_SORTED_CLASSES = []
+# the sort key of each registered menu by name
+_MENU_KEYS = {}
+# provides registration order, so that menus with equal priority keep a stable order
+_SEQUENCE = itertools.count()
+
+# the MenuIndex for the currently registered menus, built on demand
+# and then updated in place as menus are registered and unregistered
+_MENU_INDEX = None
+
+# the MenuContext of the right-click currently being handled by `buildMenu`,
+# used by Menu instances so the constructor signature doesn't need to change
+_ACTIVE_CONTEXT = None
+
+
+def _runRegistryCallbacks(event, name, cls, priority):
+    for func in REGISTRY_CALLBACKS[event][:]:
+        func(name, cls, priority)
+
+
+def _removeSortedEntry(name):
+    key = _MENU_KEYS.pop(name)
+    index = bisect.bisect_left(_SORTED_KEYS, key)
+    del _SORTED_KEYS[index]
+    del _SORTED_CLASSES[index]
+    if _MENU_INDEX is not None:
+        _MENU_INDEX.remove(key)
+
 
 def registerMenu(name, cls, priority=0):
     """
     Register a Menu class under the given name
-    with the given priority.
+    with the given priority. Menus with equal priority
+    are ordered by when they were registered.
     """
-    global REGISTERED_MENUS
+    global REGISTERED_MENUS, REGISTRY_VERSION
+    if REGISTERED_MENUS.get(name) == (cls, priority):
+        # already registered, keep the existing order
+        return
+    if name in REGISTERED_MENUS:
+        _removeSortedEntry(name)
+    key = (-priority, next(_SEQUENCE), name)
+    index = bisect.bisect_right(_SORTED_KEYS, key)
+    _SORTED_KEYS.insert(index, key)
+    _SORTED_CLASSES.insert(index, cls)
+    _MENU_KEYS[name] = key
+    if _MENU_INDEX is not None:
+        _MENU_INDEX.add(key, cls)
     REGISTERED_MENUS[name] = (cls, priority)
+    REGISTRY_VERSION += 1
+    _runRegistryCallbacks('registered', name, cls, priority)
 
 
 def unregisterMenu(name):
@@ -51,9 +130,12 @@ def unregisterMenu(name):
     Unregister a Menu that was previously registered
     under the given name.
     """
-    global REGISTERED_MENUS
+    global REGISTERED_MENUS, REGISTRY_VERSION
     if name in REGISTERED_MENUS:
-        del REGISTERED_MENUS[name]
+        cls, priority = REGISTERED_MENUS.pop(name)
+        _removeSortedEntry(name)
+        REGISTRY_VERSION += 1
+        _runRegistryCallbacks('unregistered', name, cls, priority)
 
 
 def getRegisteredMenu(name):
@@ -79,14 +161,50 @@ def getPrioritizedMenuClasses():
     Return a list Menu classes sorted by priority
     with higher priority numbers ordered first.
     """
-    # registered values are tuples of (cls, priority)
-    global REGISTERED_MENUS
-    classes = list(REGISTERED_MENUS.values())
-    # sort by priority
-    classes.sort(key=lambda x: x[1])
-    classes.reverse()
-    # return only the classes
-    return [c for (c, p) in classes]
+    return _SORTED_CLASSES[:]
+
+
+def getRegistryVersion():
+    """
+    Return a number that changes each time a menu
+    is registered or unregistered.
+    """
+    return REGISTRY_VERSION
+
+
+def addRegistryCallback(event, func):
+    """
+    Add a function to be called when a menu is registered or unregistered.
+
+    Args:
+        event: A string event name, either 'registered' or 'unregistered'
+        func: A function to call with (name, cls, priority)
+    """
+    if event not in REGISTRY_CALLBACKS:
+        raise ValueError("invalid registry event: {0}".format(event))
+    if func not in REGISTRY_CALLBACKS[event]:
+        REGISTRY_CALLBACKS[event].append(func)
+
+
+def removeRegistryCallback(event, func):
+    """
+    Remove a function that was previously added with `addRegistryCallback`.
+    """
+    if event not in REGISTRY_CALLBACKS:
+        raise ValueError("invalid registry event: {0}".format(event))
+    if func in REGISTRY_CALLBACKS[event]:
+        REGISTRY_CALLBACKS[event].remove(func)
+
+
+def getMenuIndex():
+    """
+    Return the MenuIndex for all registered menus,
+    building it the first time it is needed.
+    """
+    global _MENU_INDEX
+    if _MENU_INDEX is None:
+        _MENU_INDEX = MenuIndex(zip(_SORTED_KEYS, _SORTED_CLASSES))
+    return _MENU_INDEX
 
 
 def buildMenu(menu, obj=None):
@@ -99,13 +217,253 @@ def buildMenu(menu, obj=None):
     `obj` will be set if an object is under the mouse
         or a transform/shape is selected.
     """
-    classes = getPrioritizedMenuClasses()
-    for menuCls in classes:
-        inst = menuCls(menu, obj)
-        if inst.shouldBuild():
-            inst.build()
-            return True
-    return False
+    global _ACTIVE_CONTEXT
+    with timing.timed('dispatch'):
+        context = MenuContext(menu, obj)
+        _ACTIVE_CONTEXT = context
+        try:
+            for menuCls in getMenuIndex().getCandidates(context):
+                name = menuCls.__name__
+                with timing.timed('init', name):
+                    inst = menuCls(menu, obj)
+                with timing.timed('shouldBuild', name):
+                    shouldBuild = inst.shouldBuild()
+                if shouldBuild:
+                    with timing.timed('build', name):
+                        inst.build()
+                    return True
+            return False
+        finally:
+            _ACTIVE_CONTEXT = None
+
+
+class _lazyProperty(object):
+    """
+    A read-only property that is computed once on first
+    access and then stored on the instance.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, inst, owner):
+        if inst is None:
+            return self
+        value = self.func(inst)
+        inst.__dict__[self.func.__name__] = value
+        return value
+
+
+class _contextAttribute(object):
+    """
+    An attribute that reads its value from the instance's MenuContext
+    until a value is assigned to it, like a normal attribute.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, inst, owner):
+        if inst is None:
+            return self
+        return getattr(inst.context, self.name)
+
+
+class MenuContext(object):
+    """
+    Information about a single right-click that is shared by
+    every Menu considered for building. Values are queried
+    lazily the first time they are accessed.
+    """
+
+    def __init__(self, menu, obj=None):
+        self.menuName = menu
+        self.object = obj
+
+    @_lazyProperty
+    def menu(self):
+        """ The parent popup menu """
+        import pymel.core as pm
+        return pm.ui.Menu(self.menuName)
+
+    @_lazyProperty
+    def hit(self):
+        """ Whether the mouse is currently over the object """
+        from maya import mel
+        return bool(mel.eval('dagObjectHit'))
+
+    @_lazyProperty
+    def panel(self):
+        """ The panel under the mouse pointer """
+        from maya import cmds
+        return cmds.getPanel(underPointer=True)
+
+    @_lazyProperty
+    def panelType(self):
+        """ The type of the panel under the mouse pointer """
+        from maya import cmds
+        return cmds.getPanel(typeOf=self.panel)
+
+    @_lazyProperty
+    def modifiers(self):
+        """ The modifier key bitmask, see `getModifiers` """
+        from maya import cmds
+        return cmds.getModifiers()
+
+    @_lazyProperty
+    def nodeTypes(self):
+        """
+        The set of node types of the object, including inherited types.
+        For transforms, the types of its shapes are included as well.
+        """
+        from maya import cmds
+        if not self.object or not cmds.objExists(self.object):
+            return frozenset()
+        nodes = [self.object]
+        nodes.extend(cmds.listRelatives(self.object, shapes=True, fullPath=True) or [])
+        result = set()
+        for node in nodes:
+            result.update(cmds.nodeType(node, inherited=True) or [])
+        return frozenset(result)
+
+
+class MenuRules(object):
+    """
+    Declarative conditions for when a Menu should be built.
+    Conditions that are None are not checked.
+
+    `panelTypes` - list of panel types, e.g. ['modelPanel']
+    `nodeTypes` - list of node types, matching the object or any of its
+        shapes, including inherited types, e.g. ['transform', 'nurbsCurve']
+    `hit` - True to require the mouse to be over an object, False to require it not to be
+    `modifiers` - the exact modifier key bitmask that must be pressed, see `getModifiers`
+    """
+
+    def __init__(self, panelTypes=None, nodeTypes=None, hit=None, modifiers=None):
+        self.panelTypes = frozenset(panelTypes) if panelTypes is not None else None
+        self.nodeTypes = frozenset(nodeTypes) if nodeTypes is not None else None
+        self.hit = hit
+        self.modifiers = modifiers
+
+    def __repr__(self):
+        return '{0}(panelTypes={1}, nodeTypes={2}, hit={3}, modifiers={4})'.format(
+            self.__class__.__name__, self.panelTypes, self.nodeTypes, self.hit, self.modifiers)
+
+    def matches(self, context, checkPanelType=True):
+        """
+        Return True if the given MenuContext matches all conditions.
+
+        Args:
+            context: A MenuContext for the current right-click
+            checkPanelType: When False, assume the panel type has already been matched
+        """
+        if checkPanelType and self.panelTypes is not None:
+            if context.panelType not in self.panelTypes:
+                return False
+        if self.hit is not None and self.hit != context.hit:
+            return False
+        if self.modifiers is not None and self.modifiers != context.modifiers:
+            return False
+        if self.nodeTypes is not None and self.nodeTypes.isdisjoint(context.nodeTypes):
+            return False
+        return True
+
+
+class MenuIndex(object):
+    """
+    A lookup table of Menu classes by panel type, used to quickly find
+    the menus that may apply to a right-click. Menus without rules are
+    kept in priority order alongside the indexed menus and are checked
+    using `shouldBuild` only.
+
+    The candidates for each panel type are kept merged and sorted as
+    menus are added and removed, so finding them on each right-click is
+    a single lookup, and registering a menu doesn't rebuild the index.
+    """
+
+    def __init__(self, entries=()):
+        """
+        Args:
+            entries: A list of (sortKey, cls) tuples for the initial menus
+        """
+        # sort keys and candidates for panel types without indexed menus,
+        # containing all menus without a panel type condition
+        self.defaultKeys = []
+        self.defaultCandidates = []
+        # map of panel type to sort keys and candidates, containing the
+        # default candidates and the menus indexed for that panel type
+        self.keysByPanelType = {}
+        self.candidatesByPanelType = {}
+        # the panel types each menu was indexed under, by sort key
+        self.panelTypesByKey = {}
+        for key, cls in entries:
+            self.add(key, cls)
+
+    @staticmethod
+    def _insert(keys, classes, key, cls):
+        index = bisect.bisect_right(keys, key)
+        keys.insert(index, key)
+        classes.insert(index, cls)
+
+    @staticmethod
+    def _remove(keys, classes, key):
+        index = bisect.bisect_left(keys, key)
+        del keys[index]
+        del classes[index]
+
+    def add(self, key, cls):
+        """
+        Add a Menu class to the index.
+
+        Args:
+            key: A sort key for the menu, lower keys are ordered first
+            cls: A Menu class
+        """
+        rules = cls.rules
+        panelTypes = rules.panelTypes if rules is not None else None
+        self.panelTypesByKey[key] = panelTypes
+        if panelTypes is None:
+            self._insert(self.defaultKeys, self.defaultCandidates, key, cls)
+            for panelType, keys in self.keysByPanelType.items():
+                self._insert(keys, self.candidatesByPanelType[panelType], key, cls)
+        else:
+            for panelType in panelTypes:
+                if panelType not in self.keysByPanelType:
+                    self.keysByPanelType[panelType] = self.defaultKeys[:]
+                    self.candidatesByPanelType[panelType] = self.defaultCandidates[:]
+                self._insert(self.keysByPanelType[panelType], self.candidatesByPanelType[panelType], key, cls)
+
+    def remove(self, key):
+        """
+        Remove the Menu class that was added with the given sort key.
+        """
+        panelTypes = self.panelTypesByKey.pop(key)
+        if panelTypes is None:
+            self._remove(self.defaultKeys, self.defaultCandidates, key)
+            for panelType, keys in self.keysByPanelType.items():
+                self._remove(keys, self.candidatesByPanelType[panelType], key)
+        else:
+            for panelType in panelTypes:
+                keys = self.keysByPanelType[panelType]
+                self._remove(keys, self.candidatesByPanelType[panelType], key)
+                if len(keys) == len(self.defaultKeys):
+                    # no menus are indexed for this panel type anymore
+                    del self.keysByPanelType[panelType]
+                    del self.candidatesByPanelType[panelType]
+
+    def getCandidates(self, context):
+        """
+        Yield the Menu classes whose rules match the given context,
+        and all menus without rules, ordered by priority.
+        Rules are evaluated lazily as candidates are consumed.
+        """
+        candidates = self.defaultCandidates
+        if self.candidatesByPanelType:
+            candidates = self.candidatesByPanelType.get(context.panelType, candidates)
+        for cls in candidates:
+            if cls.rules is None or cls.rules.matches(context, checkPanelType=False):
+                yield cls
 
 
 class Menu(object):
@@ -115,20 +473,43 @@ class Menu(object):
     considered for building.
 
     Menus have the following members available for use:
-        `self.menu` - the name of the parent popup menu
+        `self.menu` - the parent popup menu
         `self.object` - the name of the selected or hit object, if any
         `self.hit` - whether the mouse is currently over the object
+        `self.panel` - the panel under the mouse pointer
+        `self.panelType` - the type of the panel under the mouse pointer
+        `self.modifiers` - the modifier key bitmask
+        `self.context` - the MenuContext shared by all menus for this click
+
+    Set `rules` to a MenuRules instance to declare when the menu should be built.
+    Menus with rules are looked up by index, and `shouldBuild` is only
+    called once all rules have matched.
+
+    Members other than `self.object` are read from the shared context the first
+    time they are used, and can be assigned to like any other attribute.
     """
 
+    # optional MenuRules declaring when this menu should be built
+    rules = None
+
+    menu = _contextAttribute('menu')
+    hit = _contextAttribute('hit')
+    panel = _contextAttribute('panel')
+    panelType = _contextAttribute('panelType')
+    modifiers = _contextAttribute('modifiers')
+
     def __init__(self, menu, obj=None):
-        self.menu = pm.ui.Menu(menu)
+        context = _ACTIVE_CONTEXT
+        if context is None or context.menuName != menu or context.object != obj:
+            # not created by buildMenu, e.g. when building a menu manually
+            context = MenuContext(menu, obj)
+        self.context = context
         self.object = obj
-        self.hit = bool(pm.mel.dagObjectHit())
 
     def shouldBuild(self):
         """
         Override to implement custom logic for whether or not this
-        menu should be built
+        menu should be built. Prefer declaring `rules` when possible.
         """
         return True
 
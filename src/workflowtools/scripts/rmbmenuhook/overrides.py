@@ -0,0 +1,193 @@
+"""
+Generates the rmb hook overrides for the installed version of Maya.
+
+The original buildObjectMenuItemsNow.mel and dagMenuProc.mel scripts are
+copied with calls to the rmbmenuhook mel procedures injected at known
+anchor points. The result is cached on disk, keyed by Maya version and
+a hash of the source scripts, so it is only regenerated when they change.
+
+This module does not depend on Maya, so it can be used and tested
+with any sample mel inputs.
+"""
+
+import hashlib
+import os
+import re
+
+
+__all__ = [
+    'generateOverrides',
+    'getCachedOverridesPath',
+    'getOverridesCacheKey',
+    'injectBuildObjectMenuItemsNowHooks',
+    'injectDagMenuProcHooks',
+]
+
+
+# increment when the generated output changes, to invalidate cached overrides
+GENERATOR_VERSION = 1
+
+# the encoding used to read the original scripts and write the generated overrides,
+# undecodable bytes are passed through unchanged
+ENCODING = 'utf-8'
+
+# matches the call to dagMenuProc when nothing is hit but objects are selected,
+# followed by the else branch that the menu hook is inserted before
+BUILD_OBJECT_MENU_ANCHOR = re.compile(
+    r'(?P<call>dagMenuProc\s*\(\s*\$parentName\s*,[^;]*\)\s*;[^\n]*\n)'
+    r'(?P<space>\s*?)(?P<indent>[ \t]*)(?P<else>\}\s*else\b)')
+
+# matches where dagMenuProc starts building the default menu items
+DAG_MENU_PROC_START = re.compile(r'global\s+proc\s+dagMenuProc\s*\(')
+DAG_MENU_PROC_ANCHOR = re.compile(
+    r'if\s*\(\s*`popupMenu\s+-e\s+-exists\s+\$parent`\s*\)\s*\{[ \t]*\n'
+    r'(?P<indent>[ \t]*)setParent\s+-m\s+\$parent\s*;[ \t]*\n'
+    r'(?!\s*buildTraversalMM)')
+
+BUILD_OBJECT_MENU_HOOK = (
+    '{indent}// RMBHOOK CHANGES\n'
+    '{indent}}} else if (rmbmenuhook_buildMenu($parentName)) {{\n'
+    '{indent}\treturn;\n'
+    '{indent}// RMBHOOK END CHANGES\n'
+    '\n')
+
+DAG_MENU_PROC_HOOK = (
+    '\n'
+    '{indent}// RMBHOOK CHANGES\n'
+    '{indent}if (rmbmenuhook_buildMenuWithObject($parent, $object)) {{\n'
+    '{indent}\treturn;\n'
+    '{indent}}}\n'
+    '{indent}// RMBHOOK END CHANGES\n')
+
+HEADER = """/*
+	Generated overrides for Maya {version}, do not edit.
+
+	These overridden functions have hooks added that make
+	calls to the rmb menu manager.
+
+	Source scripts:
+		{buildObjectMenuItemsNowPath}
+		{dagMenuProcPath}
+*/
+
+
+"""
+
+
+def injectBuildObjectMenuItemsNowHooks(source):
+    """
+    Return the source of buildObjectMenuItemsNow.mel with a call to
+    rmbmenuhook_buildMenu added for when nothing is hit or selected.
+
+    Raises:
+        ValueError if the anchor point could not be found
+    """
+    def replace(match):
+        hook = BUILD_OBJECT_MENU_HOOK.format(indent=match.group('indent'))
+        return match.group('call') + match.group('space') + hook + match.group('indent') + match.group('else')
+
+    result, count = BUILD_OBJECT_MENU_ANCHOR.subn(replace, source)
+    if not count:
+        raise ValueError('could not find rmb hook anchor in buildObjectMenuItemsNow')
+    return result
+
+
+def injectDagMenuProcHooks(source):
+    """
+    Return the source of dagMenuProc.mel with a call to
+    rmbmenuhook_buildMenuWithObject added before the default
+    menu items are built.
+
+    Raises:
+        ValueError if the anchor point could not be found
+    """
+    procMatch = DAG_MENU_PROC_START.search(source)
+    if not procMatch:
+        raise ValueError('could not find global proc dagMenuProc')
+    match = DAG_MENU_PROC_ANCHOR.search(source, procMatch.end())
+    if not match:
+        raise ValueError('could not find rmb hook anchor in dagMenuProc')
+    hook = DAG_MENU_PROC_HOOK.format(indent=match.group('indent'))
+    return source[:match.end()] + hook + source[match.end():]
+
+
+def generateOverrides(buildObjectMenuItemsNowSource, dagMenuProcSource, version,
+                      buildObjectMenuItemsNowPath='', dagMenuProcPath=''):
+    """
+    Return the contents of a mel script that overrides buildObjectMenuItemsNow
+    and dagMenuProc with the rmb hooks added.
+
+    Args:
+        buildObjectMenuItemsNowSource: A string containing the original buildObjectMenuItemsNow.mel
+        dagMenuProcSource: A string containing the original dagMenuProc.mel
+        version: A string Maya version, used only for the header
+        buildObjectMenuItemsNowPath: An optional path to the original script, used only for the header
+        dagMenuProcPath: An optional path to the original script, used only for the header
+
+    Raises:
+        ValueError if any anchor point could not be found
+    """
+    header = HEADER.format(
+        version=version,
+        buildObjectMenuItemsNowPath=buildObjectMenuItemsNowPath or 'buildObjectMenuItemsNow.mel',
+        dagMenuProcPath=dagMenuProcPath or 'dagMenuProc.mel')
+    return '{0}{1}\n\n\n{2}\n'.format(
+        header,
+        injectBuildObjectMenuItemsNowHooks(buildObjectMenuItemsNowSource).rstrip(),
+        injectDagMenuProcHooks(dagMenuProcSource).rstrip())
+
+
+def getOverridesCacheKey(version, *sources):
+    """
+    Return a string that uniquely identifies overrides generated
+    for a Maya version from the given source strings.
+    """
+    sha = hashlib.sha1()
+    sha.update(str(GENERATOR_VERSION).encode(ENCODING))
+    for source in sources:
+        sha.update(b'\0')
+        sha.update(source.encode(ENCODING, 'surrogateescape'))
+    return '{0}_{1}'.format(re.sub(r'\W', '_', version), sha.hexdigest()[:16])
+
+
+def _readFile(path):
+    with open(path, 'r', encoding=ENCODING, errors='surrogateescape') as fp:
+        return fp.read()
+
+
+def _writeFile(path, contents):
+    with open(path, 'w', encoding=ENCODING, errors='surrogateescape') as fp:
+        fp.write(contents)
+
+
+def getCachedOverridesPath(cacheDir, version, buildObjectMenuItemsNowPath, dagMenuProcPath):
+    """
+    Return the path to a generated overrides script for the given
+    source scripts, generating it if a cached copy does not exist.
+
+    Args:
+        cacheDir: A string path to the directory where generated scripts are stored
+        version: A string Maya version
+        buildObjectMenuItemsNowPath: A string path to the original buildObjectMenuItemsNow.mel
+        dagMenuProcPath: A string path to the original dagMenuProc.mel
+
+    Raises:
+        ValueError if any anchor point could not be found
+    """
+    buildObjectMenuItemsNowSource = _readFile(buildObjectMenuItemsNowPath)
+    dagMenuProcSource = _readFile(dagMenuProcPath)
+    key = getOverridesCacheKey(version, buildObjectMenuItemsNowSource, dagMenuProcSource)
+    path = os.path.join(cacheDir, 'rmbmenuhookOverrides_{0}.mel'.format(key))
+    if os.path.isfile(path):
+        return path
+
+    contents = generateOverrides(
+        buildObjectMenuItemsNowSource, dagMenuProcSource, version,
+        buildObjectMenuItemsNowPath, dagMenuProcPath)
+    if not os.path.isdir(cacheDir):
+        os.makedirs(cacheDir)
+    # write to a temp file first so that a partially written script is never sourced
+    tempPath = '{0}.{1}.tmp'.format(path, os.getpid())
+    _writeFile(tempPath, contents)
+    os.replace(tempPath, path)
+    return path
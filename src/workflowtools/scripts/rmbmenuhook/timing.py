@@ -0,0 +1,185 @@
+"""
+Latency instrumentation for the rmb hooks.
+
+Each right-click dispatch is timed by phase and by menu class, and the
+most recent samples are kept in memory as rolling latency histograms.
+
+Phases:
+    `mel` - the full rmbmenuhookBuildMenu bridge command called by the mel hooks
+    `dispatch` - the full rmbmenuhook.buildMenu call
+    `init` - constructing a Menu instance
+    `shouldBuild` - a Menu's shouldBuild call
+    `build` - a Menu's build call
+
+Example:
+
+import rmbmenuhook
+rmbmenuhook.getTimingStats()['build']
+rmbmenuhook.dumpTimingStats('/tmp/rmbmenuhook_timing.json')
+"""
+
+import collections
+import contextlib
+import json
+import time
+
+
+__all__ = [
+    'dumpTimingStats',
+    'getTimingStats',
+    'isTimingEnabled',
+    'LatencyHistogram',
+    'recordTiming',
+    'resetTimingStats',
+    'setTimingEnabled',
+    'timed',
+]
+
+
+# the name used for timings that are not specific to a menu class
+ALL_MENUS = '*'
+
+# the number of recent samples kept for each phase and menu class
+MAX_SAMPLES = 500
+
+# upper bounds of the histogram buckets in milliseconds
+BUCKET_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+# whether timings are currently being recorded
+ENABLED = True
+
+# LatencyHistograms indexed by (phase, name)
+HISTOGRAMS = {}
+
+
+class LatencyHistogram(object):
+    """
+    Keeps a rolling window of recent latency samples and
+    summarizes them as a histogram with percentiles.
+    """
+
+    def __init__(self, maxSamples=MAX_SAMPLES):
+        # recent samples in seconds
+        self.samples = collections.deque(maxlen=maxSamples)
+        # total number of samples ever recorded
+        self.totalCount = 0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.totalCount += 1
+
+    def getSummary(self):
+        """
+        Return a dict summarizing the recent samples, in milliseconds.
+        """
+        samplesMs = sorted(s * 1000.0 for s in self.samples)
+        count = len(samplesMs)
+        if not count:
+            return {'count': 0, 'totalCount': self.totalCount}
+
+        def percentile(p):
+            return samplesMs[min(count - 1, int(p * count))]
+
+        buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        bucketIndex = 0
+        for value in samplesMs:
+            while bucketIndex < len(BUCKET_BOUNDS_MS) and value > BUCKET_BOUNDS_MS[bucketIndex]:
+                bucketIndex += 1
+            buckets[bucketIndex] += 1
+        bounds = [str(b) for b in BUCKET_BOUNDS_MS] + ['inf']
+
+        return {
+            'count': count,
+            'totalCount': self.totalCount,
+            'min': samplesMs[0],
+            'max': samplesMs[-1],
+            'mean': sum(samplesMs) / count,
+            'p50': percentile(0.5),
+            'p90': percentile(0.9),
+            'p99': percentile(0.99),
+            'histogram': collections.OrderedDict(zip(bounds, buckets)),
+        }
+
+
+def isTimingEnabled():
+    """
+    Return True if rmb menu timings are being recorded
+    """
+    return ENABLED
+
+
+def setTimingEnabled(enabled):
+    """
+    Enable or disable recording rmb menu timings.
+    Existing timings are kept until `resetTimingStats` is called.
+    """
+    global ENABLED
+    ENABLED = bool(enabled)
+
+
+def recordTiming(phase, name, seconds):
+    """
+    Record a latency sample for a phase and menu class name.
+
+    Args:
+        phase: A string name of the phase that was timed
+        name: A string name of the menu class, or None for the whole phase
+        seconds: A float duration of the phase
+    """
+    if not ENABLED:
+        return
+    key = (phase, name or ALL_MENUS)
+    histogram = HISTOGRAMS.get(key)
+    if histogram is None:
+        histogram = HISTOGRAMS[key] = LatencyHistogram()
+    histogram.add(seconds)
+
+
+@contextlib.contextmanager
+def timed(phase, name=None):
+    """
+    Context manager that records the duration of its block.
+    Does nothing when timing is disabled.
+    """
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recordTiming(phase, name, time.perf_counter() - start)
+
+
+def getTimingStats(phase=None):
+    """
+    Return a summary of all recorded timings.
+
+    Args:
+        phase: An optional string phase name to return only that phase's timings
+
+    Returns:
+        A dict of {phase: {name: summary}}, or {name: summary} if a phase was given.
+        Summaries are in milliseconds, see `LatencyHistogram.getSummary`.
+    """
+    result = {}
+    for (p, name), histogram in sorted(HISTOGRAMS.items()):
+        result.setdefault(p, {})[name] = histogram.getSummary()
+    if phase is not None:
+        return result.get(phase, {})
+    return result
+
+
+def dumpTimingStats(filePath):
+    """
+    Write a summary of all recorded timings to a json file.
+    """
+    with open(filePath, 'w') as fp:
+        json.dump(getTimingStats(), fp, indent=2)
+
+
+def resetTimingStats():
+    """
+    Clear all recorded timings.
+    """
+    HISTOGRAMS.clear()
@@ -1,9 +1,5 @@
-import rmbmenuhook
-import quickmenus
+import workflowtoolsstartup
 
-# enable RMB Marking Menu Hook
-rmbmenuhook.enable()
-
-# enable Quick Menus
-quickmenus.qmenus.enable()
-quickmenus.fmenus.enable()
+# enable RMB Marking Menu Hook and Quick Menus once Maya is idle,
+# call workflowtoolsstartup.enable() instead to enable them immediately
+workflowtoolsstartup.enableDeferred()
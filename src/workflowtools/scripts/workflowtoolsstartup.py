@@ -0,0 +1,143 @@
+"""
+Startup utils for enabling the workflow tools.
+
+Importing the tools sources several mel scripts and registers menus,
+which adds noticeably to Maya's startup time.
+`enableDeferred` postpones all of that until Maya is first idle, or until
+a quick menu hotkey is first pressed, whichever happens first.
+
+This module only depends on maya.utils, so importing it is cheap.
+
+Example userSetup.py:
+
+import workflowtoolsstartup
+workflowtoolsstartup.enableDeferred()
+
+# later, to see where startup time was spent
+workflowtoolsstartup.printStartupTimes()
+"""
+
+import collections
+import importlib
+import logging
+import time
+
+import maya.utils
+
+
+__all__ = [
+    'enable',
+    'enableDeferred',
+    'ensureEnabled',
+    'getStartupTimes',
+    'isEnabled',
+    'printStartupTimes',
+]
+
+
+LOG = logging.getLogger('workflowtools')
+LOG.setLevel(logging.INFO)
+
+# modules to import when enabling, timed individually in this order so that
+# the cost of shared dependencies is not attributed to the tools using them.
+# tuples of (module name, is required)
+STARTUP_MODULES = [
+    ('pymetanode', False),
+    ('rmbmenuhook', True),
+    ('resetter', False),
+    ('quickmenus', True),
+]
+
+# whether the tools have been enabled
+ENABLED = False
+
+# whether enabling has been deferred and is still waiting to run
+PENDING = False
+
+# durations in seconds of each import and enable step, indexed by name
+STARTUP_TIMES = collections.OrderedDict()
+
+
+def _timed(name, func, *args):
+    start = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        STARTUP_TIMES[name] = time.perf_counter() - start
+
+
+def isEnabled():
+    """
+    Return True if the tools have been enabled
+    """
+    return ENABLED
+
+
+def enable():
+    """
+    Import and enable the RMB Marking Menu Hook and Quick Menus immediately.
+    Does nothing if they are already enabled.
+    """
+    global ENABLED, PENDING
+    if ENABLED:
+        return
+    ENABLED = True
+    PENDING = False
+
+    start = time.perf_counter()
+    for moduleName, isRequired in STARTUP_MODULES:
+        try:
+            _timed('import ' + moduleName, importlib.import_module, moduleName)
+        except ImportError:
+            if isRequired:
+                raise
+            LOG.debug('Optional module not available: {0}'.format(moduleName))
+
+    import rmbmenuhook
+    import quickmenus
+
+    # enable RMB Marking Menu Hook
+    _timed('rmbmenuhook.enable', rmbmenuhook.enable)
+
+    # enable Quick Menus
+    _timed('quickmenus.qmenus.enable', quickmenus.qmenus.enable)
+    _timed('quickmenus.fmenus.enable', quickmenus.fmenus.enable)
+
+    STARTUP_TIMES['total'] = time.perf_counter() - start
+
+
+def enableDeferred():
+    """
+    Enable the RMB Marking Menu Hook and Quick Menus once Maya is idle.
+    """
+    global PENDING
+    if ENABLED or PENDING:
+        return
+    PENDING = True
+    maya.utils.executeDeferred(ensureEnabled)
+
+
+def ensureEnabled():
+    """
+    Enable the tools now if enabling was deferred and hasn't happened yet.
+    Called when Maya is first idle, and before building quick menus.
+    """
+    if PENDING:
+        enable()
+
+
+def getStartupTimes():
+    """
+    Return an ordered dict of the duration in seconds of each import
+    and enable step, and the total, from the last time the tools were enabled.
+    """
+    return STARTUP_TIMES.copy()
+
+
+def printStartupTimes():
+    """
+    Log the duration of each import and enable step
+    """
+    LOG.info('Workflow tools startup times:')
+    for name, seconds in STARTUP_TIMES.items():
+        LOG.info('   {0}: {1:.1f} ms'.format(name, seconds * 1000.0))
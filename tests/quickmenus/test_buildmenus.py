@@ -0,0 +1,103 @@
+"""
+Tests for building and destroying quick menus on key press, using a mock of maya.cmds.
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'src', 'workflowtools', 'scripts')
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+
+_MODULES_PATCH = mock.patch.dict(sys.modules)
+
+
+def setUpModule():
+    _MODULES_PATCH.start()
+    for name in ('maya', 'maya.cmds', 'maya.mel', 'maya.utils', 'maya.api', 'maya.api.OpenMaya', 'pymetanode'):
+        try:
+            __import__(name)
+        except ImportError:
+            sys.modules[name] = mock.MagicMock()
+
+
+def tearDownModule():
+    _MODULES_PATCH.stop()
+
+
+class MockCmds(object):
+    """
+    Keeps track of which popup menus exist.
+    """
+
+    def __init__(self):
+        self.popupMenus = set()
+
+    def popupMenu(self, name, q=False, ex=False, **kwargs):
+        if q:
+            return name in self.popupMenus
+        self.popupMenus.add(name)
+        return name
+
+    def deleteUI(self, name):
+        self.popupMenus.discard(name)
+
+    def getPanel(self, underPointer=False, typeOf=None):
+        return 'modelPanel' if typeOf else 'modelPanel4'
+
+    def getModifiers(self):
+        return 0
+
+    def __getattr__(self, name):
+        return mock.Mock()
+
+
+class TestBuildMenus(unittest.TestCase):
+
+    def setUp(self):
+        from quickmenus import core, utils
+        self.core = core
+        cmds = MockCmds()
+        for module in (core, utils):
+            patcher = mock.patch.object(module, 'cmds', cmds)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        class TestMenu(core.MarkingMenu):
+            def __init__(self):
+                super().__init__()
+                self.popupMenuId = 'QuickMenus_TestMenu'
+
+        patcher = mock.patch.multiple(core, REGISTERED_MENUS={'test': [TestMenu]}, MENU_POOL={}, ACTIVE_MENUS=[])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def press(self, show):
+        self.core.buildMenus('test')
+        menu = self.core.ACTIVE_MENUS[0]
+        if show:
+            menu.onMenuWillShow(menu.menu, 'viewPanes')
+        return menu
+
+    def test_pressTwice(self):
+        menu = self.press(show=True)
+        self.assertTrue(self.core.destroyMenus('test'))
+        self.assertFalse(menu.wasInvoked)
+        # the pooled menu is reused, but must not report the previous press
+        self.assertIs(self.press(show=False), menu)
+        self.assertFalse(menu.hasBuiltItems)
+        self.assertFalse(self.core.destroyMenus('test'))
+        self.assertIs(self.press(show=True), menu)
+        self.assertTrue(self.core.destroyMenus('test'))
+
+    def test_pressAfterSkippedRelease(self):
+        menu = self.press(show=True)
+        # the release was skipped, and the popup was removed by maya
+        menu.destroy()
+        self.assertIs(self.press(show=False), menu)
+        self.assertFalse(self.core.destroyMenus('test'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests for finding the model panels that display changes apply to, using a mock of maya.cmds.
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'src', 'workflowtools', 'scripts')
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+
+# the top level control of each model panel in the mock scene, or None if hidden
+PANEL_CONTROLS = {
+    'modelPanel1': 'MainPane|viewPanes|modelPanel1',
+    'modelPanel2': 'MainPane|viewPanes|modelPanel2',
+    'modelPanel3': 'modelPanel3Window|TearOffPane|modelPanel3',
+    'modelPanel4': None,
+}
+
+_MODULES_PATCH = mock.patch.dict(sys.modules)
+
+
+def setUpModule():
+    _MODULES_PATCH.start()
+    for name in ('maya', 'maya.cmds', 'maya.mel', 'maya.utils', 'maya.api', 'maya.api.OpenMaya', 'pymetanode'):
+        try:
+            __import__(name)
+        except ImportError:
+            sys.modules[name] = mock.MagicMock()
+
+
+def tearDownModule():
+    _MODULES_PATCH.stop()
+
+
+def getPanel(type=None, visiblePanels=False):
+    if visiblePanels:
+        return [p for p, control in PANEL_CONTROLS.items() if control]
+    return list(PANEL_CONTROLS)
+
+
+def panel(name, q=False, control=False):
+    return PANEL_CONTROLS[name]
+
+
+class TestGetTargetPanels(unittest.TestCase):
+
+    def setUp(self):
+        from quickmenus import display
+        self.display = display
+        cmds = mock.Mock()
+        cmds.getPanel.side_effect = getPanel
+        cmds.panel.side_effect = panel
+        patcher = mock.patch.object(display, 'cmds', cmds)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_modes(self):
+        getTargetPanels = self.display.getTargetPanels
+        self.assertEqual(getTargetPanels('modelPanel1', 'panel'), ['modelPanel1'])
+        self.assertEqual(getTargetPanels('modelPanel1', 'group'), ['modelPanel1', 'modelPanel2'])
+        self.assertEqual(getTargetPanels('modelPanel3', 'group'), ['modelPanel3'])
+        self.assertEqual(getTargetPanels('modelPanel1', 'visible'), ['modelPanel1', 'modelPanel2', 'modelPanel3'])
+        self.assertEqual(getTargetPanels('modelPanel1', 'all'), list(PANEL_CONTROLS))
+
+    def test_groupWithoutLayout(self):
+        self.assertEqual(self.display.getTargetPanels('modelPanel4', 'group'), ['modelPanel4'])
+
+
+if __name__ == '__main__':
+    unittest.main()
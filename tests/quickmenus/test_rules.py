@@ -0,0 +1,106 @@
+"""
+Tests for finding the members of live quick select sets, using a mock of maya.cmds.
+"""
+
+import fnmatch
+import os
+import re
+import sys
+import unittest
+from unittest import mock
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'src', 'workflowtools', 'scripts')
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+
+# the node types in the mock scene, and the types they inherit from
+NODE_TYPES = {
+    'transform': {'transform', 'dagNode'},
+    'joint': {'joint', 'transform', 'dagNode'},
+    'nurbsCurve': {'nurbsCurve', 'dagNode'},
+}
+
+# the nodes in the mock scene, by full name
+NODES = {
+    '|arm_ctl': 'transform',
+    '|arm_ctl|arm_ctlShape': 'nurbsCurve',
+    '|rig:root': 'transform',
+    '|rig:root|rig:arm_ctl': 'transform',
+    '|rig:root|rig:arm_ctl|rig:arm_ctlShape': 'nurbsCurve',
+    '|rig:root|rig:leg_ctl': 'joint',
+}
+
+_MODULES_PATCH = mock.patch.dict(sys.modules)
+
+
+def setUpModule():
+    _MODULES_PATCH.start()
+    for name in ('maya', 'maya.cmds', 'maya.mel', 'maya.utils', 'maya.api', 'maya.api.OpenMaya', 'pymetanode'):
+        try:
+            __import__(name)
+        except ImportError:
+            sys.modules[name] = mock.MagicMock()
+
+
+def tearDownModule():
+    _MODULES_PATCH.stop()
+
+
+def matchesName(node, name):
+    if '|' in name:
+        return node == name
+    # like ls, '*' does not match across namespaces
+    regex = fnmatch.translate(name).replace('.*', '[^:]*')
+    return re.match(regex, node.split('|')[-1]) is not None
+
+
+def ls(names=None, long=False, type=None, dag=False, noIntermediate=False):
+    nodes = list(NODES)
+    if names is not None:
+        if not isinstance(names, list):
+            names = [names]
+        nodes = [n for n in nodes if any(matchesName(n, name) for name in names)]
+        if dag:
+            nodes = [n for n in NODES if any(n == m or n.startswith(m + '|') for m in nodes)]
+    if type:
+        nodes = [n for n in nodes if type in NODE_TYPES[NODES[n]]]
+    return nodes
+
+
+def listRelatives(nodes, parent=False, fullPath=False):
+    return [n.rpartition('|')[0] for n in nodes]
+
+
+class TestRunQuery(unittest.TestCase):
+
+    def setUp(self):
+        from quickmenus.fmenus import rules
+        self.rules = rules
+        cmds = mock.Mock()
+        cmds.ls.side_effect = ls
+        cmds.listRelatives.side_effect = listRelatives
+        patcher = mock.patch.object(rules, 'cmds', cmds)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_pattern(self):
+        self.assertEqual(self.rules._runQuery(None, None, None, ['*_ctl']), ['|arm_ctl'])
+        self.assertEqual(self.rules._runQuery(None, None, None, ['rig:*_ctl']),
+                         ['|rig:root|rig:arm_ctl', '|rig:root|rig:leg_ctl'])
+
+    def test_patternWithRoot(self):
+        self.assertEqual(self.rules._runQuery(None, None, '|rig:root', ['*_ctl']), [])
+        self.assertEqual(self.rules._runQuery(None, None, '|rig:root', ['*:arm_ctl']), ['|rig:root|rig:arm_ctl'])
+        self.assertEqual(self.rules._runQuery('joint', None, '|rig:root', ['rig:*_ctl']), ['|rig:root|rig:leg_ctl'])
+
+    def test_patternWithShape(self):
+        self.assertEqual(self.rules._runQuery(None, 'nurbsCurve', None, ['*_ctl']), ['|arm_ctl'])
+        self.assertEqual(self.rules._runQuery(None, 'nurbsCurve', None, ['*:*_ctl']), ['|rig:root|rig:arm_ctl'])
+
+    def test_namespaceRule(self):
+        queries = self.rules.compileRules([{'pattern': '*_ctl', 'namespace': 'rig', 'shape': 'nurbsCurve'}])
+        self.assertEqual(queries, [(None, 'nurbsCurve', None, ['rig:*_ctl'])])
+        self.assertEqual(self.rules._runQuery(*queries[0]), ['|rig:root|rig:arm_ctl'])
+
+
+if __name__ == '__main__':
+    unittest.main()
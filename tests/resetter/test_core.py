@@ -0,0 +1,84 @@
+"""
+Tests for resetting and removing defaults, using a mock of maya.cmds.
+"""
+
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'src', 'workflowtools', 'scripts')
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+
+# the nodes that the mock cmds.ls returns when given no names, like maya does
+ALL_NODES = ['|persp', '|top', '|ctl']
+
+_MODULES_PATCH = mock.patch.dict(sys.modules)
+
+
+def setUpModule():
+    _MODULES_PATCH.start()
+    try:
+        import maya.cmds
+    except ImportError:
+        maya = types.ModuleType('maya')
+        maya.cmds = types.ModuleType('maya.cmds')
+        sys.modules['maya'] = maya
+        sys.modules['maya.cmds'] = maya.cmds
+    sys.modules.pop('pymel.core', None)
+
+
+def tearDownModule():
+    _MODULES_PATCH.stop()
+
+
+def ls(*args, **kwargs):
+    if kwargs.get('sl') or kwargs.get('readOnly'):
+        return []
+    if not args or not args[0]:
+        return ALL_NODES[:]
+    names = args[0]
+    return [n for n in ALL_NODES if n in names]
+
+
+class TestReset(unittest.TestCase):
+
+    def setUp(self):
+        from resetter import backend, core
+        self.core = core
+        self.cmds = mock.Mock()
+        self.cmds.ls.side_effect = ls
+        self.cmds.objExists.return_value = True
+        self.cmds.getAttr.return_value = True
+        self.cmds.lockNode.return_value = [False]
+        self.cmds.channelBox.return_value = None
+        for module in (backend, core):
+            patcher = mock.patch.object(module, 'cmds', self.cmds)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(core.clearResetSnapshots)
+
+    def test_resetEmptyList(self):
+        self.core.reset([])
+        self.cmds.setAttr.assert_not_called()
+        self.assertEqual(self.core.getResetSnapshots(), [])
+
+    def test_resetNodes(self):
+        self.cmds.getAttr.side_effect = lambda plug, **kwargs: True if kwargs.get('settable') else 5.0
+        self.core.reset(['|ctl'], useCBSelection=False)
+        plugs = set(c[0][0] for c in self.cmds.setAttr.call_args_list)
+        self.assertEqual(plugs, set('|ctl.' + i + j for i in 'trs' for j in 'xyz'))
+
+    def test_removeDefaultsEmptyList(self):
+        self.assertEqual(self.core.removeDefaults([]), [])
+        self.cmds.deleteAttr.assert_not_called()
+        self.cmds.warning.assert_not_called()
+
+    def test_removeDefaultsReturnsNames(self):
+        self.assertEqual(self.core.removeDefaults(['|ctl']), ['|ctl'])
+        self.cmds.deleteAttr.assert_called_once_with('|ctl.' + self.core.DEFAULTS_ATTR)
+
+
+if __name__ == '__main__':
+    unittest.main()
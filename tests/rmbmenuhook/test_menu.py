@@ -0,0 +1,98 @@
+"""
+Tests for registering menus and finding the candidates for a right-click.
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'src', 'workflowtools', 'scripts')
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+
+from rmbmenuhook import menu
+
+
+class ModelMenu(menu.Menu):
+    rules = menu.MenuRules(panelTypes=['modelPanel'])
+
+
+class OutlinerMenu(menu.Menu):
+    rules = menu.MenuRules(panelTypes=['outlinerPanel'])
+
+
+class AnyPanelMenu(menu.Menu):
+    rules = menu.MenuRules(hit=True)
+
+
+class UnruledMenu(menu.Menu):
+    pass
+
+
+class Context(object):
+
+    def __init__(self, panelType):
+        self.panelType = panelType
+        self.hit = True
+
+
+class TestMenuIndex(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.multiple(
+            menu, REGISTERED_MENUS={}, _SORTED_KEYS=[], _SORTED_CLASSES=[], _MENU_KEYS={}, _MENU_INDEX=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def getCandidates(self, panelType):
+        return list(menu.getMenuIndex().getCandidates(Context(panelType)))
+
+    def assertMatchesNewIndex(self):
+        newIndex = menu.MenuIndex(zip(menu._SORTED_KEYS, menu._SORTED_CLASSES))
+        for panelType in ('modelPanel', 'outlinerPanel', 'scriptedPanel'):
+            self.assertEqual(self.getCandidates(panelType), list(newIndex.getCandidates(Context(panelType))))
+
+    def test_candidatesByPriority(self):
+        menu.registerMenu('unruled', UnruledMenu, 0)
+        menu.registerMenu('model', ModelMenu, 10)
+        menu.registerMenu('any', AnyPanelMenu, 5)
+        self.assertEqual(self.getCandidates('modelPanel'), [ModelMenu, AnyPanelMenu, UnruledMenu])
+        self.assertEqual(self.getCandidates('outlinerPanel'), [AnyPanelMenu, UnruledMenu])
+
+    def test_registerUpdatesIndex(self):
+        menu.registerMenu('model', ModelMenu)
+        index = menu.getMenuIndex()
+        menu.registerMenu('unruled', UnruledMenu, 5)
+        menu.registerMenu('outliner', OutlinerMenu, 10)
+        menu.registerMenu('any', AnyPanelMenu, -5)
+        self.assertIs(menu.getMenuIndex(), index)
+        self.assertEqual(self.getCandidates('outlinerPanel'), [OutlinerMenu, UnruledMenu, AnyPanelMenu])
+        self.assertMatchesNewIndex()
+
+    def test_unregisterUpdatesIndex(self):
+        menu.registerMenu('model', ModelMenu)
+        menu.registerMenu('outliner', OutlinerMenu)
+        menu.registerMenu('unruled', UnruledMenu)
+        index = menu.getMenuIndex()
+        menu.unregisterMenu('model')
+        menu.unregisterMenu('unruled')
+        self.assertIs(menu.getMenuIndex(), index)
+        self.assertEqual(self.getCandidates('modelPanel'), [])
+        self.assertNotIn('modelPanel', index.candidatesByPanelType)
+        self.assertMatchesNewIndex()
+
+    def test_reregisterKeepsIndex(self):
+        # quick menus register and unregister their rmb menu on each key press
+        menu.registerMenu('any', AnyPanelMenu, 5)
+        index = menu.getMenuIndex()
+        for i in range(3):
+            menu.registerMenu('model', ModelMenu, 10)
+            self.assertEqual(self.getCandidates('modelPanel'), [ModelMenu, AnyPanelMenu])
+            menu.unregisterMenu('model')
+            self.assertEqual(self.getCandidates('modelPanel'), [AnyPanelMenu])
+        self.assertIs(menu.getMenuIndex(), index)
+        self.assertMatchesNewIndex()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Tests for generating the rmb hook overrides from the original Maya scripts.
+
+The fixtures are trimmed copies of buildObjectMenuItemsNow.mel and dagMenuProc.mel
+from several Maya versions, along with the expected hooked result of each.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, 'src', 'workflowtools', 'scripts')
+sys.path.insert(0, os.path.abspath(SCRIPTS_DIR))
+
+from rmbmenuhook import overrides
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+VERSIONS = ['2011', '2017', '2022', '2025']
+
+
+def getFixturePath(version, name):
+    return os.path.join(FIXTURES_DIR, 'maya{0}'.format(version), name)
+
+
+def readFixture(version, name):
+    with open(getFixturePath(version, name), 'r', encoding='utf-8') as fp:
+        return fp.read()
+
+
+class TestInjectHooks(unittest.TestCase):
+
+    def test_buildObjectMenuItemsNow(self):
+        for version in VERSIONS:
+            with self.subTest(version=version):
+                result = overrides.injectBuildObjectMenuItemsNowHooks(
+                    readFixture(version, 'buildObjectMenuItemsNow.mel'))
+                self.assertEqual(result, readFixture(version, 'buildObjectMenuItemsNow_hooked.mel'))
+
+    def test_dagMenuProc(self):
+        for version in VERSIONS:
+            with self.subTest(version=version):
+                result = overrides.injectDagMenuProcHooks(readFixture(version, 'dagMenuProc.mel'))
+                self.assertEqual(result, readFixture(version, 'dagMenuProc_hooked.mel'))
+
+    def test_dagMenuProcSkipsTraversalMenu(self):
+        # the traversal marking menu has the same popupMenu/setParent lines, but must not be hooked
+        result = overrides.injectDagMenuProcHooks(readFixture('2022', 'dagMenuProc.mel'))
+        self.assertEqual(result.count('RMBHOOK CHANGES'), 1)
+        self.assertLess(result.index('buildTraversalMM'), result.index('RMBHOOK CHANGES'))
+
+    def test_dagMenuProcIgnoresMatchesBeforeProc(self):
+        source = readFixture('2022', 'dagMenuProc.mel')
+        start = source.index('global proc dagMenuProc')
+        anchor = 'if (`popupMenu -e -exists $parent`) {\n\tsetParent -m $parent;\n'
+        result = overrides.injectDagMenuProcHooks(source[:start] + anchor + source[start:])
+        self.assertTrue(result.startswith(source[:start] + anchor))
+        self.assertEqual(result.count('RMBHOOK CHANGES'), 1)
+
+    def test_missingBuildObjectMenuItemsNowAnchor(self):
+        source = readFixture('2022', 'buildObjectMenuItemsNow.mel').replace('dagMenuProc(', 'otherMenuProc(')
+        with self.assertRaises(ValueError):
+            overrides.injectBuildObjectMenuItemsNowHooks(source)
+
+    def test_missingDagMenuProc(self):
+        source = readFixture('2022', 'dagMenuProc.mel').replace('global proc dagMenuProc', 'global proc otherMenuProc')
+        with self.assertRaises(ValueError):
+            overrides.injectDagMenuProcHooks(source)
+
+    def test_missingDagMenuProcAnchor(self):
+        source = readFixture('2022', 'dagMenuProc.mel').replace('setParent -m $parent;', 'setParent $parent;')
+        with self.assertRaises(ValueError):
+            overrides.injectDagMenuProcHooks(source)
+
+
+class TestGenerateOverrides(unittest.TestCase):
+
+    def test_generateOverrides(self):
+        result = overrides.generateOverrides(
+            readFixture('2025', 'buildObjectMenuItemsNow.mel'),
+            readFixture('2025', 'dagMenuProc.mel'),
+            '2025')
+        self.assertIn('Maya 2025', result)
+        self.assertIn(readFixture('2025', 'buildObjectMenuItemsNow_hooked.mel').rstrip(), result)
+        self.assertIn(readFixture('2025', 'dagMenuProc_hooked.mel').rstrip(), result)
+
+    def test_cacheKey(self):
+        key = overrides.getOverridesCacheKey('2025', 'a', 'b')
+        self.assertEqual(key, overrides.getOverridesCacheKey('2025', 'a', 'b'))
+        self.assertNotEqual(key, overrides.getOverridesCacheKey('2024', 'a', 'b'))
+        self.assertNotEqual(key, overrides.getOverridesCacheKey('2025', 'ab', ''))
+
+
+class TestCachedOverridesPath(unittest.TestCase):
+
+    def setUp(self):
+        self.cacheDir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cacheDir)
+
+    def getCachedPath(self, version):
+        return overrides.getCachedOverridesPath(
+            os.path.join(self.cacheDir, 'overrides'), version,
+            getFixturePath(version, 'buildObjectMenuItemsNow.mel'),
+            getFixturePath(version, 'dagMenuProc.mel'))
+
+    def test_generatesOnce(self):
+        path = self.getCachedPath('2022')
+        self.assertTrue(os.path.isfile(path))
+        with open(path, 'r', encoding='utf-8') as fp:
+            self.assertIn('rmbmenuhook_buildMenuWithObject', fp.read())
+        mtime = os.path.getmtime(path)
+        self.assertEqual(self.getCachedPath('2022'), path)
+        self.assertEqual(os.path.getmtime(path), mtime)
+        self.assertEqual(os.listdir(os.path.dirname(path)), [os.path.basename(path)])
+
+    def test_keyedBySource(self):
+        self.assertNotEqual(self.getCachedPath('2022'), self.getCachedPath('2025'))
+
+    def test_nonUtf8Source(self):
+        # scripts in other encodings are passed through unchanged
+        srcPath = os.path.join(self.cacheDir, 'buildObjectMenuItemsNow.mel')
+        with open(getFixturePath('2022', 'buildObjectMenuItemsNow.mel'), 'rb') as fp:
+            data = fp.read().replace(b'// trimmed', b'// \xe9 trimmed')
+        with open(srcPath, 'wb') as fp:
+            fp.write(data)
+        path = overrides.getCachedOverridesPath(
+            self.cacheDir, '2022', srcPath, getFixturePath('2022', 'dagMenuProc.mel'))
+        with open(path, 'rb') as fp:
+            self.assertIn(b'// \xe9 trimmed', fp.read())
+
+
+if __name__ == '__main__':
+    unittest.main()